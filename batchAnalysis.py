@@ -0,0 +1,110 @@
+#! python3
+# batchAnalysis.py -- Analyse a whole directory (or glob) of test log csv files in parallel and write a summary index
+
+"""   Import Modules   """
+import argparse, csv, os, sys
+from concurrent.futures import ProcessPoolExecutor
+import statsAnalysis, statsAnalysis2, testLog
+
+"""   Global Variables   """
+
+analysisScripts = {'t': statsAnalysis, 'z': statsAnalysis2}  #Confidence interval method -> script that implements it
+summaryFields = ['file', 'n', 'mean', 'std dev', 'lower three sigma', 'lower conf bound', 'units', 'report', 'error']
+
+"""   DEFINITIONS   """
+
+#Analyse one test log (runs in a worker process) and return its row for the summary index
+#Errors are reported in the row so one bad file does not stop the batch
+def analyzeLog(path, settings):
+	row = {field: '' for field in summaryFields}
+	row['file'] = path
+	row['units'] = settings['units']
+	output = None
+	if settings['output dir'] is not None:
+		output = os.path.join(settings['output dir'], os.path.splitext(os.path.basename(path))[0])
+	try:
+		results = analysisScripts[settings['method']].analyze(path, settings['filters'], settings['units'], \
+		settings['confidence'], output, settings['template'], settings['curve points'], \
+		cache=settings['cache'])
+	except Exception as error:
+		row['error'] = type(error).__name__ + ': ' + str(error)
+		return row
+	summary = results['summary']
+	row['n'] = summary['n']
+	row['mean'] = summary['mean']
+	row['std dev'] = summary['std dev']
+	row['lower three sigma'] = summary['three sigma']
+	row['lower conf bound'] = summary['lower conf bound']
+	row['report'] = results['report'] or ''
+	return row
+
+#Write the summary index (one row per test log) as a csv file
+def writeSummaryIndex(rows, fileName):
+	with open(fileName, 'w', newline='') as indexFile:
+		writer = csv.DictWriter(indexFile, fieldnames=summaryFields)
+		writer.writeheader()
+		writer.writerows(rows)
+
+#Analyse every test log found for the patterns across a process pool (one worker per core by default)
+#Writes one test document per log into outputDir (None = no documents) and returns the summary rows
+#template, curvePoints: see statsAnalysis.analyze (None = the report writer's defaults)
+def analyzeBatch(patterns, outputDir=None, filters=None, units='lbf', confidence='95', method='t', \
+template=None, workers=None, curvePoints=None, \
+cacheDir=None, cacheSize=testLog.cacheSize):
+	paths = testLog.findTestLogs(patterns)
+	if not paths:
+		return []
+	if outputDir is not None:
+		os.makedirs(outputDir, exist_ok=True)
+	settings = {'output dir': outputDir, 'filters': filters or [], 'units': str(units).lower(), \
+	'confidence': str(confidence), 'method': method, 'template': template, 'curve points': curvePoints, \
+	'cache': None}
+	if cacheDir is not None:
+		settings['cache'] = testLog.LogCache(cacheDir, cacheSize)
+	workers = min(workers or os.cpu_count() or 1, len(paths))
+	if workers == 1:
+		rows = [analyzeLog(path, settings) for path in paths]
+	else:
+		with ProcessPoolExecutor(max_workers=workers) as pool:
+			rows = list(pool.map(analyzeLog, paths, [settings]*len(paths)))
+	return sorted(rows, key=lambda row: row['file'])
+
+#Command line entry point
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Analyse every test log csv file in a directory or glob pattern in parallel.')
+	parser.add_argument('paths', nargs='+', help='directories, glob patterns (e.g. "logs/TestLog_*.csv") or files')
+	parser.add_argument('--output-dir', default='reports', help='folder for the test documents and summary index (default reports)')
+	parser.add_argument('--filter', action='append', default=[], metavar='KEY=VALUE', help='filter applied to every log (see statsAnalysis.py)')
+	parser.add_argument('--units', default='lbf', type=str.lower, choices=statsAnalysis.unitChoices)
+	parser.add_argument('--confidence', default='95', choices=statsAnalysis.intervalChoices)
+	parser.add_argument('--method', default='t', choices=sorted(analysisScripts), \
+	help='confidence interval method: t (statsAnalysis.py) or z (statsAnalysis2.py)')
+	parser.add_argument('--template', help='excel template (default: reportWriter.templateFile)')
+	parser.add_argument('--curve-points', type=int, help='number of points on the bell curve (default: reportWriter.curvePoints)')
+	parser.add_argument('--workers', type=int, help='number of worker processes (default: one per core)')
+	parser.add_argument('--cache-dir', help='folder of parsed logs shared by the workers (see statsAnalysis.py)')
+	parser.add_argument('--cache-size', type=float, default=testLog.cacheSize / 2**20, help='size cap of the cache folder in MB (default 512)')
+	parser.add_argument('--no-report', action='store_true', help='only write the summary index')
+	parser.add_argument('--index', default='summary.csv', help='file name of the summary index inside the output dir')
+	args = parser.parse_args(argv)
+	outputDir = None if args.no_report else args.output_dir
+	rows = analyzeBatch(args.paths, outputDir, args.filter, args.units, args.confidence, args.method, \
+	args.template, args.workers, args.curve_points, \
+	args.cache_dir, int(args.cache_size * 2**20))
+	if not rows:
+		print('No test logs found.', file=sys.stderr)
+		return 1
+	os.makedirs(args.output_dir, exist_ok=True)
+	indexName = os.path.join(args.output_dir, args.index)
+	writeSummaryIndex(rows, indexName)
+	failed = [row for row in rows if row['error']]
+	print('Analysed ' + str(len(rows) - len(failed)) + ' of ' + str(len(rows)) + ' test logs, summary written to ' + indexName)
+	for row in failed:
+		print(row['file'] + ': ' + row['error'], file=sys.stderr)
+	return 1 if failed else 0
+
+
+""" MAIN BODY OF CODE   """
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,131 @@
+#! python3
+# benchmark.py -- Writes synthetic test logs of growing size and times/memory profiles every stage of the analysis
+
+"""   Import Modules   """
+import argparse, json, os, platform, sys, time
+import numpy, openpyxl
+import diagnostics, reportWriter, statsAnalysis, testLog
+
+"""   Global Variables   """
+
+#Header block of a testomatic export (16 lines, the last one names the columns)
+headerBlock = ['Product:,,', 'Hierarchy:,CLIMB,BELAY,BLAY,BLAY', 'Creation Date:,05/09/2017', 'Created By:,Benchmark', \
+'Description:,Synthetic test log for benchmark.py', 'Test Type:,Investigational', 'Raw Material No:,N/A', \
+'Sub Assembly No:,', 'Purchase Order No:,N/A', 'Production Order No:,N/A', 'Date Code:,I117', 'Vendor Lot No:,N/A', '', '', '', \
+'Test Run Id,Test Log Id,Procedure,Configuration,Peak Load,Rating,Mistest,Failure Type,Failure Notes,Color,Size,' + \
+'Packing Slip No,Spool No,Test Machine,Time Stamp']
+#Distinct values of every category column: key -> names used first (more values get numbered names)
+categoryNames = {'procedure': ['load to failure-2 inch per minute', 'load to failure-4 inch per minute', '5kN Proof', '7kN Proof'], \
+'configuration': ['axial', 'radial'], 'failure type': ['Other: Add To Notes Field', 'Break', 'Deformation'], \
+'failure notes': ['hanger', 'screw head'], 'color': ['', 'Red', 'Blue'], 'size': ['primary hole', 'secondary hole'], \
+'test machine': ['Manufacturing', 'QA']}
+defaultCardinality = {'procedure': 4, 'configuration': 2, 'failure type': 3, 'failure notes': 50, 'color': 3, 'size': 2, \
+'test machine': 2}
+defaultSizes = [10**2, 10**3, 10**4, 10**5]  #Rows per synthetic log (--sizes goes up to 10**7)
+
+"""   DEFINITIONS   """
+
+#Distinct values of a category column with the given cardinality
+def categoryValues(key, cardinality):
+	names = categoryNames.get(key, [])
+	return [names[i] if i < len(names) else key.title() + ' ' + str(i+1) for i in range(cardinality)]
+
+#Write a synthetic test log with the same header block and columns as a testomatic export
+#Peak loads are normal (mean 2000 lbf, std dev 300 lbf), the category values are drawn uniformly
+def writeSyntheticLog(fileName, rows, cardinality=None, seed=0, chunkSize=testLog.chunkRows):
+	counts = dict(defaultCardinality, **(cardinality or {}))
+	values = {key: numpy.array(categoryValues(key, count), dtype=object) for key, count in counts.items()}
+	random = numpy.random.default_rng(seed)
+	start = numpy.datetime64('2017-05-09T08:00:00')
+	with open(fileName, 'w', newline='') as testomaticFile:
+		testomaticFile.write('\r\n'.join(headerBlock) + '\r\n')
+		for first in range(0, rows, chunkSize):
+			size = min(chunkSize, rows - first)
+			runs = numpy.arange(first + 31564, first + 31564 + size)
+			columns = [runs.astype(str).tolist(), ['6952']*size]
+			columns += [values[key][random.integers(0, counts[key], size)].tolist() for key in ['procedure', 'configuration']]
+			columns.append(numpy.char.mod('%.1f', random.normal(2000, 300, size).round(1)).tolist())
+			columns += [['0']*size, ['FALSE']*size]
+			columns += [values[key][random.integers(0, counts[key], size)].tolist() for key in ['failure type', 'failure notes', 'color', 'size']]
+			columns += [['']*size, ['']*size, values['test machine'][random.integers(0, counts['test machine'], size)].tolist()]
+			columns.append((start + numpy.arange(first, first + size).astype('timedelta64[m]')).astype(str).tolist())
+			testomaticFile.write('\r\n'.join(map(','.join, zip(*columns))) + '\r\n')
+	return fileName
+
+#Run every stage of the analysis on one test log and return the stage records
+#Stages: parse, filter, stats, Q-Q, normal curve and the excel write (skipped without a template or when too big)
+def benchmarkLog(fileName, template=reportWriter.templateFile, memory=True, confidence='95'):
+	recorder = diagnostics.StageRecorder(memory)
+	rawData = recorder.run('parse', testLog.readTestLog, fileName, rows=len)
+	testData, filtersUsed = recorder.run('filter', statsAnalysis.filterData, rawData, \
+	['configuration=' + rawData.distinct('configuration')[0]], rows=lambda result: len(result[0]))
+	summary = recorder.run('stats', statsAnalysis.getSummary, testData, confidence, rows=len(testData))
+	results = {'file': fileName, 'raw data': rawData, 'test data': testData, 'filters used': filtersUsed, 'units': 'lbf', \
+	'confidence': confidence, 'method': statsAnalysis.ciMethod, 'summary': summary, 'curve points': reportWriter.curvePoints, \
+	'cube': None, 'report': None}
+	#The Q-Q data and the normal curve are streamed into a scratch workbook so only their own cost is measured
+	wb = openpyxl.Workbook(write_only=True)
+	stream = reportWriter.SheetStream(wb.create_sheet('Statistics'), reportWriter.StyleRegistry(wb))
+	sortedList = testData.sortedLoads()
+	recorder.run('q-q', reportWriter.printQQ, stream, sortedList, 1, 1, results, rows=len(sortedList))
+	recorder.run('normal curve', reportWriter.printNormalCurve, stream, stream.row + 1, 1, results, rows=reportWriter.curvePoints)
+	stream.sheet.close()
+	if not os.path.exists(reportWriter.findTemplate(template)):
+		recorder.skip('excel write', 'template ' + template + ' not found', len(rawData))
+	elif len(rawData) >= reportWriter.excelRows or reportWriter.statisticsRows(results) > reportWriter.excelRows:
+		recorder.skip('excel write', 'more rows than an excel sheet holds', len(rawData))
+	else:
+		reportName = os.path.splitext(fileName)[0] + '_report.xlsx'
+		recorder.run('excel write', reportWriter.writeTestDoc, results, reportName, template, rows=len(rawData))
+		os.remove(reportName)
+	return recorder.stages
+
+#Generate a log for every size, benchmark it and return the results (machine readable, see main)
+def runBenchmark(sizes=defaultSizes, cardinality=None, folder='benchmark', template=reportWriter.templateFile, \
+memory=True, keep=False, seed=0):
+	os.makedirs(folder, exist_ok=True)
+	runs = []
+	for rows in sizes:
+		fileName = os.path.join(folder, 'TestLog_synthetic_' + str(rows) + '.csv')
+		writeSyntheticLog(fileName, rows, cardinality, seed)
+		runs.append({'rows': rows, 'file size': os.path.getsize(fileName), 'stages': benchmarkLog(fileName, template, memory)})
+		if not keep:
+			os.remove(fileName)
+	return {'date': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(), 'numpy': numpy.__version__, \
+	'openpyxl': openpyxl.__version__, 'platform': platform.platform(), 'memory traced': memory, \
+	'cardinality': dict(defaultCardinality, **(cardinality or {})), 'runs': runs}
+
+#Command line entry point
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Benchmark every stage of the analysis on synthetic test logs of growing size.')
+	parser.add_argument('--sizes', type=int, nargs='+', default=defaultSizes, help='rows per synthetic log (default 100 to 100000)')
+	parser.add_argument('--cardinality', action='append', default=[], metavar='KEY=COUNT', \
+	help='distinct values of a category column, e.g. "failure notes=500" (keys: ' + ', '.join(defaultCardinality) + ')')
+	parser.add_argument('--output', default='benchmark.json', help='results file (default benchmark.json)')
+	parser.add_argument('--folder', default='benchmark', help='folder for the synthetic logs (default benchmark)')
+	parser.add_argument('--template', default=reportWriter.templateFile, help='excel template for the excel write stage')
+	parser.add_argument('--no-memory', action='store_true', help='do not trace memory (tracemalloc slows the stages down)')
+	parser.add_argument('--keep', action='store_true', help='keep the synthetic logs')
+	parser.add_argument('--seed', type=int, default=0)
+	args = parser.parse_args(argv)
+	cardinality = {}
+	for spec in args.cardinality:
+		key, equals, count = spec.rpartition('=')
+		key = key.lower().strip()
+		if not equals or key not in defaultCardinality or not count.strip().isdigit() or int(count) < 1:
+			parser.error('Invalid cardinality "' + spec + '", use KEY=COUNT with one of: ' + ', '.join(defaultCardinality))
+		cardinality[key] = int(count)
+	results = runBenchmark(args.sizes, cardinality, args.folder, args.template, not args.no_memory, args.keep, args.seed)
+	with open(args.output, 'w') as resultsFile:
+		json.dump(results, resultsFile, indent=1)
+	for run in results['runs']:
+		print(str(run['rows']) + ' rows: ' + ', '.join(stage['stage'] + ' ' + \
+		('skipped' if stage['wall time'] is None else '%.3fs' % stage['wall time']) for stage in run['stages']))
+	print('Results written to ' + args.output)
+	return 0
+
+
+""" MAIN BODY OF CODE   """
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,62 @@
+#! python3
+# diagnostics.py -- Wall time, CPU time, row count and memory peak of every stage of an analysis
+
+"""   Import Modules   """
+import json, time, tracemalloc
+
+"""   Global Variables   """
+
+stageFields = ['stage', 'wall time', 'cpu time', 'rows', 'peak memory']  #Keys of a stage record (times in s, memory in bytes)
+
+"""   DEFINITIONS   """
+
+#Runs the stages of an analysis one after the other and keeps a record of each one
+#memory=True traces python and numpy allocations with tracemalloc (slower), the peak is the most
+#memory the stage had allocated on top of what was already there when it started
+#sheet=True asks reportWriter for a Diagnostics sheet in the test document
+class StageRecorder:
+	def __init__(self, memory=True, sheet=False):
+		self.memory = memory
+		self.sheet = sheet
+		self.stages = []
+
+	#Run function(*args, **kwargs) as a named stage and return its result
+	#rows: number of rows the stage worked on, or a function that gets it from the result
+	def run(self, name, function, *args, rows=None, **kwargs):
+		started = self.memory and not tracemalloc.is_tracing()
+		if started:
+			tracemalloc.start()
+		if self.memory:
+			tracemalloc.reset_peak()
+			baseMemory = tracemalloc.get_traced_memory()[0]
+		wallStart = time.perf_counter()
+		cpuStart = time.process_time()
+		try:
+			result = function(*args, **kwargs)
+			wallTime = time.perf_counter() - wallStart
+			cpuTime = time.process_time() - cpuStart
+			peakMemory = None
+			if self.memory:
+				peakMemory = tracemalloc.get_traced_memory()[1] - baseMemory
+		finally:
+			if started:
+				tracemalloc.stop()
+		if callable(rows):
+			rows = rows(result)
+		self.stages.append({'stage': name, 'wall time': wallTime, 'cpu time': cpuTime, 'rows': rows, 'peak memory': peakMemory})
+		return result
+
+	#Record a stage that did not run (e.g. too many rows for an excel sheet)
+	def skip(self, name, reason, rows=None):
+		self.stages.append({'stage': name, 'wall time': None, 'cpu time': None, 'rows': rows, 'peak memory': None, \
+		'skipped': reason})
+
+	#Stage records as a JSON string
+	def toJson(self, **extra):
+		return json.dumps(dict(extra, stages=self.stages), indent=1)
+
+#Run a stage through a recorder, or just run it when there is no recorder (diagnostics switched off)
+def runStage(recorder, name, function, *args, rows=None, **kwargs):
+	if recorder is None:
+		return function(*args, **kwargs)
+	return recorder.run(name, function, *args, rows=rows, **kwargs)
@@ -0,0 +1,56 @@
+#! python3
+# groupStats.py -- Group-by statistics cube: the summary statistics for every combination of the filter keys
+
+"""   Import Modules   """
+import itertools
+import numpy
+import statsKernel
+
+"""   Global Variables   """
+
+groupKeys = ['procedure', 'configuration', 'failure type', 'color', 'size']  #Category keys the cube groups by
+allValues = '(all)'  #Shown in place of a key's value in the rollup (subtotal) rows
+cubeFields = ['n', 'mean', 'std dev', 'three sigma', 'lower conf bound', 'upper conf bound']  #Statistics kept per group
+
+"""   DEFINITIONS   """
+
+#Every grouping set of the keys, most detailed first and the grand total last
+#(5 keys give 32 grouping sets: the full breakdown, the rollups over each key, ... and the total)
+def groupingSets(keys):
+	sets = []
+	for size in range(len(keys), -1, -1):
+		sets.extend(itertools.combinations(range(len(keys)), size))
+	return sets
+
+#Build the statistics cube of a table in one pass over the peak loads
+#The rows are grouped once at the most detailed level, every rollup is then merged from those
+#accumulators (Chan's formula), so the cost of the rollups only depends on the number of groups
+#tolerance: levels of the lower tolerance bounds added to every group (see statsKernel.toleranceSummary)
+#Returns {'keys': keys used, 'tolerance levels': levels, 'rows': one row per group {key: value or allValues, ..., 'n': .., 'mean': .., ...}}
+def buildCube(dataSet, confidence=None, method='t', keys=None, tolerance=None):
+	if keys is None:
+		keys = [key for key in groupKeys if key in dataSet.keys]
+	tolerance = list(tolerance or [])
+	fields = cubeFields + [statsKernel.toleranceKey(level) for level in tolerance]
+	if len(dataSet) == 0:
+		return {'keys': keys, 'tolerance levels': tolerance, 'rows': []}
+	loads = dataSet.column('peak load')
+	codes = numpy.column_stack([dataSet.codes(key) for key in keys] + [numpy.zeros(len(loads), dtype=numpy.int64)])
+	cells, cellIds = numpy.unique(codes, axis=0, return_inverse=True)
+	cells = cells[:, :len(keys)]
+	acc = statsKernel.groupAccumulators(cellIds.ravel(), loads, len(cells))
+	decoders = [numpy.array(dataSet.categories[key], dtype=object) for key in keys]
+	rows = []
+	for groupSet in groupingSets(keys):
+		groups, groupIds = numpy.unique(cells[:, list(groupSet)], axis=0, return_inverse=True)
+		merged = statsKernel.mergeGroups(acc, groupIds.ravel(), len(groups))
+		summary = statsKernel.toleranceSummary(statsKernel.summarizeGroups(merged, confidence, method), tolerance)
+		columns = [[allValues]*len(groups) for key in keys]
+		for position, col in enumerate(groupSet):
+			columns[col] = decoders[col][groups[:, position]].tolist()
+		for values in zip(*(columns + [summary[field].tolist() for field in fields])):
+			row = dict(zip(keys, values[:len(keys)]))
+			for field, value in zip(fields, values[len(keys):]):
+				row[field] = statsKernel.shownValue(value)
+			rows.append(row)
+	return {'keys': keys, 'tolerance levels': tolerance, 'rows': rows}
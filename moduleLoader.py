@@ -0,0 +1,19 @@
+#! python3
+# moduleLoader.py -- Lazy imports, so scipy and openpyxl are only loaded by the runs that need them
+
+"""   Import Modules   """
+import importlib
+
+"""   DEFINITIONS   """
+
+#Stand-in for a module that is only imported when one of its attributes is first used
+#e.g. stats = moduleLoader.LazyModule('scipy.stats') costs nothing until stats.t.ppf is called
+class LazyModule:
+	def __init__(self, name):
+		self.moduleName = name
+		self.module = None
+
+	def __getattr__(self, attr):
+		if self.module is None:
+			self.module = importlib.import_module(self.moduleName)
+		return getattr(self.module, attr)
@@ -0,0 +1,180 @@
+#! python3
+# normality.py -- Shapiro-Wilk, Anderson-Darling and D'Agostino normality tests for the filtered data and every group
+
+"""   Import Modules   """
+import numpy
+import statsKernel, groupStats, moduleLoader
+
+"""   Global Variables   """
+
+special = moduleLoader.LazyModule('scipy.special')  #normal cdf and ppf of whole arrays (ndtr, ndtri)
+groupKeys = ['configuration', 'size']  #Category keys the normality tests are grouped by
+#Statistic and p value of every test, the tests are only run on groups of at least minimumSizes values
+testFields = ['shapiro-wilk w', 'shapiro-wilk p', 'anderson-darling a2', 'anderson-darling p', "d'agostino k2", "d'agostino p"]
+minimumSizes = {'shapiro-wilk': 3, 'anderson-darling': 3, "d'agostino": 8}
+shapiroMaximum = 5000  #Largest group the Shapiro-Wilk p value is valid for (Royston's approximation)
+shapiroCache = {}  #Shapiro-Wilk coefficients by group size (they only depend on n)
+
+"""   DEFINITIONS   """
+
+#Sort the values of every group into one columnar array: group after group, each group in increasing order
+#group holds the group number (0..groupCount-1) of every value, one lexsort orders the whole array
+#The sorted values, their standardized scores ((x - mean) / std dev) and the group sizes are shared by every test
+def orderStatistics(values, group, groupCount):
+	values = numpy.asarray(values, dtype=numpy.float64)
+	order = numpy.lexsort((values, group))
+	values = values[order]
+	group = numpy.asarray(group)[order]
+	acc = statsKernel.groupAccumulators(group, values, groupCount)
+	n = acc['n']
+	starts = numpy.concatenate(([0], numpy.cumsum(n)[:-1]))
+	with numpy.errstate(divide='ignore', invalid='ignore'):
+		stdDev = numpy.sqrt(numpy.where(n > 1, acc['m2'] / numpy.maximum(n - 1, 1), numpy.nan))
+		z = (values - acc['mean'][group]) / stdDev[group]
+	position = numpy.arange(len(values)) - starts[group]
+	return {'values': values, 'group': group, 'position': position, 'z': z, 'n': n, 'starts': starts, \
+	'mean': acc['mean'], 'm2': acc['m2'], 'groups': groupCount}
+
+#Shapiro-Wilk coefficients of a sample of n values (Royston 1992), kept in shapiroCache
+#The expected normal order statistics use Blom's plotting positions (i - 3/8) / (n + 1/4)
+def shapiroCoefficients(n):
+	if n not in shapiroCache:
+		if n == 3:
+			coefficients = numpy.array([-numpy.sqrt(0.5), 0.0, numpy.sqrt(0.5)])
+		else:
+			m = special.ndtri((numpy.arange(1, n+1) - 0.375) / (n + 0.25))
+			mm = numpy.square(m).sum()
+			u = 1 / numpy.sqrt(n)
+			c = m / numpy.sqrt(mm)
+			coefficients = c.copy()
+			last = numpy.polyval([-2.706056, 4.434685, -2.071190, -0.147981, 0.221157, c[-1]], u)
+			coefficients[-1] = last
+			coefficients[0] = -last
+			if n > 5:
+				second = numpy.polyval([-3.582633, 5.682633, -1.752461, -0.293762, 0.042981, c[-2]], u)
+				coefficients[-2] = second
+				coefficients[1] = -second
+				phi = (mm - 2*m[-1]**2 - 2*m[-2]**2) / (1 - 2*last**2 - 2*second**2)
+				coefficients[2:-2] = m[2:-2] / numpy.sqrt(phi)
+			else:
+				phi = (mm - 2*m[-1]**2) / (1 - 2*last**2)
+				coefficients[1:-1] = m[1:-1] / numpy.sqrt(phi)
+		shapiroCache[n] = coefficients
+	return shapiroCache[n]
+
+#Shapiro-Wilk W and p value of every group (Royston's normalizing transformation for the p value)
+#W = (sum of coefficient * z)^2 / (n - 1), the coefficients of every group size are looked up once
+def shapiroWilk(ordered):
+	n = ordered['n']
+	coefficients = numpy.zeros(len(ordered['values']))
+	sizes = numpy.unique(n[(n >= minimumSizes['shapiro-wilk']) & (n <= shapiroMaximum)])
+	for size in sizes.tolist():
+		members = n[ordered['group']] == size
+		coefficients[members] = shapiroCoefficients(size)[ordered['position'][members]]
+	with numpy.errstate(divide='ignore', invalid='ignore'):
+		total = numpy.bincount(ordered['group'], weights=numpy.nan_to_num(coefficients * ordered['z']), minlength=ordered['groups'])
+		w = numpy.minimum(numpy.square(total) / (n - 1), 1.0)
+		w = numpy.where(numpy.isin(n, sizes) & (ordered['m2'] > 0), w, numpy.nan)
+		logN = numpy.log(n)
+		#n = 3 has an exact p value, 4 to 11 and larger samples use separate approximations
+		exact = 6 / numpy.pi * (numpy.arcsin(numpy.sqrt(numpy.maximum(w, 0.75))) - numpy.arcsin(numpy.sqrt(0.75)))
+		gamma = 0.459*n - 2.273
+		small = -numpy.log(gamma - numpy.log1p(-w))
+		smallMean = numpy.polyval([-0.0006714, 0.025054, -0.39978, 0.5440], n)
+		smallSigma = numpy.exp(numpy.polyval([-0.0020322, 0.062767, -0.77857, 1.3822], n))
+		largeMean = numpy.polyval([0.0038915, -0.083751, -0.31082, -1.5861], logN)
+		largeSigma = numpy.exp(numpy.polyval([0.0030302, -0.082676, -0.4803], logN))
+		score = numpy.where(n <= 11, (small - smallMean) / smallSigma, (numpy.log1p(-w) - largeMean) / largeSigma)
+		p = numpy.where(n == 3, exact, special.ndtr(-score))
+	return w, numpy.where(numpy.isnan(w), numpy.nan, numpy.clip(p, 0.0, 1.0))
+
+#Anderson-Darling A^2 and p value of every group (mean and variance estimated from the data)
+#Every term pairs the i-th smallest value with the i-th largest, both found from the group starts
+#The p value uses the modified statistic of D'Agostino and Stephens (1986)
+def andersonDarling(ordered):
+	n = ordered['n']
+	group = ordered['group']
+	position = ordered['position']
+	z = ordered['z']
+	mirror = ordered['starts'][group] + n[group] - 1 - position
+	with numpy.errstate(divide='ignore', invalid='ignore'):
+		terms = (2*position + 1) * (numpy.log(special.ndtr(z)) + numpy.log(special.ndtr(-z[mirror])))
+		a2 = -n - numpy.bincount(group, weights=terms, minlength=ordered['groups']) / n
+		a2 = numpy.where((n >= minimumSizes['anderson-darling']) & (ordered['m2'] > 0), a2, numpy.nan)
+		modified = a2 * (1 + 0.75/n + 2.25/numpy.square(n))
+		p = numpy.select([modified >= 0.6, modified >= 0.34, modified >= 0.2], \
+		[numpy.exp(1.2937 - 5.709*modified + 0.0186*numpy.square(modified)), \
+		numpy.exp(0.9177 - 4.279*modified - 1.38*numpy.square(modified)), \
+		1 - numpy.exp(-8.318 + 42.796*modified - 59.938*numpy.square(modified))], \
+		1 - numpy.exp(-13.436 + 101.14*modified - 223.73*numpy.square(modified)))
+	return a2, numpy.where(numpy.isnan(a2), numpy.nan, numpy.clip(p, 0.0, 1.0))
+
+#D'Agostino-Pearson K^2 and p value of every group (skewness and kurtosis tests combined)
+#The central moments of all the groups come from bincount, the p value is chi square with 2 degrees of freedom
+def dAgostino(ordered):
+	n = ordered['n'].astype(numpy.float64)
+	group = ordered['group']
+	deviations = ordered['values'] - ordered['mean'][group]
+	with numpy.errstate(divide='ignore', invalid='ignore'):
+		m2 = ordered['m2'] / n
+		m3 = numpy.bincount(group, weights=deviations**3, minlength=ordered['groups']) / n
+		m4 = numpy.bincount(group, weights=deviations**4, minlength=ordered['groups']) / n
+		#Skewness test
+		y = m3 / m2**1.5 * numpy.sqrt((n+1)*(n+3) / (6*(n-2)))
+		beta2 = 3*(n**2 + 27*n - 70)*(n+1)*(n+3) / ((n-2)*(n+5)*(n+7)*(n+9))
+		w2 = -1 + numpy.sqrt(2*(beta2 - 1))
+		delta = 1 / numpy.sqrt(0.5*numpy.log(w2))
+		alpha = numpy.sqrt(2 / (w2 - 1))
+		y = numpy.where(y == 0, 1, y)
+		skewScore = delta * numpy.log(y/alpha + numpy.sqrt(numpy.square(y/alpha) + 1))
+		#Kurtosis test
+		expected = 3*(n-1) / (n+1)
+		variance = 24*n*(n-2)*(n-3) / ((n+1)**2*(n+3)*(n+5))
+		x = (m4 / m2**2 - expected) / numpy.sqrt(variance)
+		moment = 6*(n**2 - 5*n + 2) / ((n+7)*(n+9)) * numpy.sqrt(6*(n+3)*(n+5) / (n*(n-2)*(n-3)))
+		a = 6 + 8/moment * (2/moment + numpy.sqrt(1 + 4/moment**2))
+		denominator = 1 + x*numpy.sqrt(2 / (a-4))
+		term = numpy.sign(denominator) * numpy.cbrt((1 - 2/a) / numpy.abs(denominator))
+		kurtosisScore = (1 - 2/(9*a) - term) / numpy.sqrt(2 / (9*a))
+		k2 = numpy.square(skewScore) + numpy.square(kurtosisScore)
+		k2 = numpy.where((n >= minimumSizes["d'agostino"]) & (m2 > 0), k2, numpy.nan)
+	return k2, numpy.exp(-k2 / 2)
+
+#Run every test on every group of values
+#Returns {'n': group sizes, field: one value per group for every testFields entry}, nan where a test can not run
+def runTests(values, group, groupCount):
+	ordered = orderStatistics(values, group, groupCount)
+	results = {'n': ordered['n']}
+	for name, test in [('shapiro-wilk', shapiroWilk), ('anderson-darling', andersonDarling), ("d'agostino", dAgostino)]:
+		statistic, p = test(ordered)
+		fields = [field for field in testFields if field.startswith(name)]
+		results[fields[0]] = statistic
+		results[fields[1]] = p
+	return results
+
+#Normality tests of the whole table and of every group of the keys (configuration and size by default)
+#The groups are tested all at once over one sorted array (see orderStatistics)
+#Returns {'keys': keys used, 'rows': the whole table first (allValues in every key) then one row per group}
+def buildNormality(dataSet, keys=None):
+	if keys is None:
+		keys = [key for key in groupKeys if key in dataSet.keys]
+	if len(dataSet) == 0:
+		return {'keys': keys, 'rows': []}
+	loads = dataSet.column('peak load')
+	columns = [[groupStats.allValues] for key in keys]
+	tests = [runTests(loads, numpy.zeros(len(loads), dtype=numpy.int64), 1)]
+	if keys:
+		codes = numpy.column_stack([dataSet.codes(key) for key in keys])
+		groups, groupIds = numpy.unique(codes, axis=0, return_inverse=True)
+		tests.append(runTests(loads, groupIds.ravel(), len(groups)))
+		for position, key in enumerate(keys):
+			columns[position] += numpy.array(dataSet.categories[key], dtype=object)[groups[:, position]].tolist()
+	fields = ['n'] + testFields
+	values = [sum((result[field].tolist() for result in tests), []) for field in fields]
+	rows = []
+	for rowValues in zip(*(columns + values)):
+		row = dict(zip(keys, rowValues[:len(keys)]))
+		for field, value in zip(fields, rowValues[len(keys):]):
+			row[field] = statsKernel.shownValue(value)
+		rows.append(row)
+	return {'keys': keys, 'rows': rows}
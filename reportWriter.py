@@ -0,0 +1,540 @@
+#! python3
+# reportWriter.py -- Streams the excel test document (Raw Data and Statistics sheets) with openpyxl's write-only mode
+
+"""   Import Modules   """
+import copy, io, itertools, os, warnings, numpy, openpyxl
+import diagnostics, normality, statsKernel
+import scipy.stats as stats
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils.cell import get_column_letter
+from openpyxl.styles import Font, Alignment, NamedStyle
+from openpyxl.styles.fonts import DEFAULT_FONT
+from openpyxl.chart import ScatterChart, Reference, Series
+from openpyxl.drawing.image import Image
+
+"""   Global Variables   """
+
+templateFile = 'testDoc.xlsx'  #Default excel template for the test document
+dataSheets = ['Raw Data', 'Statistics']  #Template sheets that are replaced by the streamed data
+curvePoints = 201  #Default number of points on the bell curve (does not depend on the sample size)
+excelRows = 1048576  #Rows an excel sheet can hold (the Raw Data sheet is cut off there, the other sheets raise an error)
+templateCache = {}  #Parsed templates: absolute path -> (modification time, prototype sheets)
+#Sheet settings carried over from the template sheets (the data sheets included), rebuilt for every report
+sheetSettings = ['sheet_properties', 'views', 'protection', 'auto_filter', 'data_validations', 'print_options', \
+'page_margins', 'page_setup', 'HeaderFooter', 'row_breaks', 'col_breaks']
+#Named styles of the test document: name -> (font, alignment, number format)
+#Plain styles keep the workbook's default font, the bold ones use the same fonts the sheets always had
+styleDefinitions = {'header': (Font(bold=True, size=12), Alignment(vertical='center', horizontal='center'), 'General'), \
+'centered': (DEFAULT_FONT, Alignment(horizontal='center'), 'General'), \
+'centered number': (DEFAULT_FONT, Alignment(horizontal='center'), '0.0000'), \
+'right label': (DEFAULT_FONT, Alignment(horizontal='right'), 'General'), \
+'bold centered': (Font(bold=True), Alignment(horizontal='center'), 'General'), \
+'bold': (Font(bold=True), Alignment(), 'General'), \
+'bold italic': (Font(bold=True, italic=True), Alignment(), 'General')}
+
+"""   DEFINITIONS   """
+
+#Registry of the named styles used by the test document, created once per workbook
+#Every style is added to the workbook once (wb.add_named_style) and cells refer to it by name,
+#so the styling cost is O(styles) instead of building Font/Alignment objects for every cell
+class StyleRegistry:
+	def __init__(self, wb):
+		for name, (font, alignment, numberFormat) in styleDefinitions.items():
+			wb.add_named_style(NamedStyle(name=name, font=font, alignment=alignment, number_format=numberFormat))
+
+	#Build a cell with one of the registered styles (None = unstyled)
+	def cell(self, sheet, value, name=None):
+		cell = WriteOnlyCell(sheet, value=value)
+		if name is not None:
+			cell.style = name
+		return cell
+
+	#Build a row of cells that all share one style
+	def row(self, sheet, values, name):
+		return [self.cell(sheet, value, name) for value in values]
+
+	#Build a row of cells with a style per column (column ranges styled in bulk)
+	def columns(self, sheet, values, names):
+		return [self.cell(sheet, value, name) for value, name in zip(values, names)]
+
+#Write-only worksheet wrapper that remembers the next row number and the workbook's styles
+#Rows can only be appended in order, so every block skips ahead to its start row first
+class SheetStream:
+	def __init__(self, sheet, styles):
+		self.sheet = sheet
+		self.styles = styles
+		self.row = 1
+
+	#Append blank rows until the next row is rowNumber
+	def skipTo(self, rowNumber):
+		while self.row < rowNumber:
+			self.append([])
+
+	#Append one row of values/cells starting at startCol
+	def append(self, cells, startCol=1):
+		if self.row > excelRows:
+			raise ValueError(sheetTooLong(self.sheet.title))
+		self.sheet.append([None]*(startCol-1) + list(cells))
+		self.row += 1
+
+	#Styled cell for this sheet
+	def cell(self, value, name=None):
+		return self.styles.cell(self.sheet, value, name)
+
+	#Label cell (right aligned) and value cell (centered) used by the statistics rows
+	def labelRow(self, label, value, numberFormat=True):
+		return self.labelValues(label, [value], numberFormat)
+
+	#Label cell followed by several values (e.g. one statistic in every unit, side by side)
+	def labelValues(self, label, values, numberFormat=True):
+		return [self.cell(label, 'right label')] + [self.cell(value, 'centered number' if numberFormat else 'centered') for value in values]
+
+#Error message of a sheet that needs more rows than excel has
+def sheetTooLong(title):
+	return 'The ' + title + ' sheet needs more than ' + str(excelRows) + ' rows (the most an excel sheet holds), ' + \
+	'filter the data down or leave out the test document.'
+
+#Rows the Statistics sheet needs at least: the filtered data and the Q-Q data take a row per pull, plus the bell curve
+def statisticsRows(results):
+	return 2*len(results['test data']) + int(results.get('curve points') or curvePoints)
+
+#Merge a block of cells given the first/last column and row
+def mergeCells(sheet, startCol, startRow, endCol, endRow):
+	sheet.merged_cells.add(get_column_letter(startCol) + str(startRow) + ':' + get_column_letter(endCol) + str(endRow))
+
+#Column widths of a data table (header or widest value + 2 char buffer)
+#Widths have to be known before the first row is streamed, so they come from the columns themselves:
+#category columns only look at their distinct values and numeric columns are measured with numpy
+def tableWidths(dataSet, keys, headers):
+	widths = []
+	for key, header in zip(keys, headers):
+		width = len(header)
+		if len(dataSet):
+			if key in dataSet.categories:
+				width = max([width] + [len(str(value)) for value in dataSet.distinct(key)])
+			else:
+				width = max(width, int(numpy.char.str_len(dataSet.column(key).astype(str)).max()))
+		widths.append(width + 2) #Add 2 char buffer to width
+	return widths
+
+#Table headers with the units added to peak load
+def tableHeaders(keys, unitSelect):
+	headers = list(keys)
+	headers[headers.index('peak load')] = 'peak load ' + '(' + str(unitSelect) + ')'
+	return headers
+
+#Set the column widths of a sheet (must happen before the first row is streamed)
+def setWidths(sheet, widths):
+	for col, width in widths.items():
+		sheet.column_dimensions[get_column_letter(col)].width = width
+
+#Find the template file, a relative name that is not in the working folder is looked up next to this script
+def findTemplate(template=templateFile):
+	if not os.path.exists(template) and not os.path.isabs(template):
+		scriptFolder = os.path.join(os.path.dirname(os.path.abspath(__file__)), template)
+		if os.path.exists(scriptFolder):
+			return scriptFolder
+	return template
+
+#Parse one template sheet into a prototype: title, sheet settings (page setup, header/footer, print options, views,
+#data validation, see sheetSettings), print titles and area, conditional formatting, charts, images (data, width, height,
+#anchor), column widths, row heights, merged ranges and the rows of (value, style, comment, hyperlink) cells (None = empty
+#cell), the style is (font, fill, border, alignment, protection, number format) or None
+#The data sheets only keep their settings, their cells are replaced by the streamed data (a warning says so)
+#Images are only read from the template when Pillow is installed (openpyxl drops them otherwise), their data is kept as
+#bytes because openpyxl closes the file of an image when it saves it (a shared Image only survives the first report)
+def sheetPrototype(source):
+	prototype = {'title': source.title, 'settings': {}, 'print titles': [source.print_title_rows, source.print_title_cols], \
+	'print area': None, 'formatting': [], 'charts': [], 'images': [], 'widths': {}, 'heights': {}, 'merges': [], 'rows': []}
+	for name in sheetSettings:
+		prototype['settings'][name] = getattr(source, name).to_tree()
+	if source.print_area:
+		prototype['print area'] = [area.split('!')[-1] for area in source.print_area.split(',')]
+	for formatting in source.conditional_formatting:
+		prototype['formatting'] += [(str(formatting.sqref), rule) for rule in formatting.rules]
+	#openpyxl only keeps the charts and images it read in these lists (there is no public accessor)
+	prototype['charts'] = list(source._charts)
+	prototype['images'] = [(image._data(), image.width, image.height, image.anchor) for image in source._images]
+	if source.title in dataSheets:
+		if any(cell.value is not None for row in source.iter_rows() for cell in row):
+			warnings.warn('The cells of the template sheet "' + source.title + '" are not copied, the sheet is filled with the ' + \
+			'analysis results instead (only its page setup, header/footer, views and formatting rules are kept).')
+		return prototype
+	for key, dimension in source.column_dimensions.items():
+		if dimension.width:
+			prototype['widths'][key] = dimension.width
+	for key, dimension in source.row_dimensions.items():
+		if dimension.height:
+			prototype['heights'][key] = dimension.height
+	prototype['merges'] = [str(mergedRange) for mergedRange in source.merged_cells.ranges]
+	for row in source.iter_rows():
+		cells = []
+		for sourceCell in row:
+			if sourceCell.value is None and not sourceCell.has_style and sourceCell.comment is None:
+				cells.append(None)
+				continue
+			style = None
+			if sourceCell.has_style:
+				style = (copy.copy(sourceCell.font), copy.copy(sourceCell.fill), copy.copy(sourceCell.border), \
+				copy.copy(sourceCell.alignment), copy.copy(sourceCell.protection), sourceCell.number_format)
+			hyperlink = sourceCell.hyperlink.target if sourceCell.hyperlink is not None else None
+			cells.append((sourceCell.value, style, sourceCell.comment, hyperlink))
+		prototype['rows'].append(cells)
+	return prototype
+
+#Get the parsed template, the file is only parsed again when its modification time changes
+#Batch runs therefore read the template once per process instead of once per report
+def loadTemplate(template=templateFile):
+	path = os.path.abspath(findTemplate(template))
+	modified = os.path.getmtime(path)
+	cached = templateCache.get(path)
+	if cached is None or cached[0] != modified:
+		templateBook = openpyxl.load_workbook(path)
+		cached = (modified, [sheetPrototype(sheet) for sheet in templateBook.worksheets])
+		templateCache[path] = cached
+	return cached[1]
+
+#Apply the settings of a prototype sheet (see sheetPrototype) to a write-only sheet
+#Has to happen before the first row is streamed (the sheet properties and views are written with it)
+def copySettings(prototype, target):
+	for name, tree in prototype['settings'].items():
+		setting = getattr(target, name)
+		setattr(target, name, type(setting).from_tree(tree))
+	target.print_title_rows, target.print_title_cols = prototype['print titles']
+	if prototype['print area']:
+		target.print_area = prototype['print area']
+	for cellRange, rule in prototype['formatting']:
+		target.conditional_formatting.add(cellRange, copy.deepcopy(rule))
+	for chart in prototype['charts']:
+		target.add_chart(copy.copy(chart))
+	#Every report gets its own Image on a fresh copy of the data
+	for data, width, height, anchor in prototype['images']:
+		image = Image(io.BytesIO(data))
+		image.width, image.height = width, height
+		target.add_image(image, copy.deepcopy(anchor))
+
+#Write a prototype sheet (see sheetPrototype) into a write-only sheet
+def copySheet(prototype, target):
+	copySettings(prototype, target)
+	for key, width in prototype['widths'].items():
+		target.column_dimensions[key].width = width
+	for key, height in prototype['heights'].items():
+		target.row_dimensions[key].height = height
+	for mergedRange in prototype['merges']:
+		target.merged_cells.add(mergedRange)
+	for row in prototype['rows']:
+		cells = []
+		for sourceCell in row:
+			if sourceCell is None:
+				cells.append(None)
+				continue
+			value, style, comment, hyperlink = sourceCell
+			cell = WriteOnlyCell(target, value=value)
+			if style is not None:
+				cell.font, cell.fill, cell.border, cell.alignment, cell.protection, cell.number_format = style
+			if comment is not None:
+				cell.comment = copy.copy(comment)
+			if hyperlink is not None:
+				cell.hyperlink = hyperlink
+			cells.append(cell)
+		target.append(cells)
+
+#Populate and format data into excel (header row and one row per data point)
+#limit: largest number of data rows to write (None = all of them)
+def populateTestDoc(stream, dataSet, startRow, unitSelect, limit=None):
+	keys = list(dataSet.keys)
+	stream.skipTo(startRow)
+	stream.append(stream.styles.row(stream.sheet, tableHeaders(keys, unitSelect), 'header'))
+	for values in itertools.islice(dataSet.rows(keys), limit):
+		stream.append(stream.styles.row(stream.sheet, values, 'centered'))
+
+#Print things to an excel spreadsheet for test documents
+#Template sheets are copied over and the Raw Data and Statistics sheets are streamed, so memory stays
+#flat no matter how many rows there are
+#A Raw Data sheet longer than excel allows is cut off with a warning, a Statistics sheet that would not fit
+#raises a ValueError before anything is written
+#For use with the results dictionary returned by analyze
+def writeTestDoc(results, newFileName, template=templateFile):
+	if not newFileName.endswith('.xlsx'):
+		newFileName = newFileName + '.xlsx'
+	if statisticsRows(results) > excelRows:
+		raise ValueError(sheetTooLong('Statistics'))
+	recorder = results.get('diagnostics')
+	stage = diagnostics.runStage
+	wb = openpyxl.Workbook(write_only=True)
+	styles = StyleRegistry(wb)
+	for prototype in loadTemplate(template):
+		sheet = wb.create_sheet(prototype['title'])
+		if prototype['title'] in dataSheets:
+			copySettings(prototype, sheet)
+		if prototype['title'] == 'Raw Data':
+			stage(recorder, 'raw data sheet', writeRawData, SheetStream(sheet, styles), results, rows=len(results['raw data']))
+		elif prototype['title'] == 'Statistics':
+			stage(recorder, 'statistics sheet', writeStatistics, SheetStream(sheet, styles), results, \
+			rows=len(results['test data']))
+		else:
+			copySheet(prototype, sheet)
+	#Group-by statistics cube gets its own sheet after the template sheets
+	if results.get('cube') is not None:
+		stage(recorder, 'group stats sheet', writeGroupStats, SheetStream(wb.create_sheet('Group Stats'), styles), results, \
+		rows=len(results['cube']['rows']))
+	#Normality tests get their own sheet as well
+	if results.get('normality') is not None:
+		stage(recorder, 'normality sheet', writeNormality, SheetStream(wb.create_sheet('Normality'), styles), results, \
+		rows=len(results['normality']['rows']))
+	#Stage timings so far (the save below is only in the JSON output)
+	if recorder is not None and recorder.sheet:
+		writeDiagnostics(SheetStream(wb.create_sheet('Diagnostics'), styles), results)
+	#Save and close file
+	stage(recorder, 'save', wb.save, newFileName)
+	return newFileName
+
+#Print all of the raw data to the raw data sheet (the rows after the last excel row are left out with a warning)
+def writeRawData(stream, results):
+	sheet = stream.sheet
+	rawData = results['raw data']
+	limit = excelRows - 1 #Row 1 is the header
+	if len(rawData) > limit:
+		warnings.warn('The Raw Data sheet only holds the first ' + str(limit) + ' of the ' + str(len(rawData)) + \
+		' rows, an excel sheet ends at row ' + str(excelRows) + '.')
+	sheet.row_dimensions[1].height = 22
+	widths = tableWidths(rawData, rawData.keys, tableHeaders(rawData.keys, 'lbf'))
+	setWidths(sheet, {col+1: width for col, width in enumerate(widths)})
+	populateTestDoc(stream, rawData, 1, 'lbf', limit)
+
+#Print the stage timings of the diagnostics recorder (see diagnostics.StageRecorder)
+def writeDiagnostics(stream, results):
+	sheet = stream.sheet
+	headers = ['Stage', 'Wall Time (s)', 'CPU Time (s)', 'Rows', 'Peak Memory (kB)']
+	setWidths(sheet, {col+1: max(len(header) + 2, 20 if col == 0 else 0) for col, header in enumerate(headers)})
+	sheet.row_dimensions[1].height = 22
+	stream.append(stream.styles.row(sheet, headers, 'header'))
+	rowStyles = ['right label', 'centered number', 'centered number', 'centered', 'centered']
+	for record in results['diagnostics'].stages:
+		peakMemory = 'n/a' if record['peak memory'] is None else round(record['peak memory'] / 1024)
+		values = [record['stage'], record['wall time'], record['cpu time'], record['rows'], peakMemory]
+		stream.append(stream.styles.columns(sheet, ['n/a' if value is None else value for value in values], rowStyles))
+
+#Print the group-by statistics cube (one row per group, '(all)' marks the subtotal rows)
+def writeGroupStats(stream, results):
+	cube = results['cube']
+	units = results['units']
+	keys = cube['keys']
+	confidence = str(results['confidence'])
+	levels = cube.get('tolerance levels', [])
+	headers = keys + ['n', 'Mean (' + units + ')', 'Standard Deviation', 'Lower Three Sigma'] + \
+	['Lower ' + level + ' Tolerance Bound' for level in levels] + \
+	['Lower ' + confidence + '% Conf Bound', 'Upper ' + confidence + '% Conf Bound']
+	fields = ['n', 'mean', 'std dev', 'three sigma'] + [statsKernel.toleranceKey(level) for level in levels] + \
+	['lower conf bound', 'upper conf bound']
+	writeTable(stream, headers, keys, fields, cube['rows'])
+
+#Print the normality tests (the filtered data first, then one row per group)
+def writeNormality(stream, results):
+	tests = results['normality']
+	keys = tests['keys']
+	headers = keys + ['n', 'Shapiro-Wilk W', 'Shapiro-Wilk p', 'Anderson-Darling A2', 'Anderson-Darling p', \
+	"D'Agostino K2", "D'Agostino p"]
+	writeTable(stream, headers, keys, ['n'] + normality.testFields, tests['rows'])
+
+#Print a table of group rows (group stats, normality tests): one header row, then the group keys and n centered
+#and the other fields as numbers, rows are {key: value, ..., field: value, ...}
+def writeTable(stream, headers, keys, fields, rows):
+	sheet = stream.sheet
+	#Column widths from the headers and the group values
+	widths = {}
+	for col, header in enumerate(headers):
+		width = len(header)
+		if col < len(keys):
+			width = max([width] + [len(str(row[keys[col]])) for row in rows])
+		widths[col+1] = width + 2 #Add 2 char buffer to width
+	setWidths(sheet, widths)
+	sheet.row_dimensions[1].height = 22
+	stream.append(stream.styles.row(sheet, headers, 'header'))
+	rowStyles = ['centered']*(len(keys)+1) + ['centered number']*(len(fields)-1)
+	for row in rows:
+		values = [row[key] for key in keys] + [row[field] for field in fields]
+		stream.append(stream.styles.columns(sheet, values, rowStyles))
+
+#Print the filtered data, the statistics, the QQ data and the normal curve to the statistics sheet
+def writeStatistics(stream, results):
+	sheet = stream.sheet
+	testData = results['test data']
+	summary = results['summary']
+	units = results['units']
+	zMethod = results['method'] == 'z'
+	#Column widths for the whole sheet
+	widths = tableWidths(testData, testData.keys, tableHeaders(testData.keys, units))
+	widths = {col+1: width for col, width in enumerate(widths)}
+	widths[1] = 26.5 if zMethod else 23.5 #Format Column Width for Stats Data
+	if len(testData) > 1 and widths.get(3, 0) < 15:
+		widths[3] = 15 #Expected Value column of the QQ data
+	setWidths(sheet, widths)
+	sheet.row_dimensions[1].height = 22
+	#Merge cells and Print all the filters that have been applied
+	mergeCells(sheet, 1, 2, 6, 2)
+	stream.append([stream.cell('Filters Applied:', 'bold italic')])
+	stream.append([str(results['filters used'])])
+	#print all of the testData (statistics)
+	populateTestDoc(stream, testData, 4, units)
+	#Print number of samples, mean, standard error, standard deviation, variance and three sigma
+	#Every unit of the run gets its own column of statistics (derived from the same base statistics)
+	summaries = results.get('summaries') or {units: summary}
+	if len(summaries) > 1:
+		stream.append(stream.labelValues('Units:', list(summaries), False))
+	stream.append(stream.labelRow('n:', len(testData), False))
+	#The lower tolerance bounds go right under the three sigma value
+	rows = [('Mean:', 'mean'), ('Standard Error of Mean:', 'standard error'), ('Standard Deviation:', 'std dev'), \
+	('Variance:', 'variance'), ('Lower Three Sigma:', 'three sigma')]
+	rows += [('Lower ' + level + ' Tolerance Bound:', statsKernel.toleranceKey(level)) for level in summary.get('tolerance levels', [])]
+	for label, key in rows:
+		stream.append(stream.labelValues(label, [unitSummary[key] for unitSummary in summaries.values()]))
+	#Print Confidence Interval (statsAnalysis2.py shows it with the bell curve only)
+	if not zMethod:
+		label = results['confidence'] + '% Confidence Interval' + statsKernel.intervalLabel(results.get('bootstrap')) + ':'
+		stream.append(stream.labelValues(label, \
+		[unitSummary['lower conf bound'] for unitSummary in summaries.values()]))
+	#Mistests left out and outliers found by the screening
+	if results.get('screening') is not None:
+		writeScreening(stream, results['screening'])
+	#Index for end of filtered data analysis
+	filteredDataEnd = stream.row - 1
+	#Print QQ info
+	if len(testData) > 1:
+		sortedList = testData.sortedLoads()
+		printQQ(stream, sortedList, (filteredDataEnd+2), 1, results)
+		printNormalCurve(stream, filteredDataEnd+len(testData)+9, 1, results)
+	else:
+		stream.skipTo(filteredDataEnd+2)
+		stream.append([stream.cell('NOTE: Can not evaluate normality when n = 1', 'bold')])
+
+#Print the mistests and the outliers (test run and peak load) under the statistics
+def writeScreening(stream, screened):
+	mistests = screened['mistests']
+	if len(mistests):
+		stream.append(stream.labelRow('Mistests Left Out:', len(mistests), False))
+		for run, load in mistests.rows(['test run', 'peak load']):
+			stream.append(stream.labelRow('Mistest Run ' + str(run) + ':', load))
+	if screened['mode'] is not None:
+		outliers = screened['outliers']
+		label = 'Outliers Excluded:' if screened['mode'] == 'exclude' else 'Outliers Flagged:'
+		stream.append(stream.labelRow(label, len(outliers), False))
+		stream.append(stream.labelRow('ESD Significance:', screened['alpha'], False))
+		for run, load in outliers.rows(['test run', 'peak load']):
+			stream.append(stream.labelRow('Outlier Run ' + str(run) + ':', load))
+
+#Build CDF value list (plotting positions i/(n+1)) as one array
+def cdf(n):
+	return numpy.arange(1, n+1) / (n+1)
+
+#Compute the whole Q-Q block from the sorted peak loads as arrays
+#One vectorized ppf call gives the z scores, the expected values are just mean + std dev * z
+def qqData(sortedList, average, stdDev):
+	sortedList = numpy.asarray(sortedList, dtype=numpy.float64)
+	cdfData = cdf(len(sortedList))
+	zScores = stats.norm.ppf(cdfData)
+	return {'actual': sortedList, 'cdf': cdfData, 'expected': average + stdDev*zScores, 'z': zScores, \
+	'average': numpy.average(sortedList), 'median': numpy.median(sortedList), \
+	'skewness': stats.skew(sortedList, bias=False), 'kurtosis': stats.kurtosis(sortedList, bias=False)}
+
+#print QQ data and plot
+def printQQ(stream, sortedList, startRow, startCol, results):
+	sheet = stream.sheet
+	units = results['units']
+	qq = qqData(sortedList, results['summary']['mean'], results['summary']['std dev'])
+	stream.skipTo(startRow)
+	#Print Heading
+	mergeCells(sheet, startCol, startRow, startCol+3, startRow)
+	stream.append([stream.cell('Q-Q Plot Data', 'bold centered')], startCol)
+	#Print column headings: actual data, CDF values, expected values and z-score
+	stream.append(stream.styles.row(sheet, ['Actual Data ' + '(' + units + ')', 'CDF Value', 'Expected Value', 'z Score'], \
+	'bold centered'), startCol)
+	for values in zip(qq['actual'].tolist(), qq['cdf'].tolist(), qq['expected'].tolist(), qq['z'].tolist()):
+		stream.append(stream.styles.row(sheet, values, 'centered number'), startCol)
+	#Print average, median, skewness and kurtosis (corrected for statistical bias)
+	stream.append(stream.labelRow('Average:', qq['average']), startCol)
+	stream.append(stream.labelRow('Median:', qq['median']), startCol)
+	stream.append(stream.labelRow('Skewness:', qq['skewness']), startCol)
+	stream.append(stream.labelRow('Kurtosis:', qq['kurtosis']), startCol)
+	#QQ plot (Line Chart)
+	chart = ScatterChart()
+	chart.title = "Q-Q Plot"
+	chart.style = 13
+	chart.x_axis.title = 'z Score'
+	chart.y_axis.title = 'Peak Load'
+	xvalues = Reference(sheet, min_col=startCol+3, min_row=startRow+2, max_row=startRow+(len(qq['z'])+2))
+	for i in range(startCol, (startCol+3), 2):
+		values = Reference(sheet, min_col=i, min_row=(startRow+1), max_row=(startRow+len(qq['z'])+2))
+		series = Series(values, xvalues, title_from_data=True)
+		chart.series.append(series)
+	#chart location
+	chartAnchor =  get_column_letter(startCol+4) + str(startRow-5)
+	sheet.add_chart(chart, chartAnchor)
+
+#Print normal curve with confidence bounds
+#The curve has results['curve points'] evenly spaced z values, whatever the sample size
+def printNormalCurve(stream, startRow, startCol, results):
+	sheet = stream.sheet
+	summary = results['summary']
+	units = results['units']
+	points = results.get('curve points') or curvePoints
+	average = summary['mean']
+	stdDev = summary['std dev']
+	stream.skipTo(startRow)
+	#Print Heading
+	mergeCells(sheet, startCol, startRow, startCol+3, startRow)
+	stream.append([stream.cell('Bell Curve Plot Data', 'bold centered')], startCol)
+	#Print settings
+	mergeCells(sheet, startCol, startRow+1, startCol+1, startRow+1)
+	stream.append([stream.cell('Settings', 'bold centered')], startCol)
+	#Z settings
+	zMin = -4 #initialize Z min setting
+	zMax = 4 #initialize Z max setting
+	stream.append(stream.labelRow('Z_min:', zMin, False), startCol) #number of standard deviations
+	stream.append(stream.labelRow('Z_max:', zMax, False), startCol)
+	#Confidence Bounds
+	lowerConfBound = summary['lower conf bound'] #local variable
+	upperConfBound = summary['upper conf bound'] #local variable
+	if results['method'] == 'z':
+		interval = results['confidence'] + '% Confidence Bound' + statsKernel.intervalLabel(results.get('bootstrap')) + ':'
+		stream.append(stream.labelRow('Lower ' + interval, lowerConfBound), startCol)
+		stream.append(stream.labelRow('Upper ' + interval, upperConfBound), startCol)
+	else:
+		stream.append(stream.labelRow('Lower Confidence Bound:', lowerConfBound), startCol)
+		stream.append(stream.labelRow('Upper Confidence Bound:', upperConfBound), startCol)
+	#Curve Bounds
+	stream.append(stream.labelRow('Curve Min:', average - 5*stdDev), startCol)
+	stream.append(stream.labelRow('Curve Max:', average + 5*stdDev), startCol)
+	#Print Z, X, f(x) and Area column headings
+	stream.append(stream.styles.row(sheet, ['Z', 'X', 'f(x)', 'Area'], 'bold centered'), startCol)
+	#Print data
+	curveStyles = ['centered number', 'centered number', 'centered number', 'centered']
+	z = numpy.linspace(zMin, zMax, points)
+	x = z*stdDev + average
+	fx = stats.norm.pdf(x, loc=average, scale=stdDev) #one batched call for the whole curve
+	#Area column only has a value inside the confidence bounds
+	area = fx.astype(object)
+	area[(x > upperConfBound) | (x < lowerConfBound)] = ''
+	for values in zip(z.tolist(), x.tolist(), fx.tolist(), area.tolist()):
+		stream.append(stream.styles.columns(sheet, values, curveStyles), startCol)
+	xFirst = float(x[0])
+	xLast = float(x[-1])
+	#Bell curve. Scatter with smooth lines
+	chart = ScatterChart()
+	chart.title = "Normal Curve"
+	chart.style = 13
+	chart.x_axis.title = 'peak load (' + units +')'
+	chart.y_axis.title = 'f(x)'
+	xvalues = Reference(sheet, min_col=startCol+1, min_row=startRow+9, max_row=startRow+(points+8))
+	values1 = Reference(sheet, min_col=startCol+2, min_row=startRow+9, max_row=startRow+(points+8))
+	series1 = Series(values1, xvalues)
+	values2 = Reference(sheet, min_col=startCol+3, min_row=startRow+9, max_row=startRow+(points+8))
+	series2 = Series(values2, xvalues)
+	chart.series.append(series1)
+	chart.series.append(series2)
+	#set a buffer for x axis scale
+	chart.x_axis.scaling.min = xFirst - xFirst*.10
+	chart.x_axis.scaling.max = xLast + xLast*.10
+	#chart location
+	chartAnchor =  get_column_letter(startCol+4) + str(startRow-4)
+	sheet.add_chart(chart, chartAnchor)
@@ -0,0 +1,52 @@
+#! python3
+# screening.py -- Drops the pulls marked as mistests and screens the peak loads for outliers before the statistics
+
+"""   Import Modules   """
+import numpy
+import statsKernel, testLog
+
+"""   Global Variables   """
+
+mistestValues = ['true', 'yes', 'y', '1', 'x']  #Mistest column values that mark a pull as a mistest
+outlierModes = ['flag', 'exclude']  #flag = only report the outliers, exclude = also leave them out of the statistics
+outlierAlpha = 0.05  #Default significance level of the generalized ESD test
+outlierLimit = 10  #Default largest number of outliers the test looks for
+
+"""   DEFINITIONS   """
+
+#RowMask of the pulls marked as mistests
+def mistestMask(dataSet):
+	mask = testLog.RowMask.none(dataSet.baseSize())
+	for value in mistestValues:
+		mask = mask | dataSet.where('mistest', value)
+	return mask & dataSet.rowMask()
+
+#Test whether a csv data row is marked as a mistest (for rows that arrive one at a time)
+def isMistest(row):
+	col = testLog.columnIndex('mistest')
+	return col < len(row) and row[col].strip().lower() in mistestValues
+
+#Screen the filtered data before the statistics
+#Mistests are always left out, the mistest key is dropped from the view (every pull left is a valid one)
+#mode: None (no outlier test), 'flag' or 'exclude', the generalized ESD test runs on the pulls left after the mistests
+#Returns the view the statistics use and the screening report {'mode', 'alpha', 'mistests': view of the mistests,
+#'outliers': view of the outliers, 'statistics': [[test statistic, critical value], ..] of every step}
+def screenData(dataSet, mode=None, alpha=outlierAlpha, maxOutliers=outlierLimit):
+	if mode is not None and mode not in outlierModes:
+		raise ValueError('Invalid outlier mode "' + str(mode) + '". Please use ' + ', '.join(outlierModes) + '.')
+	if not 0 < alpha < 1:
+		raise ValueError('The outlier significance level has to be between 0 and 1.')
+	mistests = mistestMask(dataSet)
+	keys = [key for key in dataSet.keys if key != 'mistest']
+	kept = dataSet.filter(~mistests, keys)
+	report = {'mode': mode, 'alpha': alpha, 'mistests': dataSet.filter(mistests), 'outliers': None, 'statistics': []}
+	if mode is not None:
+		loads = kept.column('peak load')
+		order = numpy.argsort(loads, kind='stable')
+		positions, testStats, critical = statsKernel.generalizedESD(loads[order], alpha, maxOutliers)
+		outliers = kept.positionMask(order[positions])
+		report['outliers'] = kept.filter(outliers)
+		report['statistics'] = [list(pair) for pair in zip(testStats, critical)]
+		if mode == 'exclude':
+			kept = kept.filter(~outliers)
+	return kept, report
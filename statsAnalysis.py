@@ -2,626 +2,388 @@
 # statsAnalysis.py -- Program used to pull data from test log csv file, analyse, and export to excel test doc
 
 """   Import Modules   """
-import csv, sys, numpy, openpyxl, copy
-import scipy.stats as stats  #only need t.ppf , import this function alone
-from openpyxl.utils.cell import get_column_letter
-from openpyxl.styles import Font, Alignment
-from openpyxl.chart import ScatterChart, Reference, Series
-
-#Import testomatic file. Open file and read it into list "testData" (with error detection)
-fileName = input('Please enter the file name: ')
-try:
-	testomaticFile = open(fileName+'.csv')
-	testomaticReader = csv.reader(testomaticFile)
-	testDataList = list(testomaticReader)
-except FileNotFoundError:
-	print('Invalid File Name!')
-	sys.exit()
+import argparse, os, sys, time
+import statsKernel, testLog, testDatabase, groupStats, normality, screening, diagnostics, moduleLoader
 
 """   Global Variables   """
 
-rawData = []  #Raw data from original file
-testData = [] #List used for filtered data
-manip = 'y'  #Used to trigger data filtering
-filtersUsed = []  #Filter tracking list
-units = '' #This will track what units are requested
-selectedConfInt = '' #Used to track the selected confidence interval
+ciMethod = 't'  #Confidence interval method used by the stats kernel (t value times std dev)
+methodChoices = ['t', 'z']  #t: t value times std dev, z: z table times standard error (the default of statsAnalysis2.py)
+unitChoices = list(statsKernel.unitScales)  #Units the results can be reported in (see statsKernel.unitScales)
+intervalChoices = ['85', '90', '95']  #Supported confidence intervals
+#openpyxl and scipy are only loaded when a test document is written, the template and bell curve defaults live there
+#(reportWriter.templateFile, reportWriter.curvePoints)
+reportWriter = moduleLoader.LazyModule('reportWriter')
 
 """   DEFINITIONS   """
 
-#Read data point into a dictionary and insert into the testData list
+#Read the test log csv file into a columnar testLog table
+#The file is streamed in chunks, so only one chunk of raw csv rows is held in memory at a time
+#The .csv extension is optional (the old prompt asked for the name without it)
 #Keys with no value show up as an empty string ('')
-def populateTestData():
-	print('Retrieving Data...')
-	for row in range(16,len(testDataList)):
-		#Pull the individual data and assign to local variable
-		testRun = testDataList[row][0]
-		procedure = testDataList[row][2]
-		configuration = testDataList[row][3]
-		peakLoad = testDataList[row][4]
-		failureType = testDataList[row][7]
-		failureNotes = testDataList[row][8]
-		color = testDataList[row][9]
-		size = testDataList[row][10]
-		#Initialize data point dictionary (local variable)
-		dataPoint = {'test run': '', 'procedure': '', 'configuration': '', 'peak load': '', \
-		'failure type': '', 'failure notes': '', 'color': '', 'size': ''}
-		#Populate data point dictionary 
-		dataPoint['test run'] = int(testRun)
-		dataPoint['procedure'] = str(procedure).lower()
-		dataPoint['configuration'] = str(configuration).lower()
-		dataPoint['peak load'] = float(peakLoad)
-		dataPoint['failure type'] = str(failureType).lower()
-		dataPoint['failure notes'] = str(failureNotes).lower()
-		dataPoint['color'] = str(color).lower()
-		dataPoint['size'] = str(size).lower()
-		#Append data point dictionary to testData list (global variable)
-		testData.append(dataPoint)
-	print('Done.')
-	print('') #Print a blank line for readability
-
-#Create a copy of the original data for reference purposes
-#This is necessary to remove any dictionary/list python references 
-def duplicateData(dataSet):
-	data = []
-	for i in range(len(dataSet)):
-		data.append(copy.copy(dataSet[i]))
-	return data
-
-#Print out the filter key list excluding 'peak load' and 'test run'
-def printFilterKeys(keyList):
-	for key in keyList.keys():
-		if key == 'peak load':
-			continue
-		elif key == 'test run':
-			continue
-		else:
-			print(key)
-	print('') #Add a blank line for readability
-
-#Function for searching a list for filters
-def searchList(dataSet, filterKey, filterValue):
-	for i in range(len(dataSet)):
-		if dataSet[i][filterKey] != filterValue:
-			return i
-
-#Perform data filtering on testData list
-def filterData():
-	global filtersUsed
-	filterSelection = [] #local variable
-	print('')
-	print('Filter categories:')
-	printFilterKeys(testData[0]) #testData[0] is arbitrary to get key information
-	filterKey = input('What would you like to filter by? (hit enter to exit) ').lower()  #local variable
-	#Error Detection
-	while True:
-		if filterKey == '':
-			return
-		try:
-			instances = [] #local variable
-			for i in range(len(testData)):
-				if str(testData[i][filterKey]).lower() not in instances:
-					instances.append(str(testData[i][filterKey]).lower())
-			break
-		except KeyError:
-			print('')
-			print('Invalid answer.')
-			print('')
-			filterKey = input('What would you like to filter by? (hit enter to exit) ').lower()  #local variable
-	#Append each filter used for filter tracking and print out
-	filterSelection.append(filterKey)
-	print('')
-	print('Filter categories:')
-	print('\n'.join(instances))
-	print('')
-	filterValue = input('What would you like to filter by? (hit enter to exit) ').lower()
-	#Error Detection
-	while True:
-		if filterValue == '':
-			return
-		elif filterValue not in instances:
-			print('')
-			print('Invalid answer.')
-			print('')
-			filterValue = input('What would you like to filter by? (hit enter to exit) ').lower()  #local variable
-		else:
-			break
-	#Append each filter used for filter tracking and print out
-	filterSelection.append(filterValue)
-	#Remove any dictionaries that dont contain the filter from the list
-	while True:
-		activeFilter = searchList(testData, filterKey, filterValue)
-		if activeFilter != None:
-			del testData[activeFilter]
-		else:
-			break
-	#Remove filtered key so it cant be used again  
-	for j in range(len(testData)):
-		del testData[j][filterKey]
-	print('')
-	#Append filter selections to the global variable filtersUsed
-	filtersUsed.append(filterSelection)
-
-#Asks to continue filtering
-def askToFilter():
-	global manip  #do we need this global variable??????
-	manip = input('Would you like to filter the data? (Y/N) ').lower()
-	print('')
-	while True:
-		if manip == 'y':
-			filterData()
-			print('')
-			return manip
-		elif manip == 'n':
-			print('No more filters applied.')
-			print('')
-			return manip
-		else:
-			print('Invalid answer.')
-			print('')
-			manip = input('Would you like to filter the data? (Y/N) ').lower()
-			print('')
+#cache: testLog.LogCache (or its folder) of parsed logs, a log read before is loaded without parsing the csv
+def populateTestData(fileName, cache=None):
+	if not os.path.exists(fileName) and os.path.exists(fileName + '.csv'):
+		fileName = fileName + '.csv'
+	if cache is not None:
+		if not isinstance(cache, testLog.LogCache):
+			cache = testLog.LogCache(cache)
+		return cache.read(fileName)
+	return testLog.readTestLog(fileName)
+
+#Read the raw data from a test log csv file, or from the pulls of a test database that match a query
+#(see testDatabase.whereClause, e.g. ['configuration=axial', 'from=2017-01-01', 'to=2017-12-31'])
+def loadRawData(path, cache=None, database=None, query=None):
+	if database is not None:
+		return testDatabase.readQuery(database, query)
+	return populateTestData(path, cache)
+
+#Apply a declarative filter spec (e.g. ['configuration=axial', 'size=primary hole']) to the data
+#Returns the filtered view and the filters used for the test document
+def filterData(dataSet, filters):
+	return testLog.applyFilters(dataSet, testLog.parseFilters(filters))
+
+#View of testData with the peak loads read in another unit
+#The loads stay stored in pounds, the scale factor is applied to the whole column when it is rendered
+def convertUnits(dataSet, units):
+	return dataSet.withScale('peak load', statsKernel.unitScales[units])
 
 #Convert testData from pounds to kilonewtons
-#For use with list of dictionaries
 def convertToMetric(dataSet):
-	for i in range(len(dataSet)):
-		dataSet[i]['peak load'] = float(dataSet[i]['peak load'])/224.8
-	return dataSet
-
-#Build CDF value list
-def cdf(n):
-	cdf = [1/(n+1)]
-	for i in range(1,n):
-		nextCDF = cdf[i-1]+(1/(n+1))
-		cdf.append(nextCDF)
-	return cdf
-
-#Sort the data for normality checks
-#For use with list of dictionaries
-def dataSort(dataSet):
-	peakLoads = [] #local variable
-	for i in range(len(dataSet)):
-		peakLoads.append(dataSet[i]['peak load'])
-	peakLoads.sort()
-	return peakLoads
+	return convertUnits(dataSet, 'kn')
+
+#Run the peak loads through the shared statistics kernel (one vectorized pass)
+#For use with testLog tables
+def getAccumulator(dataSet):
+	return statsKernel.accumulateArray(statsKernel.newAccumulator(), dataSet.column('peak load'))
+
+#Get every summary statistic at once (n, mean, variance, std dev, standard error, three sigma, CI)
+#For use with testLog tables
+def getSummary(dataSet, confidence=None, method=ciMethod):
+	return statsKernel.summarize(getAccumulator(dataSet), confidence, method)
 
 #Get average function
-#For use with dictionaries
+#For use with testLog tables
 def getAverage(dataSet):
-	sum = 0
-	for i in range(len(dataSet)):
-		sum += float(dataSet[i]['peak load'])
-	average = sum / len(dataSet)
-	return average
+	return getSummary(dataSet)['mean']
 
 #Get Standard Deviation
-#For use with dictionaries
+#For use with testLog tables
 def getStdDev(dataSet):
-	sum = 0
-	for i in range(len(dataSet)):
-		sum += (float(dataSet[i]['peak load']) - getAverage(dataSet))**2
-	try:
-		stdDev = (sum / (len(dataSet)-1)) ** (1/2)
-	except ZeroDivisionError:
-		stdDev = 'n/a'
-	return stdDev
+	return getSummary(dataSet)['std dev']
 
 #Get lower 3 sigma value
-#For use with dictionaries
+#For use with testLog tables
 def threeSigma(dataSet):
-	threeSigma = getAverage(dataSet) - (3 * getStdDev(dataSet))
-	return threeSigma
+	return getSummary(dataSet)['three sigma']
 
 #Confidence Interval Calculation
-def confidenceInterval(dataSet):
-	global selectedConfInt
-	intervalChoices = ['85', '90', '95']
-	interval = input('Choose your Confidence Interval (85, 90, or 95): ') 
-	while True:
-		if interval not in intervalChoices:
-			print('')
-			print('Invalid interval.')
-			print('')
-			interval = input('Choose your Confidence Interval (85, 90, or 95): ')
-			print('')
-		else:
-			selectedConfInt = interval + '%'
-			break
-	interval = (1 - (int(interval)/100))/2
-	confidenceInterval = stats.t.ppf(1-interval, (len(dataSet)-1))
-	return confidenceInterval
-
-#Get key values
-def getKeys(dataSet):
-	keys = []
-	for key in dataSet[0].keys():    #dataSet[0] is an arbitrary dictionary to get the keys
-		keys.append(key)
-	return keys
-
-#Populate and format data into excel
-def populateTestDoc(sheet, dataSet, startRow, unitSelect):
-	#Heading Font (set here)
-	headingFont = Font(bold=True, size=12)
-	#print all of the labels
-	keys = getKeys(dataSet)
-	#update peak load key with appropriate units
-	updateUnits = 'peak load ' + '(' + str(unitSelect) + ')'
-	keys[keys.index('peak load')] = updateUnits
-	for i in range(len(keys)):
-		sheet.cell(row=startRow, column=i+1).value = keys[i]
-	#Initialize column widths widths for formating
-	col_widths = []
-	for i in range(len(keys)):
-		col_widths.append(len(keys[i]))
-	#revert keys back
-	keys[keys.index(updateUnits)] = 'peak load'
-	#print data
-	for row in range(len(dataSet)):
-		for col in range(len(keys)):
-			sheet.cell(row=(startRow+1)+row, column=1+col).value = dataSet[row][keys[col]]   
-	#Format the table headers
-	sheet.row_dimensions[1].height = 22
-	for i in range(len(keys)):
-		sheet.cell(row=startRow, column=i+1).font = headingFont
-		sheet.cell(row=startRow, column=i+1).alignment = Alignment(vertical='center', horizontal='center')
-	#Iterate over dataSet to update column widths and center align all cells
-	for col in range(len(keys)):
-		for row in range(len(dataSet)):
-			sheet.cell(row=row+(startRow+1), column=col+1).alignment = Alignment(horizontal='center')
-			if len(str(dataSet[row][keys[col]])) > col_widths[col]:
-				col_widths[col] = len(str(dataSet[row][keys[col]]))
-	#Edit column widths
-	for i in range(len(col_widths)):
-		sheet.column_dimensions[get_column_letter(i+1)].width = col_widths[i] + 2 #Add 2 char buffer to width 
-
-#Print things to an excel spreadsheet for test documents
-#For use with dictionary list
-def writeTestDoc():
-	global units
-	newFileName = input('What would you like to name the test document? ')
-	newFileName = newFileName + '.xlsx'
+def confidenceInterval(dataSet, interval):
+	return getSummary(dataSet, interval)['critical value']
+
+#Check the units, confidence interval and method settings and return them in the form the scripts use
+#units: one unit or a list of units, returned as a list without repeats (the first one is the main unit)
+def checkSettings(units, confidence, method=ciMethod):
+	if isinstance(units, str):
+		units = [units]
+	unitList = []
+	for unit in units:
+		unit = str(unit).lower()
+		if unit not in unitChoices:
+			raise ValueError('Invalid unit of measure "' + unit + '". Please use ' + ', '.join(unitChoices) + '.')
+		if unit not in unitList:
+			unitList.append(unit)
+	if not unitList:
+		raise ValueError('No unit of measure given.')
+	confidence = str(confidence).rstrip('%')
+	if confidence not in intervalChoices:
+		raise ValueError('Invalid interval "' + confidence + '". Please use 85, 90, or 95.')
+	if method not in methodChoices:
+		raise ValueError('Invalid confidence interval method "' + str(method) + '". Please use ' + ', '.join(methodChoices) + '.')
+	return unitList, confidence
+
+#Run the whole analysis without any prompts and return the results dictionary
+#filters: declarative filter spec (see filterData), confidence: '85', '90' or '95'
+#method: confidence interval method, 't' (t value times std dev) or 'z' (z table times standard error)
+#units: one of unitChoices or a list of them, the statistics are computed once in lbf and derived for every unit
+#(results['summaries']), the data table, Q-Q data and group stats use the first unit
+#template, curvePoints: excel template and number of points on the bell curve of the test document
+#(None = reportWriter.templateFile and reportWriter.curvePoints)
+#groupBy: also build the group-by statistics cube (every combination of the filter keys plus the rollups)
+#cache: parsed log cache (see populateTestData)
+#database, query: analyse the pulls of a test database that match the query instead of a file (path can be None)
+#recorder: diagnostics.StageRecorder that times every stage (None = no diagnostics)
+#bootstrap: 'percentile' or 'bca' replaces the confidence bounds with a bootstrap interval of the mean (no normality
+#assumed), resamples, seed and workers are passed on to statsKernel.bootstrapInterval
+#tolerance: one sided lower tolerance bounds to add next to the three sigma value, e.g. ['95/90', '99/95']
+#(precomputed k-factor tables, see statsKernel.toleranceFactor), the group stats get them as well
+#outliers: None, 'flag' or 'exclude', screen the filtered data with the generalized ESD test (outlierAlpha,
+#maxOutliers), mistests are always left out (see screening.screenData)
+#normalityTests: also run the Shapiro-Wilk, Anderson-Darling and D'Agostino tests on the filtered data and on every
+#configuration/size group (see normality.buildNormality)
+#The excel test document is only written when an output name is given
+def analyze(path, filters=None, units='lbf', confidence='95', output=None, template=None, \
+curvePoints=None, groupBy=False, cache=None, database=None, query=None, \
+recorder=None, bootstrap=None, resamples=statsKernel.bootstrapResamples, seed=statsKernel.bootstrapSeed, workers=1, \
+normalityTests=False, tolerance=None, outliers=None, outlierAlpha=screening.outlierAlpha, \
+maxOutliers=screening.outlierLimit, method=ciMethod):
+	unitList, confidence = checkSettings(units, confidence, method)
+	units = unitList[0]
+	if curvePoints is not None and int(curvePoints) < 2:
+		raise ValueError('The bell curve needs at least 2 points.')
+	stage = diagnostics.runStage
+	rawData = stage(recorder, 'parse', loadRawData, path, cache, database, query, rows=len)
+	testData, filtersUsed = stage(recorder, 'filter', filterData, rawData, filters or [], rows=lambda result: len(result[0]))
+	testData, screened = stage(recorder, 'screen', screening.screenData, testData, outliers, outlierAlpha, maxOutliers, \
+	rows=lambda result: len(result[0]))
+	baseSummary = stage(recorder, 'stats', getSummary, testData, confidence, method, rows=len(testData))
+	if bootstrap:
+		baseSummary = stage(recorder, 'bootstrap', statsKernel.bootstrapSummary, baseSummary, testData.column('peak load'), \
+		bootstrap, resamples, seed, workers, rows=len(testData))
+	baseSummary = statsKernel.toleranceSummary(baseSummary, tolerance or [])
+	summaries = {unit: statsKernel.convertSummary(baseSummary, unit) for unit in unitList}
+	if units != 'lbf':
+		testData = stage(recorder, 'convert units', convertUnits, testData, units, rows=len)
+		for key in ['mistests', 'outliers']:
+			if screened[key] is not None:
+				screened[key] = convertUnits(screened[key], units)
+	results = {'file': path or database, 'raw data': rawData, 'test data': testData, 'filters used': filtersUsed, \
+	'units': units, 'confidence': confidence, 'method': method, 'summary': summaries[units], 'summaries': summaries, \
+	'bootstrap': bootstrap, 'curve points': None if curvePoints is None else int(curvePoints), 'cube': None, 'normality': None, 'screening': screened, \
+	'diagnostics': recorder, 'report': None}
+	if groupBy:
+		results['cube'] = stage(recorder, 'group stats', groupStats.buildCube, testData, confidence, method, \
+		tolerance=tolerance, rows=len(testData))
+	if normalityTests:
+		results['normality'] = stage(recorder, 'normality', normality.buildNormality, testData, rows=len(testData))
+	if output:
+		results['report'] = reportWriter.writeTestDoc(results, output, template or reportWriter.templateFile)
+	return results
+
+#Follow a test log while the test is running (see testLog.LogFollower)
+#Only the rows appended since the last poll are parsed (mistests are skipped) and every new pull is folded into the running
+#accumulator (O(1) per pull), the results are yielded again whenever new pulls pass the filters
+#polls: stop after that many polls (None = keep following), tolerance, method: see analyze
+def follow(path, filters=None, units='lbf', confidence='95', interval=5.0, polls=None, tolerance=None, method=ciMethod):
+	unitList, confidence = checkSettings(units, confidence, method)
+	units = unitList[0]
+	if not os.path.exists(path) and os.path.exists(path + '.csv'):
+		path = path + '.csv'
+	follower = testLog.LogFollower(path)
+	parsed = testLog.parseFilters(filters or [])
+	filtersUsed = []
+	for key, operator, value in parsed:
+		testLog.columnIndex(key)
+		filtersUsed.append([key, value if operator == '=' else 'not ' + value])
+	peakLoadCol = testLog.columnIndex('peak load')
+	acc = statsKernel.newAccumulator()
+	results = {'file': path, 'filters used': filtersUsed, 'units': units, 'confidence': confidence, \
+	'method': method, 'summary': None, 'summaries': None, 'cube': None, 'normality': None, \
+	'screening': None, 'report': None}
+	count = 0
+	while polls is None or count < polls:
+		if count:
+			time.sleep(interval)
+		newPulls = 0
+		restarts = follower.restarts
+		newRows = follower.poll()
+		if follower.restarts != restarts:
+			acc = statsKernel.newAccumulator()
+			newPulls = 1 #always reprint after the file started over
+		for row in newRows:
+			if testLog.rowMatches(row, parsed) and not screening.isMistest(row):
+				statsKernel.accumulate(acc, float(row[peakLoadCol]))
+				newPulls += 1
+		if newPulls or count == 0:
+			baseSummary = statsKernel.toleranceSummary(statsKernel.summarize(acc, confidence, method), tolerance or [])
+			results['summaries'] = {unit: statsKernel.convertSummary(baseSummary, unit) for unit in unitList}
+			results['summary'] = results['summaries'][units]
+			yield results
+		count += 1
+
+#Print the analysis results to the console
+def printResults(results, showData=False):
+	print('Filters Used: ' + str(results['filters used']))
 	print('')
-	print('Writing to ' + newFileName + '...')
-	wb = openpyxl.load_workbook('testDoc.xlsx')  #make sure testDoc.xlsx is in the root folder
-	sheet1 = wb.get_sheet_by_name('Raw Data')
-	sheet2 = wb.get_sheet_by_name('Statistics')
-	#print all of the raw data to sheet 1 (raw data)
-	populateTestDoc(sheet1, rawData, 1, 'lbf')
-	#Merge cells and Print all the filters that have been applied
-	sheet2.merge_cells('A2:F2')
-	sheet2.cell(row=1, column=1).value = 'Filters Applied:'
-	sheet2.cell(row=1, column=1).font = Font(bold=True, italic=True)
-	sheet2['A2'] = str(filtersUsed)
-	#print all of the testData to sheet 2 (statistics)
-	populateTestDoc(sheet2, testData, 4, units)
-	#Format Column Width for Stats Data
-	sheet2.column_dimensions['A'].width = 23.5 
-	#Print number of samples (row starts 2 after the input value for populateTestDoc)
-	sheet2.cell(row= (len(testData)+5), column= 1).value = 'n:'
-	sheet2.cell(row= (len(testData)+5), column= 1).alignment = Alignment(horizontal='right')
-	sheet2.cell(row= (len(testData)+5), column= 2).value = len(testData)
-	sheet2.cell(row= (len(testData)+5), column= 2).alignment = Alignment(horizontal='center')   
-	#Print Mean 
-	sheet2.cell(row= (len(testData)+6), column= 1).value = 'Mean:'
-	sheet2.cell(row= (len(testData)+6), column= 1).alignment = Alignment(horizontal='right')
-	sheet2.cell(row= (len(testData)+6), column= 2).value = average
-	sheet2.cell(row= (len(testData)+6), column= 2).alignment = Alignment(horizontal='center')
-	sheet2.cell(row= (len(testData)+6), column= 2).number_format = '0.0000' 
-	#Print Standard Error of Mean
-	sheet2.cell(row= (len(testData)+7), column= 1).value = 'Standard Error of Mean:'
-	sheet2.cell(row= (len(testData)+7), column= 1).alignment = Alignment(horizontal='right')
-	sheet2.cell(row= (len(testData)+7), column= 2).value = stdDev / (len(testData)**(1/2.0))
-	sheet2.cell(row= (len(testData)+7), column= 2).alignment = Alignment(horizontal='center')
-	sheet2.cell(row= (len(testData)+7), column= 2).number_format = '0.0000'  
-	#Print Standard Deviation
-	sheet2.cell(row= (len(testData)+8), column= 1).value = 'Standard Deviation:'
-	sheet2.cell(row= (len(testData)+8), column= 1).alignment = Alignment(horizontal='right')
-	sheet2.cell(row= (len(testData)+8), column= 2).value = stdDev
-	sheet2.cell(row= (len(testData)+8), column= 2).alignment = Alignment(horizontal='center')
-	sheet2.cell(row= (len(testData)+8), column= 2).number_format = '0.0000' 
-	#Print Variance
-	sheet2.cell(row= (len(testData)+9), column= 1).value = 'Variance:'
-	sheet2.cell(row= (len(testData)+9), column= 1).alignment = Alignment(horizontal='right')
-	sheet2.cell(row= (len(testData)+9), column= 2).value = stdDev ** 2
-	sheet2.cell(row= (len(testData)+9), column= 2).alignment = Alignment(horizontal='center')
-	sheet2.cell(row= (len(testData)+9), column= 2).number_format = '0.0000'    
-	#Print Three Sigma
-	sheet2.cell(row= (len(testData)+10), column= 1).value = 'Lower Three Sigma:'
-	sheet2.cell(row= (len(testData)+10), column= 1).alignment = Alignment(horizontal='right')
-	sheet2.cell(row= (len(testData)+10), column= 2).value = threeSigma
-	sheet2.cell(row= (len(testData)+10), column= 2).alignment = Alignment(horizontal='center')
-	sheet2.cell(row= (len(testData)+10), column= 2).number_format = '0.0000'    
-	#Print Confidence Interval
-	sheet2.cell(row= (len(testData)+11), column= 1).value = selectedConfInt + ' Confidence Interval:'
-	sheet2.cell(row= (len(testData)+11), column= 1).alignment = Alignment(horizontal='right')
-	sheet2.cell(row= (len(testData)+11), column= 2).value = confidenceIntervalValue
-	sheet2.cell(row= (len(testData)+11), column= 2).alignment = Alignment(horizontal='center')
-	sheet2.cell(row= (len(testData)+11), column= 2).number_format = '0.0000'   
-	#Index for end of filtered data analysis
-	filteredDataEnd = len(testData)+11
-	#Print QQ info 
-	if len(testData) > 1:
-		printQQ(sheet2, testData, (filteredDataEnd+2), 1) 
-		printNormalCurve(sheet2, dataSort(testData), filteredDataEnd+len(testData)+9, 1)
-	else:
-		sheet2.cell(row=(filteredDataEnd+2), column=1).value = 'NOTE: Can not evaluate normality when n = 1'
-		sheet2.cell(row=(filteredDataEnd+2), column=1).font = Font(bold=True)
-	#Save and close file
-	wb.save(newFileName)
-	print('Done.') 
-
-#print QQ data and plot
-def printQQ(sheet, dataSet, startRow, startCol):
-	#Print Heading
-	selectedCells = get_column_letter(startCol) + str(startRow) + ':' + get_column_letter(startCol+3) + str(startRow)
-	sheet.merge_cells(selectedCells)
-	sheet.cell(row=startRow, column=startCol).value = 'Q-Q Plot Data'
-	sheet.cell(row=startRow, column=startCol).font = Font(bold=True)
-	sheet.cell(row=startRow, column=startCol).alignment = Alignment(horizontal='center')
-	#Print actual data list column
-	sheet.cell(row=startRow+1, column=startCol).value = 'Actual Data ' + '(' + units + ')'
-	sheet.cell(row=startRow+1, column=startCol).alignment = Alignment(horizontal='center')
-	sheet.cell(row=startRow+1, column=startCol).font = Font(bold=True) 
-	sortedList = dataSort(dataSet)
-	for i in range(2,len(sortedList)+2):
-		sheet.cell(row=startRow+i, column=startCol).value = sortedList[i-2]
-		sheet.cell(row=startRow+i, column=startCol).alignment = Alignment(horizontal='center')
-		sheet.cell(row=startRow+i, column=startCol).number_format = '0.0000' 
-	#Print CDF values
-	cdfData = cdf(len(sortedList))
-	sheet.cell(row=startRow+1, column=startCol+1).value = 'CDF Value'
-	sheet.cell(row=startRow+1, column=startCol+1).alignment = Alignment(horizontal='center')
-	sheet.cell(row=startRow+1, column=startCol+1).font = Font(bold=True) 
-	for i in range(2,len(cdfData)+2):
-		sheet.cell(row=startRow+i, column=startCol+1).value = cdfData[i-2]
-		sheet.cell(row=startRow+i, column=startCol+1).alignment = Alignment(horizontal='center')
-		sheet.cell(row=startRow+i, column=startCol+1).number_format = '0.0000' 
-	#Print Expected Values
-	average = getAverage(dataSet)
-	stdDev = getStdDev(dataSet)
-	sheet.cell(row=startRow+1, column=startCol+2).value = 'Expected Value'
-	sheet.cell(row=startRow+1, column=startCol+2).alignment = Alignment(horizontal='center')
-	sheet.cell(row=startRow+1, column=startCol+2).font = Font(bold=True) 
-	for i in range(2,len(cdfData)+2):
-		sheet.cell(row=startRow+i, column=startCol+2).value = stats.norm.ppf(cdfData[i-2], loc = average, scale = stdDev)
-		sheet.cell(row=startRow+i, column=startCol+2).alignment = Alignment(horizontal='center')
-		sheet.cell(row=startRow+i, column=startCol+2).number_format = '0.0000' 
-	#Adjust the column width if necessary
-	expectedValueWidth = sheet.column_dimensions[get_column_letter(startCol+2)].width
-	if expectedValueWidth < 15:
-		sheet.column_dimensions[get_column_letter(startCol+2)].width = 15
-	#Print z-score
-	sheet.cell(row=startRow+1, column=startCol+3).value = 'z Score'
-	sheet.cell(row=startRow+1, column=startCol+3).alignment = Alignment(horizontal='center')
-	sheet.cell(row=startRow+1, column=startCol+3).font = Font(bold=True) 
-	for i in range(2,len(cdfData)+2):
-		sheet.cell(row=startRow+i, column=startCol+3).value = stats.norm.ppf(cdfData[i-2])
-		sheet.cell(row=startRow+i, column=startCol+3).alignment = Alignment(horizontal='center')
-		sheet.cell(row=startRow+i, column=startCol+3).number_format = '0.0000' 
-	#Print average
-	sheet.cell(row=startRow+len(sortedList)+2, column= startCol).value = 'Average:'
-	sheet.cell(row=startRow+len(sortedList)+2, column= startCol).alignment = Alignment(horizontal='right')
-	sheet.cell(row=startRow+len(sortedList)+2, column= startCol+1).value = numpy.average(sortedList)
-	sheet.cell(row=startRow+len(sortedList)+2, column= startCol+1).alignment = Alignment(horizontal='center')
-	sheet.cell(row=startRow+len(sortedList)+2, column= startCol+1).number_format = '0.0000'  
-	#Print median
-	sheet.cell(row=startRow+len(sortedList)+3, column= startCol).value = 'Median:'
-	sheet.cell(row=startRow+len(sortedList)+3, column= startCol).alignment = Alignment(horizontal='right')
-	sheet.cell(row=startRow+len(sortedList)+3, column= startCol+1).value = numpy.median(sortedList)
-	sheet.cell(row=startRow+len(sortedList)+3, column= startCol+1).alignment = Alignment(horizontal='center') 
-	sheet.cell(row=startRow+len(sortedList)+3, column= startCol+1).number_format = '0.0000' 
-	#Print skewness (corrected for statistical bias)
-	sheet.cell(row=startRow+len(sortedList)+4, column= startCol).value = 'Skewness:'
-	sheet.cell(row=startRow+len(sortedList)+4, column= startCol).alignment = Alignment(horizontal='right')
-	sheet.cell(row=startRow+len(sortedList)+4, column= startCol+1).value = stats.skew(sortedList, bias=False) #corrected for statistical bias
-	sheet.cell(row=startRow+len(sortedList)+4, column= startCol+1).alignment = Alignment(horizontal='center') 
-	sheet.cell(row=startRow+len(sortedList)+4, column= startCol+1).number_format = '0.0000' 
-	#Print Kurtosis (corrected for statistical bias)
-	sheet.cell(row=startRow+len(sortedList)+5, column= startCol).value = 'Kurtosis:'
-	sheet.cell(row=startRow+len(sortedList)+5, column= startCol).alignment = Alignment(horizontal='right')
-	sheet.cell(row=startRow+len(sortedList)+5, column= startCol+1).value = stats.kurtosis(sortedList, bias=False) #corrected for statistical bias
-	sheet.cell(row=startRow+len(sortedList)+5, column= startCol+1).alignment = Alignment(horizontal='center')
-	sheet.cell(row=startRow+len(sortedList)+5, column= startCol+1).number_format = '0.0000' 
-	#Index for QQ plot data end
-	qqPlotEnd = len(sortedList)+5
-	#QQ plot (Line Chart)
-	chart = ScatterChart()
-	chart.title = "Q-Q Plot"
-	chart.style = 13
-	chart.x_axis.title = 'z Score'
-	chart.y_axis.title = 'Peak Load'
-	xvalues = Reference(sheet, min_col=startCol+3, min_row=startRow+2, max_row=startRow+(len(cdfData)+2))
-	for i in range(startCol, (startCol+3), 2):
-		values = Reference(sheet, min_col=i, min_row=(startRow+1), max_row=(startRow+len(sortedList)+2))
-		series = Series(values, xvalues, title_from_data=True)
-		chart.series.append(series)
-	#chart location
-	chartAnchor =  get_column_letter(startCol+4) + str(startRow-5)
-	sheet.add_chart(chart, chartAnchor)
-
-#Print normal curve with confidence bounds
-def printNormalCurve(sheet, sortedList, startRow, startCol):
-	#Print Heading
-	selectedCells1 = get_column_letter(startCol) + str(startRow) + ':' + get_column_letter(startCol+3) + str(startRow)
-	sheet.merge_cells(selectedCells1)
-	sheet.cell(row=startRow, column=startCol).value = 'Bell Curve Plot Data'
-	sheet.cell(row=startRow, column=startCol).font = Font(bold=True)
-	sheet.cell(row=startRow, column=startCol).alignment = Alignment(horizontal='center')
-	#Print settings
-	selectedCells2 = get_column_letter(startCol) + str(startRow+1) + ':' + get_column_letter(startCol+1) + str(startRow+1)
-	sheet.merge_cells(selectedCells2)
-	sheet.cell(row=startRow+1, column=startCol).value = 'Settings'
-	sheet.cell(row=startRow+1, column=startCol).alignment = Alignment(horizontal='center')
-	sheet.cell(row=startRow+1, column=startCol).font = Font(bold=True)
-	#Z settings 
-	zMin = -4 #initialize Z min setting
-	zMax = 4 #initialize Z max setting
-	sheet.cell(row=startRow+2, column= startCol).value = 'Z_min:'
-	sheet.cell(row=startRow+2, column= startCol).alignment = Alignment(horizontal='right')
-	sheet.cell(row=startRow+2, column= startCol+1).value = zMin #number of standard deviations
-	sheet.cell(row=startRow+2, column= startCol+1).alignment = Alignment(horizontal='center')
-	sheet.cell(row=startRow+3, column= startCol).value = 'Z_max:'
-	sheet.cell(row=startRow+3, column= startCol).alignment = Alignment(horizontal='right')
-	sheet.cell(row=startRow+3, column= startCol+1).value = zMax #number of standard deviations
-	sheet.cell(row=startRow+3, column= startCol+1).alignment = Alignment(horizontal='center')
-	#Confidence Bounds 
-	sheet.cell(row=startRow+4, column= startCol).value = 'Lower Confidence Bound:'
-	sheet.cell(row=startRow+4, column= startCol).alignment = Alignment(horizontal='right')
-	lowerConfBound = average - confidenceInterval*stdDev #local variable
-	sheet.cell(row=startRow+4, column= startCol+1).value = lowerConfBound
-	sheet.cell(row=startRow+4, column= startCol+1).alignment = Alignment(horizontal='center')
-	sheet.cell(row=startRow+4, column= startCol+1).number_format = '0.0000'
-	sheet.cell(row=startRow+5, column= startCol).value = 'Upper Confidence Bound:'
-	sheet.cell(row=startRow+5, column= startCol).alignment = Alignment(horizontal='right')
-	upperConfBound = average + confidenceInterval*stdDev #local variable
-	sheet.cell(row=startRow+5, column= startCol+1).value = upperConfBound
-	sheet.cell(row=startRow+5, column= startCol+1).alignment = Alignment(horizontal='center')
-	sheet.cell(row=startRow+5, column= startCol+1).number_format = '0.0000'
-	#Curve Bounds 
-	sheet.cell(row=startRow+6, column= startCol).value = 'Curve Min:'
-	sheet.cell(row=startRow+6, column= startCol).alignment = Alignment(horizontal='right')
-	sheet.cell(row=startRow+6, column= startCol+1).value = average - 5*stdDev
-	sheet.cell(row=startRow+6, column= startCol+1).alignment = Alignment(horizontal='center')
-	sheet.cell(row=startRow+6, column= startCol+1).number_format = '0.0000'
-	sheet.cell(row=startRow+7, column= startCol).value = 'Curve Max:'
-	sheet.cell(row=startRow+7, column= startCol).alignment = Alignment(horizontal='right')
-	sheet.cell(row=startRow+7, column= startCol+1).value = average + 5*stdDev
-	sheet.cell(row=startRow+7, column= startCol+1).alignment = Alignment(horizontal='center')
-	sheet.cell(row=startRow+7, column= startCol+1).number_format = '0.0000'
-	#Print Z column heading
-	sheet.cell(row=startRow+8, column=startCol).value = 'Z'
-	sheet.cell(row=startRow+8, column=startCol).alignment = Alignment(horizontal='center')
-	sheet.cell(row=startRow+8, column=startCol).font = Font(bold=True)
-	#Print X column heading
-	sheet.cell(row=startRow+8, column=startCol+1).value = 'X'
-	sheet.cell(row=startRow+8, column=startCol+1).alignment = Alignment(horizontal='center')
-	sheet.cell(row=startRow+8, column=startCol+1).font = Font(bold=True)
-	#Print f(x) column heading
-	sheet.cell(row=startRow+8, column=startCol+2).value = 'f(x)'
-	sheet.cell(row=startRow+8, column=startCol+2).alignment = Alignment(horizontal='center')
-	sheet.cell(row=startRow+8, column=startCol+2).font = Font(bold=True)
-	#Print Area column heading
-	sheet.cell(row=startRow+8, column=startCol+3).value = 'Area'
-	sheet.cell(row=startRow+8, column=startCol+3).alignment = Alignment(horizontal='center')
-	sheet.cell(row=startRow+8, column=startCol+3).font = Font(bold=True)
-	#Print data
-	z = zMin #initialize counter 
-	for i in range(9,len(sortedList)+9):
-		#Z data
-		sheet.cell(row=startRow+i, column=startCol).value = z
-		sheet.cell(row=startRow+i, column=startCol).alignment = Alignment(horizontal='center')
-		sheet.cell(row=startRow+i, column=startCol).number_format = '0.0000' 
-		#X data
-		x = z*stdDev + average
-		sheet.cell(row=startRow+i, column=startCol+1).value = x
-		sheet.cell(row=startRow+i, column=startCol+1).alignment = Alignment(horizontal='center')
-		sheet.cell(row=startRow+i, column=startCol+1).number_format = '0.0000' 
-		#f(x) data
-		sheet.cell(row=startRow+i, column=startCol+2).value = stats.norm.pdf(x, loc=average, scale=stdDev) # NEED TO TURN OFF CUMULATIVE FUNCTION!!!
-		sheet.cell(row=startRow+i, column=startCol+2).alignment = Alignment(horizontal='center')
-		sheet.cell(row=startRow+i, column=startCol+2).number_format = '0.0000' 
-		#Area data
-		if x > upperConfBound or x < lowerConfBound:
-			sheet.cell(row=startRow+i, column=startCol+3).value = ''
+	if showData:
+		print('Filtered Data (' + results['units'] + '): ')
+		for peakLoad in results['test data'].column('peak load').tolist():
+			print(peakLoad)
+		print('')
+	interval = results['confidence'] + '% Confidence Interval' + statsKernel.intervalLabel(results.get('bootstrap'))
+	for position, (units, summary) in enumerate(results['summaries'].items()):
+		if position:
+			print('')
+		print('Units: ' + units)
+		print('n: ' + str(summary['n']))
+		print('Average Peak Load: ' + ('%.2f' % summary['mean'] if summary['n'] else 'n/a'))
+		if summary['n'] > 1:
+			print('Standard Deviation: %.2f' % summary['std dev'])
+			print('Lower Three Sigma: %.2f' % summary['three sigma'])
+			for level in summary.get('tolerance levels', []):
+				print('Lower ' + level + ' Tolerance Bound: %.2f' % summary[statsKernel.toleranceKey(level)])
+			print('Lower ' + interval + ': %.2f' % summary['lower conf bound'])
 		else:
-			sheet.cell(row=startRow+i, column=startCol+3).value = stats.norm.pdf(x, loc=average, scale=stdDev)
-		sheet.cell(row=startRow+i, column=startCol+3).alignment = Alignment(horizontal='center')
-		z = (zMax-zMin)/(len(sortedList)-1) + z
-	#Bell curve. Scatter with smooth lines
-	chart = ScatterChart()
-	chart.title = "Normal Curve"
-	chart.style = 13
-	chart.x_axis.title = 'peak load (' + units +')' 
-	chart.y_axis.title = 'f(x)'
-	xvalues = Reference(sheet, min_col=startCol+1, min_row=startRow+9, max_row=startRow+(len(sortedList)+8))
-	values1 = Reference(sheet, min_col=startCol+2, min_row=startRow+9, max_row=startRow+(len(sortedList)+8))
-	series1 = Series(values1, xvalues)
-	values2 = Reference(sheet, min_col=startCol+3, min_row=startRow+9, max_row=startRow+(len(sortedList)+8))
-	series2 = Series(values2, xvalues)
-	chart.series.append(series1)
-	chart.series.append(series2)
-	#set a buffer for x axis scale
-	chart.x_axis.scaling.min = (sheet.cell(row=startRow+9, column=startCol+1).value) - (sheet.cell(row=startRow+9, column=startCol+1).value)*.10 
-	chart.x_axis.scaling.max = (sheet.cell(row=(startRow+8+len(sortedList)), column=startCol+1).value) + \
-	(sheet.cell(row=(startRow+8+len(sortedList)), column=startCol+1).value)*.10
-	#chart location
-	chartAnchor =  get_column_letter(startCol+4) + str(startRow-4)
-	sheet.add_chart(chart, chartAnchor)
-
-
-""" MAIN BODY OF CODE   """
-
-#Populate the rawData list
-populateTestData()
-rawData = duplicateData(testData)  #remove python references to original dictionaries imported from csv file
-
-#Apply filters if applicable
-while manip == 'y': #This global variable has been pre-set to 'y'
-	askToFilter()
-	print('Filters Used: ' + str(filtersUsed))
+			print('Standard Deviation: n/a')
+			print('Lower Three Sigma: n/a')
+			for level in summary.get('tolerance levels', []):
+				print('Lower ' + level + ' Tolerance Bound: n/a')
+			print('Lower Confidence Interval: n/a')
+	if results['screening'] is not None:
+		printScreening(results)
+	if results['cube'] is not None:
+		printCube(results)
+	if results['normality'] is not None:
+		printNormality(results)
+	if results['report']:
+		print('Test document: ' + results['report'])
 	print('')
 
-#Print out the final filtered testData (peak load) list 
-print('Filtered Data (lbf): ')
-for i in range(len(testData)):
-	print(testData[i]['peak load'])
-print('')
-print('Filters Used: ' + str(filtersUsed))
-print('')
-
-#Ask what unit to report the information in
-#Use this global to track what units are being requested for print outs. 
-units = input('Would you like the results to be shown in kN or lbf? ').lower()
-print('')
-while True:
-	if units == 'kn':
-		testData = convertToMetric(testData)
-		print('Converted Data (kN): ')
-		for i in range(len(testData)):
-			print(testData[i]['peak load'])
-		print('')
-		break
-	elif units != 'kn' and units != 'lbf':
-		print('Invalid unit of measure. Please type kN or lbf.')
+#Print the mistests that were left out and the outliers the screening found
+def printScreening(results):
+	screened = results['screening']
+	mistests = screened['mistests']
+	if len(mistests):
 		print('')
-		units = input('Would you like the results to be shown in kN or lbf? ').lower()
+		print('Mistests left out: ' + ', '.join(str(run) + ' (%.2f)' % load for run, load in \
+		mistests.rows(['test run', 'peak load'])))
+	if screened['mode'] is not None:
+		outliers = screened['outliers']
 		print('')
-	else:
-		print('The data has NOT been converted to kN.')
-		break
-
-#print units to console
-print('')
-print('Units: ' + units)
-
-#get average and print to the console
-average = getAverage(testData)
-print('Average Peak Load: %.2f' % average)  
-
-#Get standard deviation and print stdDev, threeSigma, and confidenceInterval to console
-stdDev = getStdDev(testData)
-if type(stdDev) == float:
-	print('Standard Deviation: %.2f' % stdDev )
-	#Get there sigma values and print to console  
-	threeSigma = threeSigma(testData)
-	print('Lower Three Sigma: %.2f' % threeSigma )
-	#Get standard deviations and print to console
-	confidenceInterval = confidenceInterval(testData)
-	confidenceIntervalValue = getAverage(testData) - (confidenceInterval * getStdDev(testData))
-	print('Lower Confidence Interval: %.2f' % confidenceIntervalValue)
+		print('Outliers ' + ('excluded' if screened['mode'] == 'exclude' else 'flagged') + ' (generalized ESD, alpha ' + \
+		str(screened['alpha']) + '): ' + (', '.join(str(run) + ' (%.2f)' % load for run, load in \
+		outliers.rows(['test run', 'peak load'])) if len(outliers) else 'none'))
+
+#Print the group-by statistics cube to the console, one line per group
+def printCube(results):
+	cube = results['cube']
+	levels = cube['tolerance levels']
+	fields = ['mean', 'std dev', 'three sigma'] + [statsKernel.toleranceKey(level) for level in levels]
 	print('')
-else:
-	stdDev = 'n/a'
-	print('Standard Deviation: ' + stdDev)
-	threeSigma = 'n/a'
-	print('Lower Three Sigma: ' + threeSigma)
-	confidenceInterval = 'n/a'
-	print('Lower Confidence Interval: ' + confidenceIntervalValue)
+	print('Group Stats (' + results['units'] + '): ' + ' | '.join(cube['keys']) + ' | n | mean | std dev | lower three sigma' + \
+	''.join(' | lower ' + level + ' tolerance' for level in levels))
+	for row in cube['rows']:
+		values = [str(row[key]) for key in cube['keys']] + [str(row['n'])]
+		values += ['%.2f' % row[field] if row[field] != 'n/a' else 'n/a' for field in fields]
+		print(' | '.join(values))
+
+#Print the normality tests to the console, the filtered data first and then one line per group
+def printNormality(results):
+	tests = results['normality']
 	print('')
+	print('Normality Tests (p values): ' + ' | '.join(tests['keys'] + ['n', 'shapiro-wilk', 'anderson-darling', "d'agostino"]))
+	for row in tests['rows']:
+		values = [str(row[key]) for key in tests['keys']] + [str(row['n'])]
+		values += ['%.4f' % row[field] if row[field] != 'n/a' else 'n/a' for field in normality.testFields if field.endswith(' p')]
+		print(' | '.join(values))
+
+#Command line entry point, every setting comes from the arguments so runs can be scripted
+#method: default of the --method option (statsAnalysis2.py runs this with 'z')
+def main(argv=None, method=ciMethod):
+	parser = argparse.ArgumentParser(description='Pull data from a test log csv file, analyse it and export it to an excel test document.')
+	parser.add_argument('file', nargs='?', help='test log csv file (the .csv extension is optional)')
+	parser.add_argument('--database', help='analyse the pulls of a test database (see testDatabase.py) instead of a file')
+	parser.add_argument('--query', action='append', default=[], metavar='KEY=VALUE', \
+	help='database query, any stored key (e.g. "test machine=qa") plus from=DATE and to=DATE, repeat for more')
+	parser.add_argument('--filter', action='append', default=[], metavar='KEY=VALUE', \
+	help='keep rows where KEY equals VALUE (KEY!=VALUE excludes), repeat a key to allow several values')
+	parser.add_argument('--units', nargs='+', default=['lbf'], type=str.lower, choices=unitChoices, \
+	help='units for the results (default lbf), give several (e.g. --units lbf kn) to get the statistics side by side')
+	parser.add_argument('--confidence', default='95', choices=intervalChoices, help='confidence interval (default 95)')
+	parser.add_argument('--method', default=method, choices=methodChoices, \
+	help='confidence interval method: t (t value times std dev) or z (z table times standard error), default ' + method)
+	parser.add_argument('--output', help='name of the test document (default: the csv file name)')
+	parser.add_argument('--template', help='excel template (default: reportWriter.templateFile)')
+	parser.add_argument('--curve-points', type=int, \
+	help='number of points on the bell curve (default: reportWriter.curvePoints)')
+	parser.add_argument('--group-by', action='store_true', \
+	help='also compute the statistics for every combination of ' + ', '.join(groupStats.groupKeys) + ' (with subtotals)')
+	parser.add_argument('--cache-dir', help='folder of parsed logs, logs analysed again are loaded from it instead of parsed')
+	parser.add_argument('--cache-size', type=float, default=testLog.cacheSize / 2**20, \
+	help='size cap of the cache folder in MB, least recently used logs are removed first (default 512)')
+	parser.add_argument('--no-report', action='store_true', help='only print the statistics, do not write a test document')
+	parser.add_argument('--list-filters', action='store_true', help='print the filter keys and their values and exit')
+	parser.add_argument('--show-data', action='store_true', help='print the filtered peak loads')
+	parser.add_argument('--follow', action='store_true', \
+	help='keep watching the file and reprint the statistics as new pulls are logged (Ctrl+C to stop, no test document)')
+	parser.add_argument('--interval', type=float, default=5.0, help='seconds between checks of the file with --follow (default 5)')
+	parser.add_argument('--diagnostics', action='store_true', \
+	help='time every stage (wall time, cpu time, rows, memory peak) and print the results to stderr as JSON' + \
+	' (memory tracing makes the run slower)')
+	parser.add_argument('--diagnostics-sheet', action='store_true', help='also add the stage timings to a Diagnostics sheet')
+	parser.add_argument('--tolerance', nargs='+', default=[], metavar='COVERAGE/CONFIDENCE', \
+	help='one sided lower tolerance bounds next to the lower three sigma, e.g. --tolerance 95/90 99/95' + \
+	' (also added to the group stats)')
+	parser.add_argument('--outliers', type=str.lower, choices=screening.outlierModes, \
+	help='screen the filtered peak loads with the generalized ESD test and flag the outliers or exclude them from the' + \
+	' statistics (mistests are always left out)')
+	parser.add_argument('--outlier-alpha', type=float, default=screening.outlierAlpha, \
+	help='significance level of the outlier test (default ' + str(screening.outlierAlpha) + ')')
+	parser.add_argument('--max-outliers', type=int, default=screening.outlierLimit, \
+	help='largest number of outliers the test looks for (default ' + str(screening.outlierLimit) + ')')
+	parser.add_argument('--normality', action='store_true', \
+	help="Shapiro-Wilk, Anderson-Darling and D'Agostino normality tests of the filtered data and every " + \
+	'/'.join(normality.groupKeys) + ' group')
+	parser.add_argument('--bootstrap', type=str.lower, choices=list(statsKernel.bootstrapLabels), \
+	help='bootstrap confidence interval of the mean instead of the normal one, for small or skewed lots')
+	parser.add_argument('--resamples', type=int, default=statsKernel.bootstrapResamples, \
+	help='number of bootstrap resamples (default ' + str(statsKernel.bootstrapResamples) + ')')
+	parser.add_argument('--seed', type=int, default=statsKernel.bootstrapSeed, help='seed of the bootstrap resamples (default 0)')
+	parser.add_argument('--bootstrap-workers', type=int, default=1, help='worker processes for the bootstrap resamples (default 1)')
+	parser.add_argument('--quiet', action='store_true', help='do not print anything to the console')
+	args = parser.parse_args(argv)
+	if (args.file is None) == (args.database is None):
+		parser.error('give either a test log file or --database')
+	if args.follow and args.file is None:
+		parser.error('--follow needs a test log file')
+	if args.follow and args.bootstrap:
+		parser.error('--bootstrap can not be used with --follow')
+	output = None
+	if not args.no_report:
+		output = args.output or os.path.splitext(os.path.basename(args.file or args.database))[0]
+	recorder = None
+	if args.diagnostics or args.diagnostics_sheet:
+		recorder = diagnostics.StageRecorder(sheet=args.diagnostics_sheet)
+	cache = None
+	if args.cache_dir:
+		cache = testLog.LogCache(args.cache_dir, int(args.cache_size * 2**20))
+	try:
+		if args.list_filters:
+			rawData = loadRawData(args.file, cache, args.database, args.query)
+			testData, filtersUsed = filterData(rawData, args.filter)
+			for key in testData.keys:
+				if key not in ('peak load', 'test run'):
+					print(key + ': ' + ', '.join(testData.distinct(key)))
+			return 0
+		if args.follow:
+			for results in follow(args.file, args.filter, args.units, args.confidence, args.interval, None, args.tolerance, \
+			args.method):
+				print('--- ' + time.strftime('%H:%M:%S') + ' ' + results['file'] + ' ---')
+				printResults(results)
+				sys.stdout.flush()
+			return 0
+		results = analyze(args.file, args.filter, args.units, args.confidence, output, args.template, args.curve_points, \
+		args.group_by, cache, args.database, args.query, recorder, args.bootstrap, args.resamples, args.seed, \
+		args.bootstrap_workers, args.normality, args.tolerance, args.outliers, args.outlier_alpha, args.max_outliers, \
+		args.method)
+	except FileNotFoundError as error:
+		print('Invalid File Name! (' + str(error.filename) + ')', file=sys.stderr)
+		return 1
+	except ValueError as error:
+		parser.error(str(error))
+	except KeyboardInterrupt:
+		return 0
+	if args.diagnostics:
+		print(recorder.toJson(file=results['file']), file=sys.stderr)
+	if not args.quiet:
+		printResults(results, args.show_data)
+	return 0
+
+
+""" MAIN BODY OF CODE   """
 
-#Write excel file and save
-writeTestDoc()
+if __name__ == '__main__':
+	sys.exit(main())
 
 
 """ TO DO LIST """
@@ -0,0 +1,457 @@
+#! python3
+# statsKernel.py -- Shared statistics kernel used by statsAnalysis.py and statsAnalysis2.py
+
+"""   Import Modules   """
+import math, statistics
+from concurrent.futures import ProcessPoolExecutor
+import numpy
+import moduleLoader
+
+"""   Global Variables   """
+
+stats = moduleLoader.LazyModule('scipy.stats')  #only needed for confidence levels outside the t table
+unitScales = {'lbf': 1.0, 'kn': 224.8, 'n': 0.2248, 'dan': 2.248}  #Units the loads can be reported in: unit -> lbf per unit
+unitKeys = ['mean', 'std dev', 'standard error', 'three sigma', 'conf int', 'lower conf bound', 'upper conf bound']  #Summary values in load units
+bootstrapLabels = {'percentile': 'percentile bootstrap', 'bca': 'BCa bootstrap'}  #Bootstrap interval methods -> label in the results
+bootstrapResamples = 10000  #Default number of bootstrap resamples
+bootstrapSeed = 0  #Default seed of the bootstrap resamples (same seed, same interval)
+bootstrapChunk = 10000  #Resamples per chunk, every chunk has its own seed so the workers never change the result
+bootstrapBlock = 2**22  #Most resampled values drawn at once (keeps the index array at 32 MB)
+zValues = {'85': 1.440, '90': 1.645, '95': 1.960}  #Two sided z values used by the z method (statsAnalysis2.py)
+#Degrees of freedom of the precomputed t table (t.ppf values), larger ones are interpolated in 1/df towards the z value
+tDegrees = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20, \
+21, 22, 23, 24, 25, 26, 27, 28, 29, 30, 31, 32, 33, 34, 35, 36, 37, 38, 39, 40, \
+45, 50, 55, 60, 70, 80, 90, 100, 120, 150, 200, 300, 500, 1000, 2000, 5000]
+#Two sided t critical values for every entry of tDegrees, the last value is the limit (df = infinity, the z value)
+tValues = {'85': [4.16529977, 2.281930588, 1.924319657, 1.778192164, 1.699362566, 1.650173154, 1.616591737, 1.59222144, 1.573735785, 1.559235933, \
+1.547559766, 1.537956495, 1.529919606, 1.523095061, 1.517227969, 1.51213017, 1.507659754, 1.503707672, 1.500188756, 1.497035518, \
+1.494193795, 1.491619612, 1.489276897, 1.487135783, 1.485171326, 1.483362535, 1.481691617, 1.48014339, 1.478704821, 1.477364662, \
+1.47611315, 1.474941772, 1.473843072, 1.47281049, 1.471838233, 1.470921166, 1.470054719, 1.469234815, 1.468457801, 1.467720399, \
+1.464533534, 1.461994009, 1.45992278, 1.458201256, 1.455504241, 1.453488066, 1.451923821, 1.450674871, 1.448805513, 1.446941023, \
+1.445081387, 1.443226592, 1.441746232, 1.440637986, 1.440084512, 1.439752636, 1.439531471], \
+'90': [6.313751515, 2.91998558, 2.353363435, 2.131846786, 2.015048373, 1.943180281, 1.894578605, 1.859548038, 1.833112933, 1.812461123, \
+1.795884819, 1.782287556, 1.770933396, 1.761310136, 1.753050356, 1.745883676, 1.739606726, 1.734063607, 1.729132812, 1.724718243, \
+1.720742903, 1.717144374, 1.713871528, 1.71088208, 1.708140761, 1.70561792, 1.703288446, 1.701130934, 1.699127027, 1.697260887, \
+1.695518783, 1.693888748, 1.692360309, 1.690924255, 1.689572458, 1.688297714, 1.68709362, 1.68595446, 1.684875122, 1.683851013, \
+1.679427393, 1.675905025, 1.673033965, 1.670648865, 1.666914479, 1.664124579, 1.661961084, 1.660234326, 1.657650899, 1.6550755, \
+1.652508101, 1.649948674, 1.647906854, 1.646378817, 1.645615867, 1.645158438, 1.644853627], \
+'95': [12.70620474, 4.30265273, 3.182446305, 2.776445105, 2.570581836, 2.446911851, 2.364624252, 2.306004135, 2.262157163, 2.228138852, \
+2.20098516, 2.17881283, 2.160368656, 2.144786688, 2.131449546, 2.119905299, 2.109815578, 2.10092204, 2.093024054, 2.085963447, \
+2.079613845, 2.073873068, 2.06865761, 2.063898562, 2.059538553, 2.055529439, 2.051830516, 2.048407142, 2.045229642, 2.042272456, \
+2.039513446, 2.036933343, 2.034515297, 2.032244509, 2.030107928, 2.028094001, 2.026192463, 2.024394164, 2.02269092, 2.02107539, \
+2.014103389, 2.008559112, 2.004044783, 2.000297822, 1.994437112, 1.990063421, 1.986674541, 1.983971519, 1.979930405, 1.975905331, \
+1.971896224, 1.967903011, 1.964719837, 1.962339081, 1.961150826, 1.960438552, 1.959963985]}
+tInverse = numpy.array([0.0] + [1/df for df in reversed(tDegrees)])  #1/df, increasing (df = infinity first)
+tTable = {confidence: numpy.array(values[-1:] + values[-2::-1]) for confidence, values in tValues.items()}  #t values in tInverse order
+#Sample sizes of the precomputed one sided tolerance factor table, larger ones are interpolated in 1/sqrt(n) towards the z value
+toleranceSizes = [2, 3, 4, 5, 6, 7, 8, 9, 10, 11, \
+12, 13, 14, 15, 16, 17, 18, 19, 20, 21, \
+22, 23, 24, 25, 26, 27, 28, 29, 30, 31, \
+32, 33, 34, 35, 36, 37, 38, 39, 40, 41, \
+42, 43, 44, 45, 46, 47, 48, 49, 50, 51, \
+52, 53, 54, 55, 56, 57, 58, 59, 60, 61, \
+62, 63, 64, 65, 66, 67, 68, 69, 70, 71, \
+72, 73, 74, 75, 76, 77, 78, 79, 80, 81, \
+82, 83, 84, 85, 86, 87, 88, 89, 90, 91, \
+92, 93, 94, 95, 96, 97, 98, 99, 100, 105, \
+110, 115, 120, 125, 130, 135, 140, 145, 150, 160, \
+170, 180, 190, 200, 210, 220, 230, 240, 250, 260, \
+270, 280, 290, 300, 320, 340, 360, 380, 400, 420, \
+440, 460, 480, 500, 550, 600, 650, 700, 750, 800, \
+850, 900, 950, 1000, 1100, 1200, 1300, 1400, 1500, 1600, \
+1700, 1800, 1900, 2000, 2250, 2500, 2750, 3000, 3250, 3500, \
+3750, 4000, 4250, 4500, 4750, 5000, 6000, 7000, 8000, 10000, \
+12500, 15000, 20000, 30000, 50000, 100000]
+#One sided lower tolerance factors k (coverage/confidence) for every entry of toleranceSizes, the last value is the limit (the z value)
+#k = nct.ppf(confidence, n-1, z(coverage)*sqrt(n)) / sqrt(n), other levels are built with scipy on first use
+toleranceValues = {'90/90': [10.25271403, 4.258164937, 3.187844335, 2.742348203, 2.493690205, 2.332646815, 2.218594185, 2.132874684, 2.06566832, 2.011288062, \
+1.966198536, 1.928078509, 1.895336274, 1.866841098, 1.841765818, 1.819490199, 1.799539242, 1.781542474, 1.765206312, 1.750294817, \
+1.736616006, 1.72401192, 1.712351286, 1.701524028, 1.691437081, 1.682011177, 1.673178336, 1.664879888, 1.657064913, 1.649688971, \
+1.642713092, 1.636102937, 1.629828127, 1.623861668, 1.61817949, 1.612760053, 1.607584014, 1.602633953, 1.59789413, 1.593350289, \
+1.588989479, 1.584799908, 1.580770813, 1.576892345, 1.573155478, 1.569551919, 1.566074031, 1.562714776, 1.559467649, 1.55632663, \
+1.55328614, 1.550340997, 1.547486386, 1.54471782, 1.542031117, 1.539422372, 1.536887933, 1.534424382, 1.532028517, 1.529697332, \
+1.527428003, 1.525217876, 1.523064451, 1.520965374, 1.518918424, 1.516921503, 1.51497263, 1.513069932, 1.511211635, 1.509396057, \
+1.507621606, 1.50588677, 1.504190112, 1.502530269, 1.500905944, 1.4993159, 1.497758963, 1.496234011, 1.494739977, 1.493275842, \
+1.49184063, 1.490433414, 1.489053304, 1.48769945, 1.48637104, 1.485067293, 1.483787465, 1.482530841, 1.481296734, 1.480084488, \
+1.478893471, 1.477723077, 1.476572724, 1.475441852, 1.474329922, 1.473236418, 1.47216084, 1.47110271, 1.470061565, 1.465095586, \
+1.460493782, 1.456214082, 1.45222089, 1.448483861, 1.444976945, 1.441677642, 1.438566401, 1.435626148, 1.432841891, 1.427689992, \
+1.42302182, 1.418766614, 1.414867253, 1.411277063, 1.407957487, 1.404876355, 1.402006593, 1.399325232, 1.396812638, 1.394451919, \
+1.392228453, 1.390129509, 1.388143945, 1.386261963, 1.382775097, 1.379610589, 1.376721874, 1.374071266, 1.371627901, 1.369366226, \
+1.367264881, 1.365305856, 1.363473845, 1.361755748, 1.357888435, 1.354526606, 1.351569296, 1.348941642, 1.346586811, 1.344460784, \
+1.342528866, 1.340763298, 1.339141568, 1.337645205, 1.334969803, 1.332641609, 1.330591656, 1.328768723, 1.327133873, 1.32565691, \
+1.324314006, 1.323086078, 1.321957637, 1.320915963, 1.318626233, 1.316692934, 1.315032395, 1.313586067, 1.312311597, 1.311177489, \
+1.310159773, 1.309239838, 1.308402988, 1.307637441, 1.306933628, 1.306283684, 1.304106634, 1.302417603, 1.301057997, 1.298982338, \
+1.297129114, 1.295763114, 1.293848527, 1.29158176, 1.289313, 1.287034111, 1.281551566], \
+'95/90': [13.08974199, 5.311478432, 3.956565428, 3.399833958, 3.091878134, 2.893798203, 2.754284421, 2.649901629, 2.568373206, 2.502618447, \
+2.44825146, 2.402401853, 2.363107046, 2.328976508, 2.29899546, 2.272404654, 2.248623806, 2.227201175, 2.207779393, 2.19007173, \
+2.173845222, 2.158908463, 2.145102599, 2.132294589, 2.120372086, 2.109239507, 2.098814963, 2.089027858, 2.079816971, 2.071128927, \
+2.062916957, 2.05513989, 2.047761324, 2.040748944, 2.034073952, 2.027710598, 2.021635773, 2.015828676, 2.010270529, 2.00494433, \
+1.999834645, 1.994927428, 1.990209865, 1.985670238, 1.981297812, 1.977082728, 1.973015916, 1.969089013, 1.9652943, 1.961624633, \
+1.958073395, 1.954634444, 1.95130207, 1.948070961, 1.944936164, 1.941893054, 1.938937312, 1.936064895, 1.933272014, 1.930555116, \
+1.927910865, 1.925336125, 1.922827943, 1.92038354, 1.918000294, 1.91567573, 1.913407512, 1.911193428, 1.909031388, 1.90691941, \
+1.904855617, 1.902838228, 1.900865551, 1.89893598, 1.897047987, 1.895200119, 1.893390993, 1.891619289, 1.889883752, 1.888183182, \
+1.886516435, 1.884882418, 1.883280086, 1.881708442, 1.880166529, 1.878653433, 1.877168277, 1.875710224, 1.874278467, 1.872872235, \
+1.871490787, 1.870133412, 1.868799427, 1.867488175, 1.866199026, 1.864931372, 1.863684629, 1.862458235, 1.861251649, 1.855498218, \
+1.850169163, 1.845215241, 1.840594816, 1.836272414, 1.832217602, 1.828404108, 1.824809115, 1.821412705, 1.818197397, 1.812250227, \
+1.806864074, 1.801956576, 1.7974613, 1.793323993, 1.789499862, 1.785951559, 1.782647665, 1.779561536, 1.77667041, 1.77395471, \
+1.771397497, 1.768984026, 1.7667014, 1.764538279, 1.760531627, 1.756896624, 1.753579447, 1.750536561, 1.747732324, 1.74513724, \
+1.742726665, 1.740479825, 1.738379073, 1.736409307, 1.731976791, 1.728125085, 1.72473796, 1.72172928, 1.719033689, 1.716600582, \
+1.714390094, 1.712370334, 1.710515452, 1.708804241, 1.705745379, 1.703084195, 1.700741588, 1.69865884, 1.696791325, 1.695104444, \
+1.693570907, 1.69216886, 1.690880568, 1.689691471, 1.687078153, 1.684872136, 1.682977719, 1.681327959, 1.679874441, 1.678581172, \
+1.677420762, 1.676371953, 1.675417959, 1.674545324, 1.673743122, 1.673002374, 1.670521545, 1.668597232, 1.667048489, 1.664684519, \
+1.662574331, 1.661019195, 1.658839903, 1.656260326, 1.653679118, 1.651087029, 1.644853627], \
+'95/95': [26.25967398, 7.655900133, 5.143874861, 4.202680741, 3.707683681, 3.39946898, 3.187293568, 3.031237513, 2.910963413, 2.814993666, \
+2.736342506, 2.670503909, 2.614434478, 2.566000423, 2.523658698, 2.486264022, 2.452947263, 2.423036096, 2.396001684, 2.371421904, \
+2.348955404, 2.328322926, 2.309293622, 2.291674863, 2.275304531, 2.260045128, 2.245779207, 2.232405789, 2.219837532, 2.207998472, \
+2.196822195, 2.186250364, 2.176231502, 2.16672, 2.15767529, 2.149061154, 2.140845146, 2.132998108, 2.125493754, 2.11830832, \
+2.111420261, 2.104809997, 2.098459687, 2.092353039, 2.08647514, 2.080812312, 2.075351983, 2.070082578, 2.064993418, 2.060074632, \
+2.055317086, 2.050712308, 2.04625243, 2.041930137, 2.037738613, 2.033671505, 2.029722877, 2.025887179, 2.022159215, 2.018534115, \
+2.01500731, 2.011574505, 2.008231664, 2.004974985, 2.001800886, 1.998705989, 1.995687104, 1.992741216, 1.989865475, 1.987057182, \
+1.98431378, 1.981632844, 1.979012074, 1.976449286, 1.973942403, 1.971489452, 1.969088553, 1.966737918, 1.964435841, 1.962180697, \
+1.959970935, 1.957805074, 1.9556817, 1.95359946, 1.951557062, 1.949553268, 1.947586893, 1.945656803, 1.943761912, 1.941901174, \
+1.940073592, 1.938278204, 1.936514089, 1.93478036, 1.933076168, 1.931400694, 1.92975315, 1.928132778, 1.926538851, 1.918942156, \
+1.911911266, 1.905380012, 1.899292514, 1.893601216, 1.888265366, 1.883249814, 1.878524067, 1.874061522, 1.86983886, 1.862033378, \
+1.854969724, 1.848538348, 1.842650987, 1.837235644, 1.832232935, 1.827593389, 1.823275428, 1.819243816, 1.815468477, 1.811923559, \
+1.808586706, 1.805438475, 1.802461862, 1.79964193, 1.794420859, 1.789686505, 1.785368104, 1.781408463, 1.777760789, 1.774386387, \
+1.771252943, 1.768333235, 1.765604148, 1.763045914, 1.757291609, 1.752294038, 1.747901344, 1.744001083, 1.740507991, 1.737356095, \
+1.734493448, 1.73187852, 1.729477658, 1.72726327, 1.723306177, 1.719864811, 1.716836399, 1.714144686, 1.71173175, 1.709552701, \
+1.707572145, 1.705761747, 1.704098522, 1.702563605, 1.699191085, 1.696345066, 1.693901685, 1.691774336, 1.689900409, 1.68823337, \
+1.686737822, 1.685386294, 1.684157103, 1.683032871, 1.681999488, 1.681045362, 1.67785056, 1.675373124, 1.673379646, 1.67033759, \
+1.667622872, 1.665622676, 1.662820352, 1.65950429, 1.656187197, 1.652857189, 1.644853627], \
+'99/95': [37.09358146, 10.55273012, 7.042362575, 5.741084517, 5.06198855, 4.641720331, 4.353855809, 4.143022454, 3.981117845, 3.852335705, \
+3.747084894, 3.659195927, 3.584512408, 3.520126964, 3.463941634, 3.414402363, 3.370331986, 3.330821468, 3.295156936, 3.262769431, \
+3.233199519, 3.206071845, 3.181076518, 3.157955261, 3.136490959, 3.116499665, 3.09782442, 3.080330407, 3.063901126, 3.048435342, \
+3.033844627, 3.020051366, 3.006987131, 2.994591337, 2.982810135, 2.971595484, 2.960904378, 2.950698189, 2.940942122, 2.931604733, \
+2.922657538, 2.914074661, 2.905832539, 2.897909664, 2.890286361, 2.882944593, 2.87586779, 2.869040701, 2.862449264, 2.856080488, \
+2.849922353, 2.843963718, 2.838194242, 2.832604311, 2.827184974, 2.821927886, 2.816825257, 2.811869806, 2.807054718, 2.802373608, \
+2.797820484, 2.793389723, 2.789076035, 2.784874444, 2.78078026, 2.776789062, 2.772896677, 2.769099163, 2.765392792, 2.761774036, \
+2.758239554, 2.754786178, 2.751410905, 2.748110882, 2.744883398, 2.741725877, 2.738635868, 2.735611037, 2.73264916, 2.729748118, \
+2.726905889, 2.724120543, 2.721390237, 2.718713209, 2.716087776, 2.713512325, 2.710985316, 2.708505271, 2.706070775, 2.703680471, \
+2.701333057, 2.699027286, 2.696761959, 2.694535924, 2.692348074, 2.690197346, 2.688082717, 2.686003203, 2.683957856, 2.674212841, \
+2.665198304, 2.656828405, 2.649030705, 2.641743598, 2.634914324, 2.628497404, 2.622453404, 2.616747945, 2.6113509, 2.601379021, \
+2.592359829, 2.584152084, 2.576642076, 2.569737116, 2.563360804, 2.55744953, 2.551949864, 2.54681655, 2.542010975, 2.537499969, \
+2.533254857, 2.529250709, 2.525465737, 2.521880801, 2.515245409, 2.509230917, 2.503746794, 2.498719911, 2.494090469, 2.489809037, \
+2.485834357, 2.482131685, 2.478671531, 2.475428681, 2.468136876, 2.46180673, 2.456244852, 2.451308129, 2.446888102, 2.442900889, \
+2.439280469, 2.43597408, 2.432938985, 2.430140153, 2.425139932, 2.420792711, 2.416968165, 2.413569636, 2.410523732, 2.407773593, \
+2.4052744, 2.402990283, 2.400892154, 2.398956141, 2.394703205, 2.39111515, 2.388035394, 2.385354496, 2.38299336, 2.380893215, \
+2.379009365, 2.377307134, 2.375759153, 2.374343493, 2.373042352, 2.371841105, 2.367819548, 2.364701749, 2.362193479, 2.358366669, \
+2.354952478, 2.35243742, 2.348914488, 2.344746807, 2.340579018, 2.336396203, 2.326347874]}
+toleranceInverse = numpy.array([0.0] + [1/math.sqrt(n) for n in reversed(toleranceSizes)])  #1/sqrt(n), increasing (n = infinity first)
+toleranceTables = {level: numpy.array(values[-1:] + values[-2::-1]) for level, values in toleranceValues.items()}  #k values in toleranceInverse order
+
+"""   DEFINITIONS   """
+
+#Start an empty accumulator: count, running mean and sum of squared deviations (m2)
+def newAccumulator():
+	return {'n': 0, 'mean': 0.0, 'm2': 0.0}
+
+#Fold a single value into the accumulator (Welford's method, numerically stable)
+def accumulate(acc, value):
+	acc['n'] += 1
+	delta = value - acc['mean']
+	acc['mean'] += delta / acc['n']
+	acc['m2'] += delta * (value - acc['mean'])
+	return acc
+
+#Fold a whole numpy array into the accumulator with vectorized calls
+#The array's own mean and m2 are computed first and then merged in, which keeps the result stable
+def accumulateArray(acc, values):
+	values = numpy.asarray(values, dtype=numpy.float64)
+	if len(values) == 0:
+		return acc
+	mean = values.mean()
+	batch = {'n': len(values), 'mean': float(mean), 'm2': float(numpy.square(values - mean).sum())}
+	merged = mergeAccumulators(acc, batch)
+	acc.update(merged)
+	return acc
+
+#Combine two accumulators into a new one (Chan's parallel formula)
+#Lets partial results from separate chunks or files be merged without another pass
+def mergeAccumulators(a, b):
+	n = a['n'] + b['n']
+	if n == 0:
+		return newAccumulator()
+	delta = b['mean'] - a['mean']
+	mean = a['mean'] + delta * b['n'] / n
+	m2 = a['m2'] + b['m2'] + delta**2 * a['n'] * b['n'] / n
+	return {'n': n, 'mean': mean, 'm2': m2}
+
+#Accumulators for many groups at once: group holds the group number (0..groupCount-1) of every value
+#Returns arrays of n, mean and m2 (one entry per group), built with bincount in two vectorized passes
+def groupAccumulators(group, values, groupCount):
+	values = numpy.asarray(values, dtype=numpy.float64)
+	n = numpy.bincount(group, minlength=groupCount)
+	total = numpy.bincount(group, weights=values, minlength=groupCount)
+	mean = numpy.divide(total, n, out=numpy.zeros(groupCount), where=n > 0)
+	m2 = numpy.bincount(group, weights=numpy.square(values - mean[group]), minlength=groupCount)
+	return {'n': n, 'mean': mean, 'm2': m2}
+
+#Merge group accumulators into coarser groups: group maps every old group to its new group number
+#Chan's parallel formula applied to all the groups at once, so rollups never go back to the raw values
+def mergeGroups(acc, group, groupCount):
+	n = numpy.bincount(group, weights=acc['n'], minlength=groupCount)
+	total = numpy.bincount(group, weights=acc['n'] * acc['mean'], minlength=groupCount)
+	mean = numpy.divide(total, n, out=numpy.zeros(groupCount), where=n > 0)
+	spread = acc['n'] * numpy.square(acc['mean'] - mean[group])
+	m2 = numpy.bincount(group, weights=acc['m2'] + spread, minlength=groupCount)
+	return {'n': n.astype(numpy.int64), 'mean': mean, 'm2': m2}
+
+#Critical value for a two sided confidence interval ('85', '90' or '95')
+#method 't' uses the student t distribution, method 'z' uses the fixed z table
+#The t values come from the precomputed table (n can also be an array of sample sizes), so the stats never
+#import scipy, other confidence levels fall back to scipy's t.ppf
+def criticalValue(confidence, n, method='t'):
+	confidence = str(confidence).rstrip('%')
+	if method == 'z':
+		return zValues[confidence]
+	if confidence in tValues:
+		return tableValue(confidence, n-1)
+	alpha = (1 - (int(confidence)/100))/2
+	return stats.t.ppf(1-alpha, (n-1))
+
+#t value of the precomputed table for df degrees of freedom (exact up to 40, interpolated in 1/df above that,
+#within 1e-5 of t.ppf), df below 1 gives nan like t.ppf
+def tableValue(confidence, df):
+	inverse = 1 / numpy.maximum(numpy.asarray(df, dtype=numpy.float64), 0.5)
+	values = numpy.interp(inverse, tInverse, tTable[confidence])
+	values = numpy.where(numpy.asarray(df) >= 1, values, numpy.nan)
+	if values.ndim == 0:
+		return float(values)
+	return values
+
+#Check a tolerance level ('95/90' = 95% of the population covered with 90% confidence)
+#Returns the coverage and the confidence as fractions
+def toleranceLevel(level):
+	coverage, slash, confidence = str(level).replace('%', '').partition('/')
+	try:
+		coverage, confidence = float(coverage) / 100, float(confidence) / 100
+	except ValueError:
+		slash = ''
+	if not slash or not (0 < coverage < 1 and 0 < confidence < 1):
+		raise ValueError('Invalid tolerance level "' + str(level) + '". Please use coverage/confidence, e.g. 95/90 or 99/95.')
+	return coverage, confidence
+
+#Tolerance factor table of a level in toleranceInverse order
+#Levels that are not precomputed are built once per process with scipy's noncentral t (one vectorized call)
+def toleranceTable(level):
+	if level not in toleranceTables:
+		coverage, confidence = toleranceLevel(level)
+		n = numpy.array(toleranceSizes, dtype=numpy.float64)
+		z = stats.norm.ppf(coverage)
+		k = stats.nct.ppf(confidence, n-1, z*numpy.sqrt(n)) / numpy.sqrt(n)
+		toleranceTables[level] = numpy.concatenate(([z], k[::-1]))
+	return toleranceTables[level]
+
+#One sided tolerance factor k for a sample of n values (n can also be an array of sample sizes)
+#Exact up to 100 values, interpolated in 1/sqrt(n) above that, nan below 2 values
+#Measured against the noncentral t solve for n up to 300000: within 9e-6 for the preset levels (99/95 at n = 155),
+#within 2.2e-5 for levels built on first use up to 99.9/99
+def toleranceFactor(level, n):
+	n = numpy.asarray(n, dtype=numpy.float64)
+	values = numpy.interp(1 / numpy.sqrt(numpy.maximum(n, 1)), toleranceInverse, toleranceTable(level))
+	values = numpy.where(n >= 2, values, numpy.nan)
+	if values.ndim == 0:
+		return float(values)
+	return values
+
+#Summary key of the lower tolerance bound of a level
+def toleranceKey(level):
+	return 'lower ' + level + ' tolerance bound'
+
+#Summary with the one sided lower tolerance bounds (mean - k * std dev) of every level added
+#Works on summaries from summarize ('n/a' below 2 values) and on group summaries from summarizeGroups (arrays)
+def toleranceSummary(summary, levels):
+	levels = [str(level).replace('%', '') for level in levels]
+	bounded = dict(summary)
+	bounded['tolerance levels'] = levels
+	for level in levels:
+		toleranceLevel(level)
+		if isinstance(summary['n'], numpy.ndarray):
+			bounded[toleranceKey(level)] = summary['mean'] - toleranceFactor(level, summary['n']) * summary['std dev']
+		elif summary['n'] < 2:
+			bounded[toleranceKey(level)] = 'n/a'
+		else:
+			bounded[toleranceKey(level)] = summary['mean'] - toleranceFactor(level, summary['n']) * summary['std dev']
+	return bounded
+
+#Build every summary statistic from an accumulator
+#Values that need more than one data point show up as 'n/a'
+def summarize(acc, confidence=None, method='t'):
+	n = acc['n']
+	summary = {'n': n, 'mean': 'n/a', 'variance': 'n/a', 'std dev': 'n/a', 'standard error': 'n/a', \
+	'three sigma': 'n/a', 'confidence': confidence, 'critical value': 'n/a', 'conf int': 'n/a', \
+	'lower conf bound': 'n/a', 'upper conf bound': 'n/a'}
+	if n == 0:
+		return summary
+	summary['mean'] = acc['mean']
+	if n < 2:
+		return summary
+	summary['variance'] = acc['m2'] / (n-1)
+	summary['std dev'] = math.sqrt(summary['variance'])
+	summary['standard error'] = summary['std dev'] / math.sqrt(n)
+	summary['three sigma'] = summary['mean'] - (3 * summary['std dev'])
+	if confidence is not None:
+		summary['critical value'] = criticalValue(confidence, n, method)
+		#The t method scales the standard deviation, the z method scales the standard error
+		if method == 'z':
+			summary['conf int'] = summary['critical value'] * summary['standard error']
+		else:
+			summary['conf int'] = summary['critical value'] * summary['std dev']
+		summary['lower conf bound'] = summary['mean'] - summary['conf int']
+		summary['upper conf bound'] = summary['mean'] + summary['conf int']
+	return summary
+
+#Summary statistics for group accumulators (see groupAccumulators), same keys as summarize
+#Every value is an array with one entry per group, values that need more data points are nan
+#The critical values come from one vectorized t.ppf call over the group sizes
+def summarizeGroups(acc, confidence=None, method='t'):
+	n = acc['n']
+	enough = n > 1
+	nan = numpy.full(len(n), numpy.nan)
+	summary = {'n': n, 'mean': numpy.where(n > 0, acc['mean'], numpy.nan), 'confidence': confidence}
+	summary['variance'] = numpy.divide(acc['m2'], n - 1, out=nan.copy(), where=enough)
+	summary['std dev'] = numpy.sqrt(summary['variance'])
+	summary['standard error'] = numpy.divide(summary['std dev'], numpy.sqrt(n), out=nan.copy(), where=enough)
+	summary['three sigma'] = summary['mean'] - (3 * summary['std dev'])
+	summary['critical value'] = summary['conf int'] = nan
+	if confidence is not None:
+		if method == 'z':
+			summary['critical value'] = numpy.where(enough, criticalValue(confidence, 2, method), numpy.nan)
+			summary['conf int'] = summary['critical value'] * summary['standard error']
+		else:
+			summary['critical value'] = numpy.where(enough, criticalValue(confidence, numpy.maximum(n, 2), method), numpy.nan)
+			summary['conf int'] = summary['critical value'] * summary['std dev']
+	summary['lower conf bound'] = summary['mean'] - summary['conf int']
+	summary['upper conf bound'] = summary['mean'] + summary['conf int']
+	return summary
+
+#Value of a group table as it is shown: nan (not enough values in the group) -> 'n/a' like summarize
+def shownValue(value):
+	return 'n/a' if value != value else value
+
+#Summary in another unit derived from a summary of the loads in lbf (nothing is recomputed)
+#Means, spreads and bounds scale with the unit, the variance with its square
+def convertSummary(summary, unit):
+	scale = unitScales[unit]
+	converted = dict(summary)
+	for key in unitKeys + [toleranceKey(level) for level in summary.get('tolerance levels', [])]:
+		if converted[key] != 'n/a':
+			converted[key] = converted[key] / scale
+	if converted['variance'] != 'n/a':
+		converted['variance'] = converted['variance'] / scale**2
+	return converted
+
+#Means of one chunk of bootstrap resamples of values (a numpy array)
+#Every resample is a row of a 2-D index array, so a whole block of resamples is drawn and averaged in one call
+def resampleMeans(values, resamples, seed):
+	random = numpy.random.default_rng(seed)
+	n = len(values)
+	step = max(1, bootstrapBlock // n)
+	means = numpy.empty(resamples)
+	for first in range(0, resamples, step):
+		size = min(step, resamples - first)
+		means[first:first+size] = values[random.integers(0, n, (size, n))].mean(axis=1)
+	return means
+
+#Means of the bootstrap resamples of values
+#The resamples are split in chunks with seeds spawned from seed, workers > 1 spreads the chunks over a process pool
+#(the means are the same whatever the number of workers)
+def bootstrapMeans(values, resamples=bootstrapResamples, seed=bootstrapSeed, workers=1):
+	values = numpy.asarray(values, dtype=numpy.float64)
+	counts = [min(bootstrapChunk, resamples - first) for first in range(0, resamples, bootstrapChunk)]
+	seeds = numpy.random.SeedSequence(seed).spawn(len(counts))
+	if workers > 1 and len(counts) > 1:
+		with ProcessPoolExecutor(max_workers=min(workers, len(counts))) as pool:
+			chunks = list(pool.map(resampleMeans, [values]*len(counts), counts, seeds))
+	else:
+		chunks = [resampleMeans(values, count, chunkSeed) for count, chunkSeed in zip(counts, seeds)]
+	return numpy.concatenate(chunks)
+
+#Quantiles of the bootstrap means for a bias corrected and accelerated (BCa) interval
+#The bias comes from the share of resample means below the mean, the acceleration from the jackknife
+#(every leave-one-out mean at once from the total)
+def bcaQuantiles(values, means, alpha):
+	normal = statistics.NormalDist()
+	mean = values.mean()
+	below = (numpy.count_nonzero(means < mean) + 0.5*numpy.count_nonzero(means == mean)) / len(means)
+	below = min(max(below, 1 / (len(means)+1)), len(means) / (len(means)+1))
+	bias = normal.inv_cdf(below)
+	jackknife = (values.sum() - values) / (len(values) - 1)
+	spread = jackknife.mean() - jackknife
+	denominator = 6 * numpy.square(spread).sum()**1.5
+	acceleration = float(numpy.power(spread, 3).sum() / denominator) if denominator > 0 else 0.0
+	quantiles = []
+	for z in (normal.inv_cdf(alpha), normal.inv_cdf(1 - alpha)):
+		quantiles.append(normal.cdf(bias + (bias + z) / (1 - acceleration*(bias + z))))
+	return quantiles
+
+#Two sided bootstrap confidence interval of the mean, no normality assumed
+#method: 'percentile' or 'bca', returns (lower bound, upper bound), 'n/a' for less than 2 values
+def bootstrapInterval(values, confidence, method='percentile', resamples=bootstrapResamples, seed=bootstrapSeed, workers=1):
+	if method not in bootstrapLabels:
+		raise ValueError('Invalid bootstrap method "' + str(method) + '". Please use ' + ', '.join(bootstrapLabels) + '.')
+	if resamples < 1:
+		raise ValueError('The bootstrap needs at least 1 resample.')
+	values = numpy.asarray(values, dtype=numpy.float64)
+	if len(values) < 2:
+		return 'n/a', 'n/a'
+	alpha = (1 - int(str(confidence).rstrip('%'))/100) / 2
+	means = bootstrapMeans(values, resamples, seed, workers)
+	quantiles = [alpha, 1 - alpha]
+	if method == 'bca':
+		quantiles = bcaQuantiles(values, means, alpha)
+	lower, upper = numpy.quantile(means, quantiles)
+	return float(lower), float(upper)
+
+#Summary with the confidence bounds replaced by a bootstrap interval of values (see bootstrapInterval)
+#The interval is not symmetric, so there is no critical value or conf int
+def bootstrapSummary(summary, values, method='percentile', resamples=bootstrapResamples, seed=bootstrapSeed, workers=1):
+	lower, upper = bootstrapInterval(values, summary['confidence'], method, resamples, seed, workers)
+	bootstrapped = dict(summary)
+	bootstrapped.update({'critical value': 'n/a', 'conf int': 'n/a', 'lower conf bound': lower, 'upper conf bound': upper})
+	return bootstrapped
+
+#How a confidence interval was found, added to its label (nothing for the normal interval)
+def intervalLabel(bootstrap=None):
+	if bootstrap:
+		return ' (' + bootstrapLabels[bootstrap] + ')'
+	return ''
+
+#Generalized ESD outlier test (Rosner) of values sorted in increasing order, at most maxOutliers are removed
+#and never half of the values or more (outliers are the minority, late steps on a few values left flag everything)
+#The most extreme value is always the lowest or the highest one left, so the candidates come off both ends of the
+#sorted array and the running sums are updated instead of computing the mean and std dev again every step
+#(the sums are taken around the median to keep them accurate). All the critical values come from one t.ppf call.
+#Returns the positions of the outliers in the sorted values (most extreme first), the test statistics and critical values
+def generalizedESD(sortedValues, alpha=0.05, maxOutliers=10):
+	n = len(sortedValues)
+	steps = min(maxOutliers, (n - 1) // 2)
+	if steps < 1:
+		return [], [], []
+	shifted = numpy.asarray(sortedValues, dtype=numpy.float64) - sortedValues[n // 2]
+	total = float(shifted.sum())
+	squares = float(numpy.square(shifted).sum())
+	low = 0
+	high = n - 1
+	positions = []
+	testStats = []
+	for step in range(steps):
+		count = n - step
+		mean = total / count
+		stdDev = math.sqrt(max(squares - total*mean, 0.0) / (count - 1))
+		lowGap = mean - shifted[low]
+		highGap = shifted[high] - mean
+		if highGap >= lowGap:
+			position, gap, high = high, highGap, high - 1
+		else:
+			position, gap, low = low, lowGap, low + 1
+		positions.append(position)
+		testStats.append(gap / stdDev if stdDev > 0 else 0.0)
+		total -= shifted[position]
+		squares -= shifted[position]**2
+	counts = n - numpy.arange(steps)
+	t = stats.t.ppf(1 - alpha / (2*counts), counts - 2)
+	critical = (counts - 1) * t / numpy.sqrt((counts - 2 + numpy.square(t)) * counts)
+	exceeds = numpy.flatnonzero(numpy.array(testStats) > critical)
+	found = int(exceeds[-1]) + 1 if len(exceeds) else 0
+	return positions[:found], testStats, critical.tolist()
@@ -0,0 +1,154 @@
+#! python3
+# testDatabase.py -- Loads test log csv files into a local SQLite database and reads filtered pulls back as testLog tables
+
+"""   Import Modules   """
+import argparse, os, sqlite3, sys
+import testLog
+
+"""   Global Variables   """
+
+databaseFile = 'testLogs.db'  #Default database file
+#Columns stored for every pull: key -> (csv column, sql column, sql type)
+#Text values are lower cased the same way testLog does it, the time stamp is kept as written (ISO 8601)
+pullColumns = [('test run', 0, 'test_run', 'INTEGER'), ('test log', 1, 'test_log', 'TEXT'), \
+('procedure', 2, 'procedure', 'TEXT'), ('configuration', 3, 'configuration', 'TEXT'), \
+('peak load', 4, 'peak_load', 'REAL'), ('mistest', 6, 'mistest', 'TEXT'), ('failure type', 7, 'failure_type', 'TEXT'), \
+('failure notes', 8, 'failure_notes', 'TEXT'), ('color', 9, 'color', 'TEXT'), ('size', 10, 'size', 'TEXT'), \
+('test machine', 13, 'test_machine', 'TEXT'), ('time stamp', 14, 'time_stamp', 'TEXT')]
+sqlColumns = {key: sqlColumn for key, col, sqlColumn, sqlType in pullColumns}
+indexedKeys = ['procedure', 'configuration', 'failure type', 'color', 'size', 'test log', 'test machine', 'time stamp']
+rangeKeys = {'from': '>=', 'to': '<='}  #Query keys for the time stamp range (dates or full time stamps, both inclusive)
+
+"""   DEFINITIONS   """
+
+#Open (and create if needed) the database with its tables and indexes
+def connect(database=databaseFile):
+	connection = sqlite3.connect(database)
+	connection.execute('PRAGMA journal_mode=WAL')
+	connection.execute('PRAGMA synchronous=NORMAL')
+	connection.execute('CREATE TABLE IF NOT EXISTS logs (id INTEGER PRIMARY KEY, path TEXT UNIQUE, size INTEGER, mtime REAL)')
+	connection.execute('CREATE TABLE IF NOT EXISTS pulls (log_id INTEGER REFERENCES logs(id), ' + \
+	', '.join(sqlColumn + ' ' + sqlType for key, col, sqlColumn, sqlType in pullColumns) + ')')
+	connection.execute('CREATE INDEX IF NOT EXISTS pulls_log_id ON pulls (log_id)')
+	for key in indexedKeys:
+		connection.execute('CREATE INDEX IF NOT EXISTS pulls_' + sqlColumns[key] + ' ON pulls (' + sqlColumns[key] + ')')
+	return connection
+
+#Database row of a csv data row (missing trailing columns are stored as empty strings)
+def pullRow(logId, row):
+	values = [logId]
+	for key, col, sqlColumn, sqlType in pullColumns:
+		value = row[col] if col < len(row) else ''
+		if sqlType == 'INTEGER':
+			value = int(value)
+		elif sqlType == 'REAL':
+			value = float(value)
+		elif key != 'time stamp':
+			value = value.lower()
+		values.append(value)
+	return values
+
+#Load one test log into the database, a log that changed since it was loaded replaces its old pulls
+#Every log is one transaction and the rows go in with executemany one chunk at a time
+#Returns the number of pulls loaded (0 when the log was already up to date)
+def ingestLog(connection, fileName, chunkSize=testLog.chunkRows):
+	path = os.path.abspath(fileName)
+	info = os.stat(path)
+	insert = 'INSERT INTO pulls VALUES (' + ', '.join(['?']*(len(pullColumns)+1)) + ')'
+	with connection:
+		known = connection.execute('SELECT id, size, mtime FROM logs WHERE path = ?', (path,)).fetchone()
+		if known is not None:
+			if known[1] == info.st_size and known[2] == info.st_mtime:
+				return 0
+			connection.execute('DELETE FROM pulls WHERE log_id = ?', (known[0],))
+			connection.execute('DELETE FROM logs WHERE id = ?', (known[0],))
+		logId = connection.execute('INSERT INTO logs (path, size, mtime) VALUES (?, ?, ?)', \
+		(path, info.st_size, info.st_mtime)).lastrowid
+		count = 0
+		for rows in testLog.iterRowChunks(path, chunkSize):
+			connection.executemany(insert, (pullRow(logId, row) for row in rows))
+			count += len(rows)
+	return count
+
+#Load every test log found for the patterns (directories, glob patterns or files)
+#Returns {path: pulls loaded}
+def ingest(database, patterns):
+	connection = connect(database)
+	try:
+		return {path: ingestLog(connection, path) for path in testLog.findTestLogs(patterns)}
+	finally:
+		connection.close()
+
+#SQL where clause and parameters of a query spec
+#The spec uses the filter syntax of testLog.parseFilters on any stored key (e.g. 'test machine=qa'),
+#plus from=DATE and to=DATE for the time stamp range
+def whereClause(query):
+	clauses = []
+	parameters = []
+	included = {}
+	for key, operator, value in testLog.parseFilters(query or []):
+		if key in rangeKeys:
+			if operator != '=':
+				raise ValueError('Use ' + key + '=DATE for the time stamp range')
+			#'to' is inclusive, so a date also matches every time stamp of that day
+			clauses.append('time_stamp ' + rangeKeys[key] + ' ?')
+			parameters.append(value.upper() + ('~' if key == 'to' else ''))
+			continue
+		if key not in sqlColumns:
+			raise ValueError('Invalid query key "' + key + '", choose from: ' + ', '.join(list(sqlColumns) + list(rangeKeys)))
+		if key == 'time stamp':
+			value = value.upper() #time stamps are stored as written
+		if operator == '=':
+			included.setdefault(key, []).append(value)
+		else:
+			clauses.append(sqlColumns[key] + ' != ?')
+			parameters.append(value)
+	for key, values in included.items():
+		clauses.append(sqlColumns[key] + ' IN (' + ', '.join(['?']*len(values)) + ')')
+		parameters.extend(values)
+	if not clauses:
+		return '', parameters
+	return ' WHERE ' + ' AND '.join(clauses), parameters
+
+#Read the pulls that match a query spec (see whereClause) into a testLog table
+#Rows are fetched and parsed one chunk at a time, in the order the logs were loaded
+def readQuery(database, query=None, chunkSize=testLog.chunkRows):
+	if not os.path.exists(database):
+		raise FileNotFoundError(2, 'No such database', database)
+	where, parameters = whereClause(query)
+	#Put every value back in its csv column so the testLog parser can be used as is
+	positions = {col: sqlColumn for key, col, sqlColumn, sqlType in pullColumns}
+	width = max(positions) + 1
+	select = ', '.join(positions.get(col, "''") for col in range(width))
+	connection = connect(database)
+	try:
+		cursor = connection.execute('SELECT ' + select + ' FROM pulls' + where + ' ORDER BY log_id, rowid', parameters)
+		builder = testLog.TestLogBuilder()
+		rows = cursor.fetchmany(chunkSize)
+		while rows:
+			builder.addRows([[str(value) for value in row] for row in rows])
+			rows = cursor.fetchmany(chunkSize)
+		return builder.build()
+	finally:
+		connection.close()
+
+#Command line entry point: load test logs into the database
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Load test log csv files into a local SQLite database for statsAnalysis.py --database.')
+	parser.add_argument('paths', nargs='+', help='directories, glob patterns (e.g. "logs/TestLog_*.csv") or files')
+	parser.add_argument('--database', default=databaseFile, help='database file (default ' + databaseFile + ')')
+	args = parser.parse_args(argv)
+	loaded = ingest(args.database, args.paths)
+	if not loaded:
+		print('No test logs found.', file=sys.stderr)
+		return 1
+	updated = [path for path, count in loaded.items() if count]
+	print('Loaded ' + str(sum(loaded.values())) + ' pulls from ' + str(len(updated)) + ' test logs into ' + args.database + \
+	' (' + str(len(loaded) - len(updated)) + ' already up to date)')
+	return 0
+
+
+""" MAIN BODY OF CODE   """
+
+if __name__ == '__main__':
+	sys.exit(main())
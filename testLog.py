@@ -0,0 +1,538 @@
+#! python3
+# testLog.py -- Columnar (numpy backed) table of the data points in a testomatic test log csv file
+
+"""   Import Modules   """
+import csv, glob, hashlib, json, os
+import numpy
+
+"""   Global Variables   """
+
+headerRows = 16  #Number of header lines in a testomatic file before the first data point
+#Columns pulled from every csv row: (key, csv column, kind)
+#'category' columns are dictionary encoded: the distinct values are stored once and every row keeps a small integer code
+columnLayout = [('test run', 0, 'int'), ('procedure', 2, 'category'), ('configuration', 3, 'category'), \
+('peak load', 4, 'float'), ('mistest', 6, 'category'), ('failure type', 7, 'category'), ('failure notes', 8, 'category'), ('color', 9, 'category'), \
+('size', 10, 'category')]
+columnKinds = {key: kind for key, col, kind in columnLayout}
+chunkRows = 65536  #Rows parsed at a time when reading a file
+cacheVersion = 3  #Format of the parsed log cache files, bump it when the columns change
+cacheSize = 512 * 2**20  #Default size cap of a parsed log cache folder (bytes)
+bitCounts = numpy.array([bin(i).count('1') for i in range(256)], dtype=numpy.uint8)  #Set bits in every byte value
+
+"""   DEFINITIONS   """
+
+#Smallest unsigned integer type that can hold a code for every category value
+def codeType(categoryCount):
+	if categoryCount <= 2**8:
+		return numpy.uint8
+	elif categoryCount <= 2**16:
+		return numpy.uint16
+	return numpy.uint32
+
+#Set of rows stored as a packed bitmap (one bit per row of the base table)
+#Masks combine with & (AND), | (OR) and ~ (NOT) without touching the table data
+class RowMask:
+	def __init__(self, bits, size):
+		self.bits = bits
+		self.size = size
+
+	@classmethod
+	def fromBool(cls, hits):
+		return cls(numpy.packbits(hits), len(hits))
+
+	@classmethod
+	def all(cls, size):
+		return ~cls.none(size)
+
+	@classmethod
+	def none(cls, size):
+		return cls(numpy.zeros((size + 7)//8, dtype=numpy.uint8), size)
+
+	def __and__(self, other):
+		return RowMask(self.bits & other.bits, self.size)
+
+	def __or__(self, other):
+		return RowMask(self.bits | other.bits, self.size)
+
+	def __invert__(self):
+		bits = ~self.bits
+		#Clear the padding bits after the last row
+		if self.size % 8 and len(bits):
+			bits[-1] &= (0xFF << (8 - self.size % 8)) & 0xFF
+		return RowMask(bits, self.size)
+
+	#Number of rows in the set
+	def count(self):
+		return int(bitCounts[self.bits].sum(dtype=numpy.int64))
+
+	def any(self):
+		return bool(self.bits.any())
+
+	def toBool(self):
+		return numpy.unpackbits(self.bits, count=self.size).astype(bool)
+
+#Table of test data stored column by column
+#columns: key -> numpy array (integer codes for category columns)
+#categories: key -> list of distinct values for the category columns (index = code)
+#keys: the columns (in order) that are shown to the user, filtered keys are dropped from this list
+#mask: rows of the columns that belong to this table (None = every row), filtered tables are views
+#that share the column arrays and value indexes of the table they came from
+#scales: key -> divisor applied when a numeric column is read (unit conversion), the stored values never change
+#The column arrays are made read only, so the raw data and every view of it can safely share them
+class TestLog:
+	def __init__(self, columns, categories, keys=None, mask=None, indexes=None, scales=None):
+		for values in columns.values():
+			values.setflags(write=False)
+		self.columns = columns
+		self.categories = categories
+		if keys is None:
+			keys = [key for key, col, kind in columnLayout]
+		self.keys = list(keys)
+		self.mask = mask
+		self.indexes = {} if indexes is None else indexes  #category key -> {value: RowMask}, built on first use (see where)
+		self.scales = {} if scales is None else scales
+
+	def __len__(self):
+		if self.mask is not None:
+			return self.mask.count()
+		return len(self.columns['peak load'])
+
+	#Number of rows in the underlying column arrays
+	def baseSize(self):
+		return len(self.columns['peak load'])
+
+	#Build a table from testomatic csv rows (header rows already removed)
+	#Strings are lower cased the same way the old list of dictionaries was
+	@classmethod
+	def fromRows(cls, rows):
+		builder = TestLogBuilder()
+		builder.addRows(rows)
+		return builder.build()
+
+	#Decoded values of a column (only the rows in this table), scaled columns come out in their unit
+	def column(self, key):
+		values = self.columns[key]
+		if self.mask is not None:
+			values = values[self.mask.toBool()]
+		if key in self.categories:
+			return numpy.array(self.categories[key], dtype=object)[values]
+		if key in self.scales:
+			return values / self.scales[key]
+		return values
+
+	#Category codes of a column (only the rows in this table), decode with self.categories[key]
+	def codes(self, key):
+		values = self.columns[key]
+		if self.mask is not None:
+			values = values[self.mask.toBool()]
+		return values
+
+	#Values of a numeric column for every base row (scaled columns come out in their unit)
+	def baseValues(self, key):
+		if key in self.scales:
+			return self.columns[key] / self.scales[key]
+		return self.columns[key]
+
+	#RowMask of the rows whose value in the column matches
+	#Category columns look the value up once and compare the small integer codes, the mask of every value
+	#asked for is kept (shared by every view of the table)
+	#Numeric columns compare the whole column with the number in one vectorized pass (no per value index)
+	def where(self, key, value):
+		if key in self.categories:
+			masks = self.indexes.setdefault(key, {})
+			if value not in masks:
+				categories = self.categories[key]
+				if value in categories:
+					masks[value] = RowMask.fromBool(self.columns[key] == categories.index(value))
+				else:
+					masks[value] = RowMask.none(self.baseSize())
+			return masks[value]
+		try:
+			number = float(value)
+		except ValueError:
+			return RowMask.none(self.baseSize())
+		return RowMask.fromBool(self.baseValues(key) == number)
+
+	#RowMask of every row in this table
+	def rowMask(self):
+		if self.mask is None:
+			return RowMask.all(self.baseSize())
+		return self.mask
+
+	#View of the rows in both this table and the mask (no column data is copied)
+	def filter(self, mask, keys=None):
+		return TestLog(self.columns, self.categories, self.keys if keys is None else keys, \
+		self.rowMask() & mask, self.indexes, self.scales)
+
+	#View of the rows whose value in the column matches
+	def select(self, key, value):
+		return self.filter(self.where(key, value))
+
+	#RowMask of rows given by their position in this table (0 = first row of this view)
+	def positionMask(self, positions):
+		rowIds = numpy.arange(self.baseSize()) if self.mask is None else numpy.flatnonzero(self.mask.toBool())
+		hits = numpy.zeros(self.baseSize(), dtype=bool)
+		hits[rowIds[positions]] = True
+		return RowMask.fromBool(hits)
+
+	#Distinct values of a column in order of first appearance
+	#The categories of a base table already are its distinct values in that order, for a view numpy.unique finds the
+	#first row of every value (category columns only look at their small integer codes), numeric values come out as
+	#lower case strings
+	def distinct(self, key):
+		if key in self.categories:
+			if self.mask is None:
+				return list(self.categories[key])
+			codes, first = numpy.unique(self.codes(key), return_index=True)
+			return [self.categories[key][code] for code in codes[numpy.argsort(first)].tolist()]
+		values, first = numpy.unique(self.column(key), return_index=True)
+		return [str(value).lower() for value in values[numpy.argsort(first)].tolist()]
+
+	#View of the table with a numeric column read in another unit (values are divided by scale when read)
+	#No column data is copied, the scale is only applied when the values are rendered
+	def withScale(self, key, scale):
+		scales = dict(self.scales)
+		scales[key] = scale
+		return TestLog(self.columns, self.categories, self.keys, self.mask, self.indexes, scales)
+
+	#Sorted copy of the peak loads
+	def sortedLoads(self):
+		return numpy.sort(self.column('peak load'))
+
+	#Iterate over the rows as tuples of python values (in key order) for export
+	#Values are decoded one chunk at a time, so exporting never builds python objects for the whole table
+	def rows(self, keys=None, chunkSize=chunkRows):
+		if keys is None:
+			keys = self.keys
+		rowIds = None
+		if self.mask is not None:
+			rowIds = numpy.flatnonzero(self.mask.toBool())
+		decoders = {key: numpy.array(self.categories[key], dtype=object) for key in keys if key in self.categories}
+		for start in range(0, len(self), chunkSize):
+			if rowIds is None:
+				rows = slice(start, start + chunkSize)
+			else:
+				rows = rowIds[start:start + chunkSize]
+			columns = []
+			for key in keys:
+				values = self.columns[key][rows]
+				if key in decoders:
+					values = decoders[key][values]
+				elif key in self.scales:
+					values = values / self.scales[key]
+				columns.append(values.tolist())
+			yield from zip(*columns)
+
+#Collects chunks of csv rows into the column arrays of a table
+#Every chunk is parsed into compact typed arrays straight away so the raw strings can be dropped,
+#category codes come from one shared lookup so the chunks join without recoding
+class TestLogBuilder:
+	def __init__(self):
+		self.chunks = {key: [] for key, col, kind in columnLayout}
+		self.lookups = {key: {} for key, col, kind in columnLayout if kind == 'category'}
+		self.rawLookups = {key: {} for key in self.lookups}  #raw csv string -> code (lower() runs once per distinct string)
+
+	#Parse a chunk of csv rows (a list) into typed arrays
+	def addRows(self, rows):
+		for key, col, kind in columnLayout:
+			values = [row[col] for row in rows]
+			if kind == 'int':
+				self.chunks[key].append(numpy.array(values, dtype=str).astype(numpy.int64))
+			elif kind == 'float':
+				self.chunks[key].append(numpy.array(values, dtype=str).astype(numpy.float64))
+			else:
+				lookup = self.lookups[key]
+				rawLookup = self.rawLookups[key]
+				codes = []
+				for value in values:
+					code = rawLookup.get(value)
+					if code is None:
+						code = rawLookup[value] = lookup.setdefault(value.lower(), len(lookup))
+					codes.append(code)
+				self.chunks[key].append(numpy.array(codes, dtype=numpy.uint32))
+		return len(rows)
+
+	#Join the chunks into a table
+	def build(self):
+		columns = {}
+		categories = {}
+		for key, col, kind in columnLayout:
+			if kind == 'int':
+				dtype = numpy.int64
+			elif kind == 'float':
+				dtype = numpy.float64
+			else:
+				categories[key] = list(self.lookups[key])
+				dtype = codeType(len(categories[key]))
+			if self.chunks[key]:
+				columns[key] = numpy.concatenate(self.chunks[key]).astype(dtype, copy=False)
+			else:
+				columns[key] = numpy.array([], dtype=dtype)
+			self.chunks[key] = []
+		return TestLog(columns, categories)
+
+#Data rows of a testomatic csv reader
+#Skips the header block at the top, the header blocks repeated inside concatenated exports
+#(they start with a 'Product:' row) and blank lines
+#state ({'skip': header lines left}) lets a reader that is fed in pieces carry on where it stopped
+def iterDataRows(reader, state=None):
+	if state is None:
+		state = {'skip': headerRows}
+	for row in reader:
+		if state['skip']:
+			state['skip'] -= 1
+			continue
+		if not row or not ''.join(row).strip():
+			continue
+		if row[0] == 'Product:':
+			state['skip'] = headerRows - 1
+			continue
+		yield row
+
+#Read a testomatic csv file lazily and yield lists of at most chunkSize data rows
+#Only one chunk of raw strings is in memory at a time and the file is closed when reading stops
+def iterRowChunks(fileName, chunkSize=chunkRows):
+	with open(fileName, newline='') as testomaticFile:
+		rows = []
+		for row in iterDataRows(csv.reader(testomaticFile)):
+			rows.append(row)
+			if len(rows) >= chunkSize:
+				yield rows
+				rows = []
+		if rows:
+			yield rows
+
+#Read a testomatic csv file lazily and yield a typed table for every chunk of rows
+def iterChunks(fileName, chunkSize=chunkRows):
+	for rows in iterRowChunks(fileName, chunkSize):
+		yield TestLog.fromRows(rows)
+
+#Read a whole testomatic csv file into one table, parsing it chunk by chunk
+def readTestLog(fileName, chunkSize=chunkRows):
+	builder = TestLogBuilder()
+	for rows in iterRowChunks(fileName, chunkSize):
+		builder.addRows(rows)
+	return builder.build()
+
+#Find the test log csv files for a list of directories, glob patterns or file names
+#Largest files come first so the long jobs start early and the workers finish together
+def findTestLogs(patterns):
+	paths = []
+	for pattern in patterns:
+		if os.path.isdir(pattern):
+			pattern = os.path.join(pattern, '*.csv')
+		paths.extend(glob.glob(pattern))
+	paths = sorted(set(os.path.normpath(path) for path in paths))
+	return sorted(paths, key=os.path.getsize, reverse=True)
+
+#Content hash of a file (sha1), read in blocks
+def fileDigest(fileName, blockSize=2**20):
+	digest = hashlib.sha1()
+	with open(fileName, 'rb') as testomaticFile:
+		for block in iter(lambda: testomaticFile.read(blockSize), b''):
+			digest.update(block)
+	return digest.hexdigest()
+
+#Save a table's column arrays and category values to a .npz file (no pickled objects)
+def saveTestLog(table, fileName):
+	arrays = {'version': numpy.array(cacheVersion)}
+	for key, col, kind in columnLayout:
+		arrays['column ' + key] = table.columns[key]
+		if key in table.categories:
+			arrays['categories ' + key] = numpy.array(table.categories[key], dtype=str)
+	with open(fileName, 'wb') as cacheFile:
+		numpy.savez(cacheFile, **arrays)
+
+#Load a table saved by saveTestLog
+def loadTestLog(fileName):
+	columns = {}
+	categories = {}
+	with numpy.load(fileName) as arrays:
+		if int(arrays['version']) != cacheVersion:
+			raise ValueError('Parsed log cache file ' + fileName + ' has an old format')
+		for key, col, kind in columnLayout:
+			columns[key] = arrays['column ' + key]
+			if kind == 'category':
+				categories[key] = arrays['categories ' + key].tolist()
+	return TestLog(columns, categories)
+
+#Folder of parsed test logs (one .npz file per log content) so logs that are analysed again skip the csv parsing
+#index.json maps a log's path to the size, modification time and content hash it had when it was cached,
+#so an unchanged log is found without hashing it again and a copied or renamed log is found by its hash.
+#Loading a cached log marks it as recently used, the least recently used files are removed once the
+#folder is bigger than maxBytes.
+class LogCache:
+	def __init__(self, folder, maxBytes=cacheSize):
+		self.folder = folder
+		self.maxBytes = maxBytes
+		self.indexName = os.path.join(folder, 'index.json')
+
+	#Read a test log through the cache
+	def read(self, fileName, chunkSize=chunkRows):
+		os.makedirs(self.folder, exist_ok=True)
+		path = os.path.abspath(fileName)
+		info = os.stat(path)
+		index = self.loadIndex()
+		entry = index.get(path)
+		if entry is not None and entry['size'] == info.st_size and entry['mtime'] == info.st_mtime:
+			digest = entry['hash']
+		else:
+			digest = fileDigest(path)
+		cacheName = os.path.join(self.folder, digest + '.npz')
+		table = None
+		if os.path.exists(cacheName):
+			try:
+				table = loadTestLog(cacheName)
+				os.utime(cacheName)
+			except (OSError, ValueError, KeyError):
+				table = None
+		if table is None:
+			table = readTestLog(path, chunkSize)
+			self.store(table, cacheName)
+		if entry is None or entry['hash'] != digest or entry['size'] != info.st_size or entry['mtime'] != info.st_mtime:
+			index[path] = {'size': info.st_size, 'mtime': info.st_mtime, 'hash': digest}
+			self.saveIndex(index)
+		return table
+
+	#Write a parsed log to the cache (through a temporary file so other processes never see half a file)
+	def store(self, table, cacheName):
+		tempName = cacheName + '.' + str(os.getpid()) + '.tmp'
+		saveTestLog(table, tempName)
+		os.replace(tempName, cacheName)
+		self.evict()
+
+	#Remove the least recently used parsed logs until the folder fits in maxBytes
+	def evict(self):
+		files = []
+		for name in os.listdir(self.folder):
+			if name.endswith('.npz'):
+				try:
+					info = os.stat(os.path.join(self.folder, name))
+				except OSError:
+					continue
+				files.append((info.st_mtime, info.st_size, name))
+		total = sum(size for mtime, size, name in files)
+		for mtime, size, name in sorted(files):
+			if total <= self.maxBytes:
+				break
+			try:
+				os.remove(os.path.join(self.folder, name))
+			except OSError:
+				pass
+			total -= size
+
+	#Path -> {'size', 'mtime', 'hash'} of the logs read through the cache
+	def loadIndex(self):
+		try:
+			with open(self.indexName) as indexFile:
+				return json.load(indexFile)
+		except (OSError, ValueError):
+			return {}
+
+	#Write the index through a temporary file
+	def saveIndex(self, index):
+		tempName = self.indexName + '.' + str(os.getpid()) + '.tmp'
+		with open(tempName, 'w') as indexFile:
+			json.dump(index, indexFile)
+		os.replace(tempName, self.indexName)
+
+#Follows a test log that is still being written (tail -f): every poll only reads the bytes appended
+#since the last one and returns the new data rows, an unfinished last line is left for the next poll
+#The file starting over (smaller than the offset) is read again from the top
+class LogFollower:
+	def __init__(self, fileName):
+		self.fileName = fileName
+		self.restarts = 0  #Number of times the file started over, the caller has to drop what it had
+		self.reset()
+
+	#Start again from the top of the file
+	def reset(self):
+		self.offset = 0
+		self.state = {'skip': headerRows}
+
+	#New data rows (csv rows) appended to the file since the last poll
+	def poll(self):
+		if os.path.getsize(self.fileName) < self.offset:
+			self.reset()
+			self.restarts += 1
+		with open(self.fileName, 'rb') as testomaticFile:
+			testomaticFile.seek(self.offset)
+			data = testomaticFile.read()
+		end = data.rfind(b'\n') + 1
+		if end == 0:
+			return []
+		self.offset += end
+		lines = data[:end].decode(errors='replace').splitlines()
+		return list(iterDataRows(csv.reader(lines), self.state))
+
+#Test whether a csv data row passes parsed filters (see parseFilters), same rules as applyFilters
+#Used for rows that arrive one at a time, so unknown values simply do not match
+def rowMatches(row, filters):
+	included = {}
+	for key, operator, value in filters:
+		matches = row[columnIndex(key)].lower() == value
+		if operator == '=':
+			included[key] = included.get(key, False) or matches
+		elif matches:
+			return False
+	return all(included.values())
+
+#Csv column of a key
+def columnIndex(key):
+	for layoutKey, col, kind in columnLayout:
+		if layoutKey == key:
+			return col
+	raise ValueError('Invalid filter key "' + key + '", choose from: ' + ', '.join(columnKinds))
+
+#Parse a declarative filter spec into [key, operator, value] entries
+#Accepts 'key=value' / 'key!=value' strings or a dictionary of key -> value (or list of values)
+def parseFilters(filters):
+	parsed = []
+	if isinstance(filters, dict):
+		for key, values in filters.items():
+			if isinstance(values, str):
+				values = [values]
+			for value in values:
+				parsed.append([str(key).lower().strip(), '=', str(value).lower().strip()])
+		return parsed
+	for spec in filters:
+		if '!=' in spec:
+			key, value = spec.split('!=', 1)
+			operator = '!='
+		elif '=' in spec:
+			key, value = spec.split('=', 1)
+			operator = '='
+		else:
+			raise ValueError('Invalid filter "' + spec + '", use key=value or key!=value')
+		parsed.append([key.lower().strip(), operator, value.lower().strip()])
+	return parsed
+
+#Apply parsed filters to a table and return the filtered view and the filters used
+#Values given for the same key match any of them (OR), different keys must all match (AND)
+#and '!=' removes a value (NOT). A key filtered down to a single value is dropped from the keys.
+def applyFilters(table, filters):
+	filtersUsed = []
+	mask = table.rowMask()
+	keys = list(table.keys)
+	for key in dict.fromkeys(key for key, operator, value in filters):
+		if key not in table.keys:
+			raise ValueError('Invalid filter key "' + key + '", choose from: ' + ', '.join(table.keys))
+		#Category values are checked against the category list, only numeric columns need their distinct values
+		instances = table.categories[key] if key in table.categories else table.distinct(key)
+		included = None
+		for filterKey, operator, value in filters:
+			if filterKey != key:
+				continue
+			if value not in instances:
+				raise ValueError('Invalid filter value "' + value + '" for ' + key + ', choose from: ' + ', '.join(instances))
+			if operator == '=':
+				included = table.where(key, value) if included is None else included | table.where(key, value)
+				filtersUsed.append([key, value])
+			else:
+				mask = mask & ~table.where(key, value)
+				filtersUsed.append([key, 'not ' + value])
+		if included is not None:
+			mask = mask & included
+		if [operator for filterKey, operator, value in filters if filterKey == key] == ['=']:
+			keys.remove(key)
+	return table.filter(mask, keys), filtersUsed
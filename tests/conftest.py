@@ -0,0 +1,23 @@
+# conftest.py -- Lets the tests import the scripts in the folder above (they are plain modules, not a package)
+
+import os, sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+#Smallest test document template: a cover sheet with a merged title and the two sheets the report streams
+@pytest.fixture
+def template(tmp_path):
+	import openpyxl
+	wb = openpyxl.Workbook()
+	cover = wb.active
+	cover.title = 'Cover'
+	cover['A1'] = 'Test Document'
+	cover['A2'] = 'Prepared by'
+	cover.merge_cells('A1:D1')
+	cover.column_dimensions['A'].width = 30
+	wb.create_sheet('Raw Data').page_setup.orientation = 'landscape'
+	wb.create_sheet('Statistics')
+	fileName = str(tmp_path / 'template.xlsx')
+	wb.save(fileName)
+	return fileName
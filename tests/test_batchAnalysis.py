@@ -0,0 +1,45 @@
+# test_batchAnalysis.py -- Whole folders of test logs analysed in a process pool: summary rows, reports and failed logs
+
+"""   Import Modules   """
+import csv, os
+import pytest
+import batchAnalysis, benchmark, statsAnalysis, statsAnalysis2
+
+"""   DEFINITIONS   """
+
+#Folder of synthetic test logs of different sizes and one log with a peak load that is not a number
+@pytest.fixture
+def logFolder(tmp_path):
+	folder = tmp_path / 'logs'
+	folder.mkdir()
+	for number, rows in enumerate([30, 60, 90]):
+		benchmark.writeSyntheticLog(str(folder / ('TestLog_' + str(number) + '.csv')), rows, seed=number)
+	(folder / 'broken.csv').write_text('\r\n'.join(benchmark.headerBlock + ['31564,6952,5kN Proof,axial,broke,0,FALSE,Break,,,,,,QA,']))
+	return str(folder)
+
+#Every log gets the statistics a single run gives it, the broken file only gets an error
+@pytest.mark.parametrize('method, script', [('t', statsAnalysis), ('z', statsAnalysis2)])
+def testAnalyzeBatch(logFolder, method, script):
+	rows = batchAnalysis.analyzeBatch([logFolder], method=method, workers=2)
+	assert [os.path.basename(row['file']) for row in rows] == ['TestLog_0.csv', 'TestLog_1.csv', 'TestLog_2.csv', 'broken.csv']
+	for row in rows[:3]:
+		summary = script.analyze(row['file'])['summary']
+		assert row['error'] == '' and row['report'] == ''
+		assert [row['n'], row['mean'], row['lower conf bound']] == [summary['n'], summary['mean'], summary['lower conf bound']]
+	assert rows[3]['error']
+
+def testNoLogs(tmp_path):
+	assert batchAnalysis.analyzeBatch([str(tmp_path / '*.csv')]) == []
+	assert batchAnalysis.main([str(tmp_path)]) == 1
+
+#The command line writes a test document per log and the summary index next to them
+def testMain(logFolder, tmp_path, template):
+	outputDir = str(tmp_path / 'reports')
+	assert batchAnalysis.main([logFolder, '--output-dir', outputDir, '--template', template, '--workers', '1', \
+	'--units', 'kN']) == 1 #the broken log fails the batch
+	assert sorted(os.listdir(outputDir)) == ['TestLog_0.xlsx', 'TestLog_1.xlsx', 'TestLog_2.xlsx', 'summary.csv']
+	with open(os.path.join(outputDir, 'summary.csv'), newline='') as indexFile:
+		rows = list(csv.DictReader(indexFile))
+	assert [row['n'] for row in rows] == ['30', '60', '90', '']
+	assert {row['units'] for row in rows} == {'kn'}
+	assert rows[0]['report'] == os.path.join(outputDir, 'TestLog_0.xlsx')
@@ -0,0 +1,50 @@
+# test_bootstrap.py -- Percentile and BCa bootstrap intervals checked against scipy, and the bootstrap analysis option
+
+"""   Import Modules   """
+import numpy, pytest
+from scipy import stats
+import benchmark, statsAnalysis, statsKernel
+
+"""   DEFINITIONS   """
+
+#BCa quantiles worked out with scipy's normal distribution from the same bootstrap means (Efron and Tibshirani 14.3)
+def plainBCa(values, means, alpha):
+	bias = stats.norm.ppf(numpy.mean(means < values.mean()))
+	jackknife = numpy.array([numpy.delete(values, i).mean() for i in range(len(values))])
+	spread = jackknife.mean() - jackknife
+	acceleration = numpy.sum(spread**3) / (6 * numpy.sum(spread**2)**1.5)
+	z = stats.norm.ppf([alpha, 1 - alpha])
+	return stats.norm.cdf(bias + (bias + z) / (1 - acceleration*(bias + z)))
+
+def testBCaQuantiles():
+	values = numpy.random.default_rng(2).lognormal(7, 0.5, 30)
+	means = statsKernel.bootstrapMeans(values, 5000, 0)
+	assert numpy.allclose(statsKernel.bcaQuantiles(values, means, 0.025), plainBCa(values, means, 0.025), atol=1e-6)
+
+@pytest.mark.parametrize('method, scipyMethod', [('percentile', 'percentile'), ('bca', 'BCa')])
+def testBootstrapInterval(method, scipyMethod):
+	values = numpy.random.default_rng(3).lognormal(7, 0.4, 25)
+	lower, upper = statsKernel.bootstrapInterval(values, '95', method, 20000, 0)
+	reference = stats.bootstrap((values,), numpy.mean, confidence_level=0.95, n_resamples=20000, method=scipyMethod, \
+	random_state=0).confidence_interval
+	#Different random resamples, so the bounds only agree to within the Monte Carlo error
+	width = reference.high - reference.low
+	assert abs(lower - reference.low) < 0.05 * width
+	assert abs(upper - reference.high) < 0.05 * width
+
+def testBootstrapRepeatable():
+	values = numpy.random.default_rng(4).normal(0, 1, 12)
+	first = statsKernel.bootstrapMeans(values, 3000, 7)
+	assert numpy.array_equal(first, statsKernel.bootstrapMeans(values, 3000, 7))
+	assert numpy.array_equal(first, statsKernel.bootstrapMeans(values, 3000, 7, workers=2))
+	assert statsKernel.bootstrapInterval(values[:1], '95') == ('n/a', 'n/a')
+
+#The bootstrap interval replaces the normal confidence bounds of an analysis (there is no critical value any more)
+def testAnalyzeBootstrap(tmp_path):
+	fileName = benchmark.writeSyntheticLog(str(tmp_path / 'log.csv'), 40)
+	results = statsAnalysis.analyze(fileName, ['configuration=axial'], confidence='90', bootstrap='bca', resamples=2000, seed=3)
+	summary = results['summary']
+	lower, upper = statsKernel.bootstrapInterval(results['test data'].column('peak load'), '90', 'bca', 2000, 3)
+	assert [summary['lower conf bound'], summary['upper conf bound']] == [lower, upper]
+	assert summary['critical value'] == summary['conf int'] == 'n/a'
+	assert summary['mean'] == statsAnalysis.analyze(fileName, ['configuration=axial'])['summary']['mean']
@@ -0,0 +1,30 @@
+# test_criticalValues.py -- Precomputed t table checked against scipy, and the analysis runs that never load scipy or openpyxl
+
+"""   Import Modules   """
+import os, subprocess, sys
+import numpy, pytest
+from scipy import stats
+import benchmark, statsKernel
+
+"""   DEFINITIONS   """
+
+@pytest.mark.parametrize('confidence', list(statsKernel.tValues))
+def testTTable(confidence):
+	df = numpy.concatenate((numpy.arange(1, 2001), numpy.geomspace(2000, 10**6, 200)))
+	alpha = (1 - int(confidence)/100) / 2
+	assert numpy.abs(statsKernel.tableValue(confidence, df) - stats.t.ppf(1 - alpha, df)).max() < 1e-5
+	assert numpy.isnan(statsKernel.tableValue(confidence, 0))
+
+def testCriticalValue():
+	assert statsKernel.criticalValue('95%', 10) == pytest.approx(stats.t.ppf(0.975, 9), abs=1e-5)
+	assert statsKernel.criticalValue('99', 10) == pytest.approx(stats.t.ppf(0.995, 9), rel=1e-12) #not in the table
+	assert statsKernel.criticalValue('90', 10, 'z') == statsKernel.zValues['90']
+
+#Printing the statistics of a log only loads scipy and openpyxl when a test document is written
+def testLazyImports(tmp_path):
+	fileName = benchmark.writeSyntheticLog(str(tmp_path / 'log.csv'), 50)
+	script = 'import sys, statsAnalysis; statsAnalysis.main([sys.argv[1], "--no-report"]); ' + \
+	'print(sorted(name for name in sys.modules if name.split(".")[0] in ["scipy", "openpyxl", "reportWriter"]))'
+	output = subprocess.run([sys.executable, '-c', script, fileName], capture_output=True, text=True, check=True, \
+	cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+	assert output.splitlines()[-1] == '[]'
@@ -0,0 +1,60 @@
+# test_follow.py -- Following a test log while it is written: partial lines, appended rows, restarts and the running stats
+
+"""   Import Modules   """
+import pytest
+import benchmark, statsAnalysis, testLog
+
+"""   DEFINITIONS   """
+
+#Bytes of a synthetic test log and the offset where its data rows start
+def logBytes(tmp_path, rows):
+	with open(benchmark.writeSyntheticLog(str(tmp_path / 'full.csv'), rows), 'rb') as testomaticFile:
+		data = testomaticFile.read()
+	return data, len(('\r\n'.join(benchmark.headerBlock) + '\r\n').encode())
+
+#Only whole lines are read, the rest of a line that is still being written comes with the next poll
+def testPartialLines(tmp_path):
+	data, start = logBytes(tmp_path, 3)
+	lines = data[start:].split(b'\r\n')
+	fileName = tmp_path / 'log.csv'
+	fileName.write_bytes(data[:start // 2])
+	follower = testLog.LogFollower(str(fileName))
+	assert follower.poll() == []
+	fileName.write_bytes(data[:start] + lines[0] + b'\r\n' + lines[1][:10])
+	assert [row[0] for row in follower.poll()] == ['31564']
+	assert follower.poll() == []
+	fileName.write_bytes(data)
+	rows = follower.poll()
+	assert [row[0] for row in rows] == ['31565', '31566']
+	assert rows[0] == lines[1].decode().split(',')
+	assert follower.poll() == [] and follower.restarts == 0
+
+#A file that got shorter was started over, the follower reads it again from the top
+def testRestart(tmp_path):
+	data, start = logBytes(tmp_path, 4)
+	fileName = tmp_path / 'log.csv'
+	fileName.write_bytes(data)
+	follower = testLog.LogFollower(str(fileName))
+	assert len(follower.poll()) == 4
+	fileName.write_bytes(data[:start] + data[start:].split(b'\r\n')[0] + b'\r\n')
+	assert len(follower.poll()) == 1
+	assert follower.restarts == 1
+
+#The running statistics end up where an analysis of the finished file starts, mistests and filtered pulls are left out
+def testFollowMatchesAnalyze(tmp_path):
+	data, start = logBytes(tmp_path, 120)
+	fileName = tmp_path / 'log.csv'
+	cuts = [start + 1000, start + 2500, len(data)]
+	data = data.replace(b',FALSE,', b',TRUE,', 5)
+	fileName.write_bytes(data[:start])
+	updates = statsAnalysis.follow(str(fileName), ['configuration=axial'], units='kN', interval=0, polls=4)
+	assert next(updates)['summary']['n'] == 0
+	for cut in cuts:
+		fileName.write_bytes(data[:cut])
+		results = next(updates)
+	finished = statsAnalysis.analyze(str(fileName), ['configuration=axial'], units='kN')
+	assert results['filters used'] == [['configuration', 'axial']]
+	for field in ['n', 'mean', 'std dev', 'lower conf bound']:
+		assert results['summary'][field] == pytest.approx(finished['summary'][field], rel=1e-9)
+	with pytest.raises(StopIteration):
+		next(updates)
@@ -0,0 +1,74 @@
+# test_groupStats.py -- Group-by statistics cube checked against filtering every group out by hand, and its report sheet
+
+"""   Import Modules   """
+import numpy, openpyxl, pytest
+from scipy import stats
+import benchmark, groupStats, statsAnalysis, statsKernel, testLog
+
+"""   DEFINITIONS   """
+
+#Table of a synthetic test log
+@pytest.fixture
+def table(tmp_path):
+	return testLog.readTestLog(benchmark.writeSyntheticLog(str(tmp_path / 'log.csv'), 500))
+
+def testSummarizeGroups():
+	random = numpy.random.default_rng(1)
+	group = random.integers(0, 4, 300)
+	values = random.normal(10, 2, 300)
+	summary = statsKernel.summarizeGroups(statsKernel.groupAccumulators(group, values, 5), '90')
+	for number in range(4):
+		members = values[group == number]
+		assert summary['mean'][number] == pytest.approx(members.mean(), rel=1e-12)
+		assert summary['std dev'][number] == pytest.approx(members.std(ddof=1), rel=1e-12)
+		assert summary['critical value'][number] == pytest.approx(stats.t.ppf(0.95, len(members) - 1), abs=1e-5)
+	assert summary['n'][4] == 0 and numpy.isnan(summary['std dev'][4])
+
+def testGroupingSets():
+	assert groupStats.groupingSets(['a', 'b']) == [(0, 1), (0,), (1,), ()]
+	assert len(groupStats.groupingSets(groupStats.groupKeys)) == 2**len(groupStats.groupKeys)
+
+#Every group and rollup row holds the statistics of the rows it stands for
+def testCubeMatchesGroups(table):
+	cube = groupStats.buildCube(table, '95')
+	assert cube['keys'] == groupStats.groupKeys
+	loads = table.column('peak load')
+	columns = {key: table.column(key) for key in cube['keys']}
+	groups = 0
+	for row in cube['rows']:
+		members = numpy.ones(len(loads), dtype=bool)
+		for key in cube['keys']:
+			if row[key] != groupStats.allValues:
+				members &= columns[key] == row[key]
+		values = loads[members]
+		groups += 1
+		assert row['n'] == len(values) > 0
+		assert row['mean'] == pytest.approx(values.mean(), rel=1e-12)
+		if len(values) == 1:
+			assert row['std dev'] == 'n/a'
+		else:
+			assert row['std dev'] == pytest.approx(values.std(ddof=1), rel=1e-9)
+	total = cube['rows'][-1]
+	summary = statsAnalysis.getSummary(table, '95')
+	assert all(total[key] == groupStats.allValues for key in cube['keys'])
+	assert [total['n'], total['lower conf bound']] == [summary['n'], pytest.approx(summary['lower conf bound'], rel=1e-12)]
+
+def testEmptyCube(table):
+	cube = groupStats.buildCube(table.select('procedure', '5kn proof').select('procedure', '7kn proof'), '95', \
+	tolerance=['95/90'])
+	assert cube['rows'] == [] and cube['tolerance levels'] == ['95/90']
+
+#The cube gets its own sheet after the template sheets, one row per group under the header row
+def testGroupStatsSheet(tmp_path, template):
+	fileName = benchmark.writeSyntheticLog(str(tmp_path / 'log.csv'), 200)
+	results = statsAnalysis.analyze(fileName, ['configuration=axial'], output=str(tmp_path / 'report'), template=template, \
+	groupBy=True, tolerance=['95/90'])
+	sheet = openpyxl.load_workbook(results['report'])['Group Stats']
+	rows = list(sheet.iter_rows(values_only=True))
+	keys = results['cube']['keys']
+	assert 'configuration' not in keys
+	assert rows[0][:len(keys) + 2] == tuple(keys + ['n', 'Mean (lbf)'])
+	assert 'Lower 95/90 Tolerance Bound' in rows[0]
+	assert len(rows) == len(results['cube']['rows']) + 1
+	total = results['cube']['rows'][-1]
+	assert rows[-1][:len(keys) + 2] == tuple([groupStats.allValues]*len(keys) + [total['n'], pytest.approx(total['mean'])])
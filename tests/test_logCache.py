@@ -0,0 +1,64 @@
+# test_logCache.py -- Parsed log cache: hits by path and by content hash, changed logs, broken files and LRU eviction
+
+"""   Import Modules   """
+import os, shutil
+import benchmark, testLog
+
+"""   DEFINITIONS   """
+
+#Parsing a log fails the test, for reads that have to come from the cache
+def noParsing(fileName, chunkSize=testLog.chunkRows):
+	raise AssertionError(fileName + ' was parsed again')
+
+#Cached .npz files of a cache folder
+def cachedFiles(cache):
+	return sorted(name for name in os.listdir(cache.folder) if name.endswith('.npz'))
+
+def assertSameTable(first, second):
+	assert first.keys == second.keys
+	for key in first.keys:
+		assert first.column(key).tolist() == second.column(key).tolist()
+
+#A log read again, and a copy of it under another name, are loaded from the cache instead of parsed
+def testCacheHit(tmp_path, monkeypatch):
+	fileName = benchmark.writeSyntheticLog(str(tmp_path / 'log.csv'), 100)
+	cache = testLog.LogCache(str(tmp_path / 'cache'))
+	parsed = cache.read(fileName)
+	assert cachedFiles(cache) == [testLog.fileDigest(fileName) + '.npz']
+	monkeypatch.setattr(testLog, 'readTestLog', noParsing)
+	assertSameTable(cache.read(fileName), parsed)
+	copyName = str(tmp_path / 'copy.csv')
+	shutil.copy(fileName, copyName)
+	assertSameTable(cache.read(copyName), parsed)
+	assert sorted(cache.loadIndex()) == sorted([os.path.abspath(fileName), os.path.abspath(copyName)])
+
+#A log that changed is parsed again, a broken cache file is replaced
+def testChangedLog(tmp_path):
+	fileName = benchmark.writeSyntheticLog(str(tmp_path / 'log.csv'), 100)
+	cache = testLog.LogCache(str(tmp_path / 'cache'))
+	cache.read(fileName)
+	benchmark.writeSyntheticLog(fileName, 150)
+	assert len(cache.read(fileName)) == 150
+	assert len(cachedFiles(cache)) == 2
+	cacheName = os.path.join(cache.folder, testLog.fileDigest(fileName) + '.npz')
+	with open(cacheName, 'wb') as cacheFile:
+		cacheFile.write(b'not an npz file')
+	assert len(cache.read(fileName)) == 150
+	assert len(testLog.loadTestLog(cacheName)) == 150
+
+#The least recently used logs go first once the folder is over its size cap, loading a log counts as a use
+def testEviction(tmp_path):
+	cache = testLog.LogCache(str(tmp_path / 'cache'))
+	names = [benchmark.writeSyntheticLog(str(tmp_path / (name + '.csv')), 200, seed=seed) for seed, name in enumerate('abc')]
+	digests = [testLog.fileDigest(fileName) + '.npz' for fileName in names]
+	for age, fileName in zip([300, 200], names[:2]):
+		cache.read(fileName)
+		cacheName = os.path.join(cache.folder, digests[names.index(fileName)])
+		os.utime(cacheName, (os.path.getmtime(cacheName) - age,)*2)
+	cache.read(names[0]) #a is used again, so b is now the least recently used
+	cache.maxBytes = int(2.5 * os.path.getsize(os.path.join(cache.folder, digests[0])))
+	cache.read(names[2])
+	assert cachedFiles(cache) == sorted([digests[0], digests[2]])
+	cache.maxBytes = 0
+	cache.evict()
+	assert cachedFiles(cache) == []
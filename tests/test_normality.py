@@ -0,0 +1,101 @@
+# test_normality.py -- Shapiro-Wilk, Anderson-Darling and D'Agostino tests checked against scipy, one group and many,
+# and the Normality sheet of the test document
+
+"""   Import Modules   """
+import numpy, openpyxl, pytest
+from scipy import stats
+import benchmark, groupStats, normality, statsAnalysis, testLog
+
+"""   DEFINITIONS   """
+
+#Test results of a single sample
+def runOne(values):
+	return normality.runTests(values, numpy.zeros(len(values), dtype=numpy.int64), 1)
+
+@pytest.mark.parametrize('n', [3, 4, 5, 6, 11, 12, 20, 50, 200, 1000, 4000])
+@pytest.mark.parametrize('shape', ['normal', 'skewed'])
+def testShapiroWilk(n, shape):
+	random = numpy.random.default_rng(n)
+	values = random.normal(2000, 300, n) if shape == 'normal' else random.exponential(1, n)
+	results = runOne(values)
+	w, p = stats.shapiro(values)
+	assert results['shapiro-wilk w'][0] == pytest.approx(w, abs=1e-8)
+	assert results['shapiro-wilk p'][0] == pytest.approx(p, abs=1e-6)
+
+@pytest.mark.parametrize('n', [3, 8, 30, 500])
+def testAndersonDarling(n):
+	values = numpy.random.default_rng(n).normal(10, 2, n)
+	results = runOne(values)
+	assert results['anderson-darling a2'][0] == pytest.approx(stats.anderson(values, method='interpolate').statistic, \
+	rel=1e-10)
+	assert 0 <= results['anderson-darling p'][0] <= 1
+
+def testAndersonDarlingPValue():
+	#scipy interpolates its p value between the 15% and 1% points of Stephens' table, so the two only agree roughly
+	checked = 0
+	for seed in range(40):
+		values = numpy.random.default_rng(seed).standard_t(5, 60)
+		reference = stats.anderson(values, method='interpolate').pvalue
+		if 0.01 < reference < 0.15:
+			assert runOne(values)['anderson-darling p'][0] == pytest.approx(reference, rel=0.1)
+			checked += 1
+	assert checked >= 5
+
+@pytest.mark.parametrize('n', [8, 20, 100, 5000])
+@pytest.mark.parametrize('shape', ['normal', 'skewed'])
+def testDAgostino(n, shape):
+	random = numpy.random.default_rng(n + 1)
+	values = random.normal(2000, 300, n) if shape == 'normal' else random.lognormal(0, 0.8, n)
+	results = runOne(values)
+	reference = stats.normaltest(values)
+	assert results["d'agostino k2"][0] == pytest.approx(reference.statistic, rel=1e-9)
+	assert results["d'agostino p"][0] == pytest.approx(reference.pvalue, rel=1e-6, abs=1e-300)
+
+def testGroupsMatchSingleRuns():
+	random = numpy.random.default_rng(5)
+	sizes = [2, 3, 7, 8, 25, 60]
+	values = numpy.concatenate([random.normal(number, 1 + number, size) for number, size in enumerate(sizes)])
+	group = numpy.repeat(numpy.arange(len(sizes)), sizes)
+	order = random.permutation(len(values))
+	results = normality.runTests(values[order], group[order], len(sizes))
+	for number, size in enumerate(sizes):
+		single = runOne(values[group == number])
+		assert results['n'][number] == size
+		for field in normality.testFields:
+			assert results[field][number] == pytest.approx(single[field][0], nan_ok=True, rel=1e-9)
+
+def testTooSmallGroups():
+	results = normality.runTests(numpy.array([1.0, 2.0, 5.0, 5.0, 5.0]), numpy.array([0, 0, 1, 1, 1]), 2)
+	#Two values are too few for any test, a group of equal values has no spread
+	for field in normality.testFields:
+		assert numpy.isnan(results[field]).all()
+
+#The whole table comes first, then every configuration and size group with the tests of its own loads
+def testBuildNormality(tmp_path):
+	table = testLog.readTestLog(benchmark.writeSyntheticLog(str(tmp_path / 'log.csv'), 300))
+	tests = normality.buildNormality(table)
+	assert tests['keys'] == normality.groupKeys
+	loads = table.column('peak load')
+	columns = {key: table.column(key) for key in tests['keys']}
+	assert [row['configuration'] for row in tests['rows']] == [groupStats.allValues, 'axial', 'axial', 'radial', 'radial']
+	for row in tests['rows']:
+		members = numpy.ones(len(loads), dtype=bool)
+		for key in tests['keys']:
+			if row[key] != groupStats.allValues:
+				members &= columns[key] == row[key]
+		single = runOne(loads[members])
+		assert row['n'] == int(members.sum())
+		for field in normality.testFields:
+			assert row[field] == pytest.approx(single[field][0], rel=1e-9)
+	assert normality.buildNormality(table.select('size', 'primary hole'), [])['rows'][0]['n'] == \
+	int((columns['size'] == 'primary hole').sum())
+
+#The tests get their own report sheet, one row per group under the header row
+def testNormalitySheet(tmp_path, template):
+	fileName = benchmark.writeSyntheticLog(str(tmp_path / 'log.csv'), 100)
+	results = statsAnalysis.analyze(fileName, ['size=primary hole'], output=str(tmp_path / 'report'), template=template, \
+	normalityTests=True)
+	rows = list(openpyxl.load_workbook(results['report'])['Normality'].iter_rows(values_only=True))
+	assert rows[0][:3] == ('configuration', 'n', 'Shapiro-Wilk W')
+	assert len(rows) == len(results['normality']['rows']) + 1 == 4 #all the pulls, axial and radial
+	assert rows[1][:3] == (groupStats.allValues, results['summary']['n'], pytest.approx(results['normality']['rows'][0]['shapiro-wilk w']))
@@ -0,0 +1,77 @@
+# test_reportWriter.py -- Test documents streamed from a template: copied sheets, images, styles and the excel row limit
+
+"""   Import Modules   """
+import io
+import openpyxl, pytest
+import benchmark, reportWriter, statsAnalysis
+
+"""   DEFINITIONS   """
+
+#Results of a synthetic test log (no report written yet)
+def logResults(tmp_path, rows=40, **settings):
+	fileName = benchmark.writeSyntheticLog(str(tmp_path / 'log.csv'), rows)
+	return statsAnalysis.analyze(fileName, **settings)
+
+#Cover cells, merges, widths and the data sheet page setup come from the template, the data sheets are streamed
+def testTemplateCopied(tmp_path, template):
+	results = logResults(tmp_path)
+	fileName = reportWriter.writeTestDoc(results, str(tmp_path / 'report'), template)
+	assert fileName.endswith('report.xlsx')
+	wb = openpyxl.load_workbook(fileName)
+	assert wb.sheetnames == ['Cover', 'Raw Data', 'Statistics']
+	cover = wb['Cover']
+	assert [cover['A1'].value, cover['A2'].value] == ['Test Document', 'Prepared by']
+	assert [str(merged) for merged in cover.merged_cells.ranges] == ['A1:D1']
+	assert cover.column_dimensions['A'].width == 30
+	rawData = wb['Raw Data']
+	assert rawData.page_setup.orientation == 'landscape'
+	assert rawData.max_row == 41
+	assert rawData['A1'].value == 'test run'
+	assert rawData['A1'].font.bold
+	assert wb['Statistics'].max_row > 2*40
+
+#openpyxl closes the file of an image when it saves it, so every report needs its own copy of the template image
+def testTemplateImage(tmp_path):
+	PIL = pytest.importorskip('PIL.Image')
+	from openpyxl.drawing.image import Image
+	picture = io.BytesIO()
+	PIL.new('RGB', (40, 20), 'red').save(picture, format='PNG')
+	wb = openpyxl.Workbook()
+	wb.active.title = 'Cover'
+	wb.active.add_image(Image(picture), 'B2')
+	wb.create_sheet('Raw Data')
+	wb.create_sheet('Statistics')
+	template = str(tmp_path / 'image.xlsx')
+	wb.save(template)
+	results = logResults(tmp_path)
+	for name in ['first', 'second']:
+		report = openpyxl.load_workbook(reportWriter.writeTestDoc(results, str(tmp_path / name), template))
+		images = report['Cover']._images
+		assert len(images) == 1
+		assert (images[0].width, images[0].height) == (40, 20)
+		assert images[0].anchor._from.col == 1 and images[0].anchor._from.row == 1
+
+#Styles are registered once per workbook as named styles
+def testNamedStyles(tmp_path, template):
+	wb = openpyxl.load_workbook(reportWriter.writeTestDoc(logResults(tmp_path), str(tmp_path / 'report'), template))
+	assert set(reportWriter.styleDefinitions) <= set(wb.named_styles)
+	assert wb['Raw Data']['A2'].style == 'centered'
+
+#Raw data past the last excel row is left out with a warning
+def testRawDataTruncated(tmp_path, monkeypatch):
+	results = logResults(tmp_path, rows=40)
+	monkeypatch.setattr(reportWriter, 'excelRows', 31)
+	wb = openpyxl.Workbook(write_only=True)
+	stream = reportWriter.SheetStream(wb.create_sheet('Raw Data'), reportWriter.StyleRegistry(wb))
+	with pytest.warns(UserWarning, match='first 30 of the 40 rows'):
+		reportWriter.writeRawData(stream, results)
+	assert stream.row == 32
+	wb.save(str(tmp_path / 'raw.xlsx'))
+
+#A Statistics sheet that does not fit raises before anything is written
+def testStatisticsTooLong(tmp_path, template, monkeypatch):
+	results = logResults(tmp_path, rows=40)
+	monkeypatch.setattr(reportWriter, 'excelRows', 2*40 + reportWriter.curvePoints - 1)
+	with pytest.raises(ValueError, match='Statistics sheet'):
+		reportWriter.writeTestDoc(results, str(tmp_path / 'report'), template)
+	assert not (tmp_path / 'report.xlsx').exists()
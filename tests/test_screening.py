@@ -0,0 +1,108 @@
+# test_screening.py -- Generalized ESD outlier test checked against the NIST handbook and a plain implementation, and the
+# mistest and outlier screening of an analysis
+
+"""   Import Modules   """
+import numpy, openpyxl, pytest
+from scipy import stats
+import benchmark, screening, statsAnalysis, statsKernel, testLog
+
+"""   Global Variables   """
+
+#Rosner's example from the NIST handbook (1.3.5.17.3): 54 values, 3 outliers at alpha 0.05 with up to 10 looked for
+rosnerValues = [-0.25, 0.68, 0.94, 1.15, 1.20, 1.26, 1.26, 1.34, 1.38, 1.43, 1.49, 1.49, 1.55, 1.56, 1.58, 1.65, \
+1.69, 1.70, 1.76, 1.77, 1.81, 1.91, 1.94, 1.96, 1.99, 2.06, 2.09, 2.10, 2.14, 2.15, 2.23, 2.24, 2.26, 2.35, 2.37, \
+2.40, 2.47, 2.54, 2.62, 2.64, 2.90, 2.92, 2.92, 2.93, 3.21, 3.26, 3.30, 3.59, 3.68, 4.30, 4.64, 5.34, 5.42, 6.01]
+rosnerStatistics = [3.118, 2.942, 3.179, 2.810, 2.815, 2.848, 2.279, 2.310, 2.101, 2.067]
+rosnerCritical = [3.159, 3.151, 3.144, 3.136, 3.128, 3.120, 3.111, 3.103, 3.094, 3.085]
+mistestRuns = {3: 'TRUE', 10: 'x', 11: 'Yes'}  #Data row -> mistest value written into the log
+outlierRuns = {20: '9000.0', 40: '50.0'}  #Data row -> peak load far away from the others
+
+"""   DEFINITIONS   """
+
+#Generalized ESD worked out the plain way: recompute the mean and std dev after every removal
+def plainESD(values, alpha, maxOutliers):
+	values = list(values)
+	removed = []
+	testStats = []
+	critical = []
+	for step in range(maxOutliers):
+		data = numpy.array(values)
+		n = len(data)
+		gaps = numpy.abs(data - data.mean())
+		position = int(gaps.argmax())
+		testStats.append(gaps[position] / data.std(ddof=1))
+		t = stats.t.ppf(1 - alpha / (2*n), n - 2)
+		critical.append((n - 1) * t / numpy.sqrt((n - 2 + t**2) * n))
+		removed.append(values.pop(position))
+	found = max([step + 1 for step in range(maxOutliers) if testStats[step] > critical[step]] + [0])
+	return removed[:found], testStats, critical
+
+#Synthetic test log with a few mistests and two outliers
+@pytest.fixture
+def screenedLog(tmp_path):
+	fileName = benchmark.writeSyntheticLog(str(tmp_path / 'log.csv'), 80)
+	with open(fileName, newline='') as testomaticFile:
+		lines = testomaticFile.read().split('\r\n')
+	start = len(benchmark.headerBlock)
+	for row, value in list(mistestRuns.items()) + list(outlierRuns.items()):
+		cells = lines[start + row].split(',')
+		cells[6 if row in mistestRuns else 4] = value
+		lines[start + row] = ','.join(cells)
+	with open(fileName, 'w', newline='') as testomaticFile:
+		testomaticFile.write('\r\n'.join(lines))
+	return fileName
+
+#Test runs of a view
+def runs(view):
+	return view.column('test run').tolist()
+
+def testGeneralizedESDRosner():
+	positions, testStats, critical = statsKernel.generalizedESD(numpy.array(rosnerValues), 0.05, 10)
+	assert [rosnerValues[position] for position in positions] == [6.01, 5.42, 5.34]
+	assert numpy.allclose(testStats, rosnerStatistics, atol=1e-3) #the handbook rounds to 3 decimals
+	assert numpy.allclose(critical, rosnerCritical, atol=1e-3)
+
+@pytest.mark.parametrize('seed', range(5))
+def testGeneralizedESDPlain(seed):
+	random = numpy.random.default_rng(seed)
+	values = numpy.sort(numpy.concatenate((random.normal(2000, 100, 60), random.normal(2000, 900, 3))))
+	positions, testStats, critical = statsKernel.generalizedESD(values, 0.05, 8)
+	removed, plainStats, plainCritical = plainESD(values, 0.05, 8)
+	assert numpy.array_equal(values[positions], removed)
+	assert numpy.allclose(testStats, plainStats, rtol=1e-9)
+	assert numpy.allclose(critical, plainCritical, rtol=1e-9)
+
+def testGeneralizedESDSmallSamples():
+	assert statsKernel.generalizedESD(numpy.array([1.0, 2.0]), 0.05, 10) == ([], [], [])
+	#Never more than half of the values are tested
+	positions, testStats, critical = statsKernel.generalizedESD(numpy.arange(13.0), 0.05, 10)
+	assert len(testStats) == 6 and len(positions) == 0
+
+def testMistests(screenedLog):
+	table = testLog.readTestLog(screenedLog)
+	kept, report = screening.screenData(table)
+	assert runs(report['mistests']) == [31564 + row for row in sorted(mistestRuns)]
+	assert len(kept) == 80 - len(mistestRuns) and 'mistest' not in kept.keys
+	assert report['outliers'] is None and report['statistics'] == []
+	rows = [row for chunk in testLog.iterRowChunks(screenedLog) for row in chunk]
+	assert [number for number, row in enumerate(rows) if screening.isMistest(row)] == sorted(mistestRuns)
+
+@pytest.mark.parametrize('mode', screening.outlierModes)
+def testOutliers(screenedLog, mode):
+	kept, report = screening.screenData(testLog.readTestLog(screenedLog), mode, 0.05, 5)
+	assert sorted(runs(report['outliers'])) == [31564 + row for row in sorted(outlierRuns)]
+	assert len(report['statistics']) == 5
+	assert len(kept) == 80 - len(mistestRuns) - (len(outlierRuns) if mode == 'exclude' else 0)
+	with pytest.raises(ValueError):
+		screening.screenData(kept, 'drop')
+	with pytest.raises(ValueError):
+		screening.screenData(kept, mode, 1.5)
+
+#Excluded outliers are left out of the statistics and listed on the Statistics sheet with the mistests
+def testAnalyzeScreening(screenedLog, tmp_path, template):
+	results = statsAnalysis.analyze(screenedLog, output=str(tmp_path / 'report'), template=template, outliers='exclude')
+	loads = results['test data'].column('peak load')
+	assert results['summary']['n'] == len(loads) == 80 - len(mistestRuns) - len(outlierRuns)
+	assert results['summary']['mean'] == pytest.approx(loads.mean(), rel=1e-12)
+	labels = [cell.value for row in openpyxl.load_workbook(results['report'])['Statistics'].iter_rows() for cell in row]
+	assert 'Outliers Excluded:' in labels and 'Mistest Run 31567:' in labels and 'Outlier Run 31584:' in labels
@@ -0,0 +1,26 @@
+# test_statsKernel.py -- Statistics kernel accumulators and summaries checked against scipy and plain numpy
+
+"""   Import Modules   """
+import numpy, pytest
+from scipy import stats
+import statsKernel
+
+"""   DEFINITIONS   """
+
+def testSummarize():
+	values = numpy.random.default_rng(0).normal(2000, 300, 101)
+	summary = statsKernel.summarize(statsKernel.accumulateArray(statsKernel.newAccumulator(), values), '95')
+	assert summary['n'] == 101
+	assert summary['mean'] == pytest.approx(values.mean(), rel=1e-12)
+	assert summary['std dev'] == pytest.approx(values.std(ddof=1), rel=1e-12)
+	assert summary['standard error'] == pytest.approx(stats.sem(values), rel=1e-12)
+	assert summary['conf int'] == pytest.approx(stats.t.ppf(0.975, 100) * values.std(ddof=1), rel=1e-6)
+	#One value at a time and merged halves give the same accumulator
+	acc = statsKernel.newAccumulator()
+	for value in values:
+		statsKernel.accumulate(acc, value)
+	merged = statsKernel.mergeAccumulators(statsKernel.accumulateArray(statsKernel.newAccumulator(), values[:40]), \
+	statsKernel.accumulateArray(statsKernel.newAccumulator(), values[40:]))
+	for other in [acc, merged]:
+		assert other['mean'] == pytest.approx(values.mean(), rel=1e-12)
+		assert other['m2'] == pytest.approx(values.var() * len(values), rel=1e-10)
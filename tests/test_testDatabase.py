@@ -0,0 +1,90 @@
+# test_testDatabase.py -- SQLite test database: loading logs (once, and again when they change) and queries against filters
+
+"""   Import Modules   """
+import os
+import numpy, pytest
+import benchmark, statsAnalysis, testDatabase, testLog
+
+"""   DEFINITIONS   """
+
+#Folder of two synthetic test logs (the first one is the largest, so it is loaded first)
+@pytest.fixture
+def logFolder(tmp_path):
+	folder = tmp_path / 'logs'
+	folder.mkdir()
+	benchmark.writeSyntheticLog(str(folder / 'TestLog_a.csv'), 2000, seed=0)
+	benchmark.writeSyntheticLog(str(folder / 'TestLog_b.csv'), 300, seed=1)
+	return str(folder)
+
+#Csv rows of every loaded log that pass a query, worked out row by row in the order the logs were loaded
+#(the database also keeps columns the testLog tables leave out, so testLog.rowMatches cannot be used)
+def queryRows(folder, query):
+	columns = {key: col for key, col, sqlColumn, sqlType in testDatabase.pullColumns}
+	filters = testLog.parseFilters(query)
+	rows = []
+	for path in testLog.findTestLogs([folder]):
+		for chunk in testLog.iterRowChunks(path):
+			for row in chunk:
+				values = {key: row[columns[key]].lower() for key, operator, value in filters}
+				included = {key: False for key, operator, value in filters if operator == '='}
+				for key, operator, value in filters:
+					if operator == '=':
+						included[key] = included[key] or values[key] == value
+					elif values[key] == value:
+						break
+				else:
+					if all(included.values()):
+						rows.append(row)
+	return rows
+
+#Peak loads of the csv rows that pass a query
+def queryLoads(folder, query):
+	return [float(row[testLog.columnIndex('peak load')]) for row in queryRows(folder, query)]
+
+#Logs are loaded once, a log that changed replaces its old pulls
+def testIngest(logFolder, tmp_path):
+	database = str(tmp_path / 'logs.db')
+	loaded = testDatabase.ingest(database, [logFolder])
+	assert sorted(loaded.values()) == [300, 2000]
+	assert set(testDatabase.ingest(database, [logFolder]).values()) == {0}
+	changed = os.path.join(logFolder, 'TestLog_b.csv')
+	benchmark.writeSyntheticLog(changed, 400, seed=2)
+	assert testDatabase.ingest(database, [logFolder]) == {os.path.normpath(changed): 400, \
+	os.path.normpath(os.path.join(logFolder, 'TestLog_a.csv')): 0}
+	assert len(testDatabase.readQuery(database)) == 2400
+	assert testDatabase.main([str(tmp_path / 'missing'), '--database', database]) == 1
+
+#A query gives the pulls the same filters keep in the csv files, category values read back like parsed ones
+@pytest.mark.parametrize('query', [[], ['test machine=qa'], ['configuration=axial', 'color!=red'], \
+['procedure=5kn proof', 'procedure=7kn proof', 'size=primary hole']])
+def testQueryMatchesFilters(logFolder, tmp_path, query):
+	database = str(tmp_path / 'logs.db')
+	testDatabase.ingest(database, [logFolder])
+	table = testDatabase.readQuery(database, query, chunkSize=256)
+	assert table.column('peak load').tolist() == queryLoads(logFolder, query)
+	assert table.column('procedure').tolist() == [row[2].lower() for row in queryRows(logFolder, query)]
+
+#from and to take a date or the start of a time stamp, both ends included (to=DATE takes in the whole day)
+def testTimeRange(logFolder, tmp_path):
+	database = str(tmp_path / 'logs.db')
+	fileName = os.path.join(logFolder, 'TestLog_a.csv')
+	testDatabase.ingest(database, [fileName])
+	stamps = numpy.array([row[14] for rows in testLog.iterRowChunks(fileName) for row in rows])
+	for query, expected in [(['to=2017-05-09'], stamps < '2017-05-10'), (['from=2017-05-10'], stamps >= '2017-05-10'), \
+	(['from=2017-05-09T20:00', 'to=2017-05-09T21:00'], (stamps >= '2017-05-09T20:00') & (stamps < '2017-05-09T21:01'))]:
+		assert len(testDatabase.readQuery(database, query)) == int(expected.sum()) > 0
+	with pytest.raises(ValueError):
+		testDatabase.readQuery(database, ['from!=2017-05-09'])
+	with pytest.raises(ValueError):
+		testDatabase.readQuery(database, ['shape=round'])
+	with pytest.raises(FileNotFoundError):
+		testDatabase.readQuery(str(tmp_path / 'missing.db'))
+
+#analyze reads the pulls of a query instead of a file
+def testAnalyzeQuery(logFolder, tmp_path):
+	database = str(tmp_path / 'logs.db')
+	testDatabase.ingest(database, [logFolder])
+	results = statsAnalysis.analyze(None, ['configuration=axial'], database=database, query=['test machine=qa'])
+	loads = numpy.array(queryLoads(logFolder, ['configuration=axial', 'test machine=qa']))
+	assert results['summary']['n'] == len(loads)
+	assert results['summary']['mean'] == pytest.approx(loads.mean(), rel=1e-12)
@@ -0,0 +1,149 @@
+# test_testLog.py -- RowMask bit operations and filter semantics checked against plain numpy boolean masks
+
+"""   Import Modules   """
+import numpy, pytest
+import benchmark, testLog
+
+"""   Global Variables   """
+
+procedures = ['Pull', 'Push', 'Torque']
+configurations = ['Axial', 'Lateral']
+sizes = ['primary hole', 'secondary hole']
+colors = ['', 'Red', 'Blue']
+
+"""   DEFINITIONS   """
+
+#Random testomatic csv rows (header block already removed), every row has the columns of testLog.columnLayout
+def csvRows(count, seed=0):
+	random = numpy.random.default_rng(seed)
+	rows = []
+	for run in range(count):
+		row = [''] * 11
+		row[0] = str(31564 + run)
+		row[1] = '6952'
+		row[2] = procedures[random.integers(len(procedures))]
+		row[3] = configurations[random.integers(len(configurations))]
+		row[4] = '%.1f' % random.choice([1900.0, 2000.0, 2100.5, random.normal(2000, 300)])
+		row[5] = '0'
+		row[6] = 'TRUE' if random.random() < 0.1 else 'FALSE'
+		row[7] = 'Hanger'
+		row[8] = 'note ' + str(random.integers(5))
+		row[9] = colors[random.integers(len(colors))]
+		row[10] = sizes[random.integers(len(sizes))]
+		rows.append(row)
+	return rows
+
+#Table and the raw rows it was built from
+@pytest.fixture
+def table():
+	rows = csvRows(203)
+	builder = testLog.TestLogBuilder()
+	builder.addRows(rows)
+	return builder.build(), rows
+
+#Boolean mask of the rows a filter spec keeps, worked out row by row
+def expectedMask(rows, filters):
+	return numpy.array([testLog.rowMatches(row, testLog.parseFilters(filters)) for row in rows])
+
+def testRowMaskOperators():
+	random = numpy.random.default_rng(1)
+	for size in [0, 1, 7, 8, 9, 63, 64, 65, 1000]:
+		first = random.random(size) < 0.5
+		second = random.random(size) < 0.3
+		a = testLog.RowMask.fromBool(first)
+		b = testLog.RowMask.fromBool(second)
+		assert numpy.array_equal(a.toBool(), first)
+		assert numpy.array_equal((a & b).toBool(), first & second)
+		assert numpy.array_equal((a | b).toBool(), first | second)
+		assert numpy.array_equal((~a).toBool(), ~first)
+		assert (~a).count() == int((~first).sum()) #padding bits stay clear
+		assert a.count() == int(first.sum())
+		assert a.any() == bool(first.any())
+		assert testLog.RowMask.all(size).count() == size
+		assert testLog.RowMask.none(size).count() == 0
+
+def testCategoryWhere(table):
+	table, rows = table
+	for key, col in [('configuration', 3), ('color', 9), ('failure notes', 8)]:
+		values = numpy.array([row[col].lower() for row in rows])
+		for value in list(dict.fromkeys(values)) + ['missing']:
+			assert numpy.array_equal(table.where(key, value).toBool(), values == value)
+
+def testNumericWhere(table):
+	table, rows = table
+	loads = numpy.array([float(row[4]) for row in rows])
+	for value in ['2000.0', '2100.5', '1.0', 'not a number']:
+		expected = loads == float(value) if value != 'not a number' else numpy.zeros(len(rows), dtype=bool)
+		assert numpy.array_equal(table.where('peak load', value).toBool(), expected)
+	#Scaled columns match the value in their unit
+	scaled = table.withScale('peak load', 2.0)
+	assert numpy.array_equal(scaled.where('peak load', '1000.0').toBool(), loads == 2000.0)
+
+def testDistinct(table):
+	table, rows = table
+	assert table.distinct('configuration') == list(dict.fromkeys(row[3].lower() for row in rows))
+	assert table.distinct('peak load') == list(dict.fromkeys(str(float(row[4])) for row in rows))
+	distinct = table.distinct('configuration')
+	distinct.append('diagonal')
+	assert 'diagonal' not in table.categories['configuration'] #the base table hands out a copy
+	view = table.select('configuration', 'axial')
+	assert view.distinct('test run') == [row[0] for row in rows if row[3] == 'Axial']
+	assert view.distinct('size') == list(dict.fromkeys(row[10].lower() for row in rows if row[3] == 'Axial'))
+
+@pytest.mark.parametrize('filters', [[], ['configuration=axial'], ['configuration=axial', 'configuration=lateral'], \
+['procedure=pull', 'procedure=torque', 'size!=primary hole'], ['color!=', 'color!=red'], \
+['configuration=lateral', 'peak load=2000.0'], ['peak load!=2000.0', 'mistest=false']])
+def testApplyFilters(table, filters):
+	table, rows = table
+	view, filtersUsed = testLog.applyFilters(table, testLog.parseFilters(filters))
+	expected = expectedMask(rows, filters)
+	assert numpy.array_equal(view.rowMask().toBool(), expected)
+	assert len(view) == int(expected.sum())
+	loads = numpy.array([float(row[4]) for row in rows])
+	assert numpy.array_equal(view.column('peak load'), loads[expected])
+	assert len(filtersUsed) == len(filters)
+
+def testFilterDropsSingleValueKeys(table):
+	table, rows = table
+	view, filtersUsed = testLog.applyFilters(table, testLog.parseFilters(['configuration=axial', 'size!=primary hole']))
+	assert 'configuration' not in view.keys
+	assert 'size' in view.keys
+	assert filtersUsed == [['configuration', 'axial'], ['size', 'not primary hole']]
+
+def testInvalidFilters(table):
+	table, rows = table
+	with pytest.raises(ValueError):
+		testLog.applyFilters(table, testLog.parseFilters(['configuration=diagonal']))
+	with pytest.raises(ValueError):
+		testLog.applyFilters(table, testLog.parseFilters(['shape=round']))
+	with pytest.raises(ValueError):
+		testLog.parseFilters(['configuration'])
+	#Category values are checked against the whole category list, a value a view does not hold matches no rows
+	view = table.select('configuration', 'axial')
+	empty, filtersUsed = testLog.applyFilters(view, testLog.parseFilters(['configuration=lateral']))
+	assert len(empty) == 0
+
+def testViewsOfViews(table):
+	table, rows = table
+	view = table.select('procedure', 'pull').select('size', 'secondary hole')
+	expected = expectedMask(rows, ['procedure=pull', 'size=secondary hole'])
+	assert numpy.array_equal(view.rowMask().toBool(), expected)
+	positions = numpy.array([0, len(view) - 1])
+	hits = view.positionMask(positions).toBool()
+	assert numpy.array_equal(numpy.flatnonzero(hits), numpy.flatnonzero(expected)[positions])
+	assert list(view.rows(['test run'])) == [(int(row[0]),) for row, keep in zip(rows, expected) if keep]
+
+#Chunked reading yields the same rows as reading the whole file, in tables of at most chunkSize rows
+def testIterChunks(tmp_path):
+	fileName = benchmark.writeSyntheticLog(str(tmp_path / 'log.csv'), 250)
+	whole = testLog.readTestLog(fileName)
+	chunks = list(testLog.iterChunks(fileName, chunkSize=64))
+	assert [len(chunk) for chunk in chunks] == [64, 64, 64, 58]
+	for key in whole.keys:
+		assert numpy.concatenate([chunk.column(key) for chunk in chunks]).tolist() == whole.column(key).tolist()
+	assert testLog.TestLog.fromRows(csvRows(5)).keys == whole.keys
+
+def testColumnsAreReadOnly(table):
+	table, rows = table
+	with pytest.raises(ValueError):
+		table.columns['peak load'][0] = 0.0
@@ -0,0 +1,44 @@
+# test_tolerance.py -- One sided lower tolerance factors checked against the noncentral t distribution, and the tolerance
+# bounds of an analysis and its test document
+
+"""   Import Modules   """
+import numpy, openpyxl, pytest
+from scipy import stats
+import benchmark, statsAnalysis, statsKernel
+
+"""   DEFINITIONS   """
+
+@pytest.mark.parametrize('level, limit', [('90/90', 1e-5), ('95/90', 1e-5), ('95/95', 1e-5), ('99/95', 1e-5), \
+('99/99', 2.5e-5), ('99.9/99', 2.5e-5)])
+def testToleranceFactor(level, limit):
+	n = numpy.concatenate((numpy.arange(2, 2001), numpy.unique(numpy.geomspace(2000, 300000, 300).astype(int))))
+	coverage, confidence = statsKernel.toleranceLevel(level)
+	exact = stats.nct.ppf(confidence, n - 1, stats.norm.ppf(coverage) * numpy.sqrt(n)) / numpy.sqrt(n)
+	factors = statsKernel.toleranceFactor(level, n)
+	assert numpy.abs(factors - exact).max() < limit
+	if level in statsKernel.toleranceValues:
+		assert numpy.abs(factors[n <= 100] - exact[n <= 100]).max() < 1e-8 #exact table entries
+	assert numpy.isnan(statsKernel.toleranceFactor(level, 1))
+
+def testToleranceLevels():
+	with pytest.raises(ValueError):
+		statsKernel.toleranceLevel('95')
+	with pytest.raises(ValueError):
+		statsKernel.toleranceLevel('100/90')
+	summary = statsKernel.toleranceSummary(statsKernel.summarize(statsKernel.accumulateArray(statsKernel.newAccumulator(), \
+	numpy.array([1.0, 2.0, 4.0]))), ['95/90'])
+	assert summary[statsKernel.toleranceKey('95/90')] == pytest.approx(7/3 - 5.311478432 * numpy.std([1, 2, 4], ddof=1))
+
+#Every level asked for gets a bound in every unit, in the printed summary, the Statistics sheet and the group stats
+def testAnalyzeTolerance(tmp_path, template):
+	fileName = benchmark.writeSyntheticLog(str(tmp_path / 'log.csv'), 60)
+	results = statsAnalysis.analyze(fileName, units='kN', output=str(tmp_path / 'report'), template=template, groupBy=True, \
+	tolerance=['95/90', '99/95'])
+	summary = results['summary']
+	assert summary['tolerance levels'] == ['95/90', '99/95']
+	for level in summary['tolerance levels']:
+		bound = summary['mean'] - statsKernel.toleranceFactor(level, summary['n']) * summary['std dev']
+		assert summary[statsKernel.toleranceKey(level)] == pytest.approx(bound, rel=1e-12)
+		assert results['cube']['rows'][-1][statsKernel.toleranceKey(level)] == pytest.approx(bound, rel=1e-9)
+	labels = [cell.value for row in openpyxl.load_workbook(results['report'])['Statistics'].iter_rows() for cell in row]
+	assert 'Lower 95/90 Tolerance Bound:' in labels and 'Lower 99/95 Tolerance Bound:' in labels